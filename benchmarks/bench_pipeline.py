@@ -0,0 +1,249 @@
+"""Module of functions for benchmarking the ConfMeter treatments
+on synthetic data at several scales.
+
+Each stage of the treatments of a corpus year is timed for each scale
+given by the number of authorships of contributions to conferences:
+
+- 'cleaning': cleaning of the HAL extraction;
+- 'employees': adaptation of the employees data;
+- 'spelling': check of the author-names spelling;
+- 'year_search': merge of the contributions with the employees data;
+- 'consolidation': consolidation of the list of contributions;
+- 'export': formatting and saving of the final list as a workbook.
+
+The timings are saved as a json file of scaling curves, with for each
+stage the seconds and the number of rows per scale and the slope
+of the curve in log-log scale.
+
+Usage example (from the repository root):
+    python -m benchmarks.bench_pipeline --scales 1000 10000 100000 --output bench.json
+
+"""
+
+__all__ = ['STAGES_LIST',
+           'run_benchmarks',
+          ]
+
+
+# Standard Library imports
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# 3rd party imports
+import numpy as np
+
+# Local imports
+from benchmarks.synthetic_data import build_synthetic_wf
+from benchmarks.synthetic_data import set_synthetic_org_tup
+from cmfuncts.build_employees import update_hal_employees_data
+from cmfuncts.cols_rename import build_hal_col_conversion_dic
+from cmfuncts.conf_extract import clean_hal_conf_data
+from cmfuncts.conf_extract import set_extract_paths
+from cmfuncts.conf_tables import split_conf_data
+from cmfuncts.consolidate_conf_list import build_final_conf_list
+from cmfuncts.format_files import measure_export_time
+from cmfuncts.merge_conf_employees import check_hal_names_spelling
+from cmfuncts.merge_conf_employees import recursive_year_search
+from cmfuncts.stage_cache import set_code_version
+
+
+STAGES_LIST = ['cleaning', 'employees', 'spelling', 'year_search', 'consolidation', 'export']
+
+DEFAULT_SCALES = [1000, 3000, 10000]
+
+
+def _time_call(funct, *args, **kwargs):
+    """Times the call of a function.
+
+    Args:
+        funct (function): The function to call.
+    Returns:
+        (tup): (The result of the function, the elapsed time in seconds (float)).
+    """
+    start_time = time.perf_counter()
+    result = funct(*args, **kwargs)
+    elapsed_time = time.perf_counter() - start_time
+    return result, elapsed_time
+
+
+def _run_scale(work_path, authorships_nb, corpus_year, seed):
+    """Runs and times the stages of the treatments for a scale.
+
+    Args:
+        work_path (path): The full path to the folder where \
+        the synthetic working folder is created.
+        authorships_nb (int): The target number of authorships \
+        of contributions to conferences.
+        corpus_year (str): 4 digits year of the corpus.
+        seed (int): The seed of the random generator.
+    Returns:
+        (dict): The timings (dict) keyed by stage with the elapsed time \
+        in seconds and the number of input rows of the stage.
+    """
+    root_path = Path(work_path) / Path(f"scale_{authorships_nb}")
+    wf_root_path, wf_path, hal_full_df = build_synthetic_wf(root_path, authorships_nb,
+                                                            corpus_year=corpus_year,
+                                                            seed=seed)
+    org_tup = set_synthetic_org_tup()
+    timings_dict = {}
+
+    conf_df, seconds = _time_call(clean_hal_conf_data, hal_full_df)
+    timings_dict['cleaning'] = {'seconds': seconds, 'rows': len(hal_full_df)}
+    paths_list, _ = set_extract_paths(wf_path, corpus_year)
+    conf_df.to_excel(paths_list[2], index=False)
+
+    (_, employees_dict), seconds = _time_call(update_hal_employees_data, wf_root_path)
+    timings_dict['employees'] = {'seconds': seconds,
+                                 'rows': sum(len(df) for df in employees_dict.values())}
+
+    _, seconds = _time_call(check_hal_names_spelling, wf_path, corpus_year,
+                            split_conf_data(conf_df), save_status=False)
+    timings_dict['spelling'] = {'seconds': seconds, 'rows': len(conf_df)}
+
+    (_, merged_df), seconds = _time_call(recursive_year_search, wf_root_path, wf_path,
+                                         corpus_year, conf_df=conf_df,
+                                         employees_dict=employees_dict, force=True)
+    timings_dict['year_search'] = {'seconds': seconds, 'rows': len(conf_df)}
+
+    (conf_list_df, _, _), seconds = _time_call(build_final_conf_list, wf_path, org_tup,
+                                               corpus_year, merged_df=merged_df.copy(),
+                                               force=True)
+    timings_dict['consolidation'] = {'seconds': seconds, 'rows': len(merged_df)}
+
+    cols_rename_dict = build_hal_col_conversion_dic(org_tup)
+    time_per_10k_rows = measure_export_time(conf_list_df, cols_rename_dict)
+    timings_dict['export'] = {'seconds': time_per_10k_rows * len(conf_list_df) / 10000,
+                              'rows': len(conf_list_df)}
+    return timings_dict
+
+
+def _set_scaling_slope(rows_list, seconds_list):
+    """Sets the slope of a scaling curve in log-log scale.
+
+    A slope of 1 stands for a linear scaling, of 2 for a quadratic one.
+
+    Args:
+        rows_list (list): The numbers (int) of rows.
+        seconds_list (list): The elapsed times (float) in seconds.
+    Returns:
+        (float): The slope or None if less than 2 valid points are available.
+    """
+    points = [(rows, seconds) for rows, seconds in zip(rows_list, seconds_list)
+              if rows and seconds]
+    if len({rows for rows, _ in points})<2:
+        return None
+    log_rows = np.log([rows for rows, _ in points])
+    log_seconds = np.log([seconds for _, seconds in points])
+    slope = np.polyfit(log_rows, log_seconds, 1)[0]
+    return round(float(slope), 3)
+
+
+def run_benchmarks(scales_list=None, work_path=None, corpus_year="2023",
+                   seed=0, max_seconds=None):
+    """Runs the benchmarks of the treatments stages for several scales.
+
+    The scales are run by increasing number of authorships.
+    The larger scales are not run once a stage exceeds 'max_seconds'.
+
+    Args:
+        scales_list (list): Optional target numbers (int) of authorships; \
+        if None, the 'DEFAULT_SCALES' global is used (default=None).
+        work_path (path): Optional full path to the folder where \
+        the synthetic data are kept; if None, a temporary folder \
+        is used (default=None).
+        corpus_year (str): 4 digits year of the corpus (default="2023").
+        seed (int): The seed of the random generator (default=0).
+        max_seconds (float): Optional maximum time of a stage \
+        (default=None).
+    Returns:
+        (dict): The scaling curves (dict) keyed by stage with the run parameters.
+    """
+    if scales_list is None:
+        scales_list = DEFAULT_SCALES
+    scales_list = sorted(scales_list)
+
+    results_dict = {'date'        : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    'code_version': set_code_version(),
+                    'python'      : platform.python_version(),
+                    'platform'    : platform.platform(),
+                    'corpus_year' : corpus_year,
+                    'seed'        : seed,
+                    'scales'      : [],
+                    'stages'      : {stage: {'seconds': [], 'rows': []}
+                                     for stage in STAGES_LIST},
+                   }
+
+    with tempfile.TemporaryDirectory() as tmp_path:
+        if work_path is None:
+            work_path = tmp_path
+        for authorships_nb in scales_list:
+            print(f"\nBenchmarking scale of {authorships_nb} authorships...")
+            timings_dict = _run_scale(work_path, authorships_nb, corpus_year, seed)
+            results_dict['scales'].append(authorships_nb)
+            for stage, timing_dict in timings_dict.items():
+                stage_dict = results_dict['stages'][stage]
+                stage_dict['seconds'].append(round(timing_dict['seconds'], 4))
+                stage_dict['rows'].append(timing_dict['rows'])
+                print(f"    {stage:<14}: {timing_dict['seconds']:9.3f} s "
+                      f"for {timing_dict['rows']} rows")
+            if max_seconds and max(timing_dict['seconds'] for timing_dict
+                                   in timings_dict.values())>max_seconds:
+                print(f"\nStage time above {max_seconds} s: larger scales skipped")
+                break
+
+    for stage_dict in results_dict['stages'].values():
+        stage_dict['slope'] = _set_scaling_slope(stage_dict['rows'], stage_dict['seconds'])
+    return results_dict
+
+
+def _build_parser():
+    """Builds the parser of the command-line arguments.
+
+    Returns:
+        (argparse.ArgumentParser): The parser.
+    """
+    parser = argparse.ArgumentParser(prog="bench_pipeline",
+                                     description="Benchmarks the ConfMeter treatments "
+                                                 "on synthetic data.")
+    parser.add_argument("--scales", nargs="+", type=int, default=DEFAULT_SCALES,
+                        help="numbers of authorships to benchmark "
+                             "(from 1000 to 1000000)")
+    parser.add_argument("--output", default="bench_results.json",
+                        help="full path to the json file of results")
+    parser.add_argument("--work-path", default=None,
+                        help="folder where the synthetic data are kept "
+                             "(default: temporary folder)")
+    parser.add_argument("--year", default="2023", help="4 digits corpus year")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random generator")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="skips the larger scales once a stage exceeds this time")
+    return parser
+
+
+def main(argv=None):
+    """Main function of the benchmarks.
+
+    Args:
+        argv (list): Optional command-line arguments; if None, \
+        the arguments of the command line are used (default=None).
+    Returns:
+        (int): The exit code.
+    """
+    args = _build_parser().parse_args(argv)
+    results_dict = run_benchmarks(args.scales, work_path=args.work_path,
+                                  corpus_year=args.year, seed=args.seed,
+                                  max_seconds=args.max_seconds)
+    with open(args.output, 'w', encoding='utf-8') as output_file:
+        json.dump(results_dict, output_file, ensure_ascii=False, indent=1)
+    print(f"\nScaling curves saved in file: \n  {args.output}")
+    return 0
+
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Module of functions for reporting the import time of the modules
+imported at the start of the ConfMeter application.
+
+The import times are measured in a new interpreter through the
+'-X importtime' option of Python, the best of several runs being kept.
+The report gives the total import time compared to the startup budget,
+the modules with the largest cumulative import times and the deferred
+modules, such as pandas or the BiblioMeter functions, that are nevertheless
+imported at startup.
+
+Usage example (from the repository root):
+    python -m benchmarks.bench_startup --budget 1.5 --output startup_report.json
+
+The exit code is 1 if the total import time exceeds the budget
+or if a deferred module is imported at startup.
+
+"""
+
+__all__ = ['DEFERRED_MODULES_LIST',
+           'run_startup_report',
+          ]
+
+
+# Standard Library imports
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+# Local imports
+from cmfuncts.stage_cache import set_code_version
+
+
+# Module imported by `app.py` before the display of the main window
+STARTUP_MODULE = "cmgui.main_page"
+
+# Startup budget in seconds
+DEFAULT_BUDGET_S = 1.5
+
+# Modules that should only be imported after the window display
+DEFERRED_MODULES_LIST = ['pandas', 'openpyxl', 'bmfuncts', 'HalApyJson', 'BiblioParsing',
+                         'cmfuncts.conf_globals', 'cmgui.build_conf_page',
+                         'cmfuncts.consolidate_conf_list']
+
+
+def _measure_import_times(module_name):
+    """Measures the import times of a module and of its dependencies
+    in a new interpreter.
+
+    The modules imported by the interpreter startup are excluded.
+
+    Args:
+        module_name (str): The name of the imported module; \
+        if None, only the interpreter startup is measured.
+    Returns:
+        (dict): The import times (tup) of (self time in seconds (float), \
+        cumulative time in seconds (float), depth (int)) keyed by module name.
+    """
+    statement = f"import {module_name}" if module_name else "pass"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                             capture_output=True, text=True, check=False)
+    if process.returncode:
+        raise ImportError(process.stderr.strip().splitlines()[-1])
+
+    times_dict = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumul_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times_dict[name.strip()] = (int(self_us) / 1e6, int(cumul_us) / 1e6, depth)
+    if module_name:
+        startup_dict = _measure_import_times(None)
+        times_dict = {name: times_tup for name, times_tup in times_dict.items()
+                      if name not in startup_dict}
+    return times_dict
+
+
+def run_startup_report(module_name=STARTUP_MODULE, budget_s=DEFAULT_BUDGET_S,
+                       runs_nb=3, top_nb=15):
+    """Builds the report of the import times at the application startup.
+
+    Args:
+        module_name (str): Optional name of the module imported \
+        at startup (default=STARTUP_MODULE).
+        budget_s (float): Optional startup budget in seconds \
+        (default=DEFAULT_BUDGET_S).
+        runs_nb (int): Optional number of runs of which the best \
+        one is kept (default=3).
+        top_nb (int): Optional number of modules with the largest \
+        cumulative import times given in the report (default=15).
+    Returns:
+        (dict): The report with the total import time, the budget status, \
+        the top modules and the deferred modules imported at startup.
+    """
+    best_dict, best_total = None, None
+    for _ in range(max(runs_nb, 1)):
+        times_dict = _measure_import_times(module_name)
+        total_s = sum(cumul_s for _, cumul_s, depth in times_dict.values() if not depth)
+        if best_total is None or total_s<best_total:
+            best_dict, best_total = times_dict, total_s
+
+    top_list = sorted(best_dict.items(), key=lambda item: item[1][1], reverse=True)
+    eager_list = [name for name in DEFERRED_MODULES_LIST if name in best_dict]
+    report_dict = {'date'          : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                   'code_version'  : set_code_version(),
+                   'python'        : platform.python_version(),
+                   'platform'      : platform.platform(),
+                   'module'        : module_name,
+                   'total_s'       : round(best_total, 4),
+                   'budget_s'      : budget_s,
+                   'budget_status' : best_total<=budget_s,
+                   'modules_nb'    : len(best_dict),
+                   'eager_deferred': eager_list,
+                   'top_modules'   : [{'module'  : name,
+                                       'self_s'  : round(self_s, 4),
+                                       'cumul_s' : round(cumul_s, 4)}
+                                      for name, (self_s, cumul_s, _) in top_list[:top_nb]],
+                  }
+    return report_dict
+
+
+def _print_report(report_dict):
+    """Prints the report of the import times at the application startup.
+
+    Args:
+        report_dict (dict): The report built through the \
+        `run_startup_report` function.
+    """
+    status = "within" if report_dict['budget_status'] else "OVER"
+    print(f"\nImport of '{report_dict['module']}': {report_dict['total_s']:.3f} s "
+          f"for {report_dict['modules_nb']} modules "
+          f"({status} budget of {report_dict['budget_s']} s)")
+    print("\nLargest cumulative import times:")
+    for module_dict in report_dict['top_modules']:
+        print(f"    {module_dict['cumul_s']:8.3f} s  {module_dict['module']}")
+    if report_dict['eager_deferred']:
+        print("\nDeferred modules imported at startup: "
+              f"{', '.join(report_dict['eager_deferred'])}")
+
+
+def _build_parser():
+    """Builds the parser of the command-line arguments.
+
+    Returns:
+        (argparse.ArgumentParser): The parser.
+    """
+    parser = argparse.ArgumentParser(prog="bench_startup",
+                                     description="Reports the import times at the "
+                                                 "ConfMeter startup.")
+    parser.add_argument("--module", default=STARTUP_MODULE,
+                        help="module imported at startup")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_S,
+                        help="startup budget in seconds")
+    parser.add_argument("--runs", type=int, default=3,
+                        help="number of runs of which the best one is kept")
+    parser.add_argument("--top", type=int, default=15,
+                        help="number of modules given in the report")
+    parser.add_argument("--output", default=None,
+                        help="full path to the json file of the report")
+    return parser
+
+
+def main(argv=None):
+    """Main function of the startup report.
+
+    Args:
+        argv (list): Optional command-line arguments; if None, \
+        the arguments of the command line are used (default=None).
+    Returns:
+        (int): The exit code (0 if the startup is within the budget \
+        without deferred module imported, 1 otherwise).
+    """
+    args = _build_parser().parse_args(argv)
+    report_dict = run_startup_report(args.module, budget_s=args.budget,
+                                     runs_nb=args.runs, top_nb=args.top)
+    _print_report(report_dict)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output_file:
+            json.dump(report_dict, output_file, ensure_ascii=False, indent=1)
+        print(f"\nStartup report saved in file: \n  {args.output}")
+    if not report_dict['budget_status'] or report_dict['eager_deferred']:
+        return 1
+    return 0
+
+
+if __name__=="__main__":
+    sys.exit(main())
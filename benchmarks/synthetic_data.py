@@ -0,0 +1,372 @@
+"""Module of functions for generating synthetic data of ConfMeter
+at configurable scales.
+
+The generated data mimic the real ones without containing any
+production data:
+
+- the HAL extraction of publications of a corpus year;
+- the multi-year employees workbook with one sheet per year;
+- the file of author-names spelling corrections;
+- the file of external PhD students.
+
+The scale is given by the number of authorships of contributions
+to conferences, that is the number of rows of the conferences data
+built from the HAL extraction.
+
+"""
+
+__all__ = ['SYNTH_DPT_LABEL_DICT',
+           'build_synthetic_hal_df',
+           'build_synthetic_wf',
+           'set_synthetic_org_tup',
+          ]
+
+
+# Standard Library imports
+import os
+from pathlib import Path
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+import cmfuncts.institute_globals as cm_ig
+from cmfuncts.build_employees import set_empl_paths
+from cmfuncts.conf_extract import set_extract_paths
+from cmfuncts.useful_functs import create_cm_archi
+
+
+SYNTH_DPT_LABEL_DICT = {'DEPT1': ['D1', 'D1b'],
+                        'DEPT2': ['D2'],
+                        'DEPT3': ['D3'],
+                        'DEPT4': ['D4'],
+                       }
+
+SYNTH_PARAMS = {'authors_mean'  : 4,
+                'authors_max'   : 12,
+                'conf_ratio'    : 0.85,
+                'empl_ratio'    : 0.4,
+                'ortho_ratio'   : 0.02,
+                'ext_docs_ratio': 0.01,
+               }
+
+FIRST_NAMES = ["Jean", "Marie", "Paul", "Anne", "Luc", "Eve", "Hugo", "Léa", "Max",
+               "Zoé", "Jean-Pierre", "Hélène", "François", "Chloé", "Noël", "Inès",
+               "Yann", "Sophie", "Rémi", "Agnès", "Karim", "Mei", "Olga", "Sven"]
+
+NAME_SYLLABLES = ["mar", "tin", "du", "rand", "pe", "tit", "mo", "reau", "si", "mon",
+                  "lau", "rent", "le", "fè", "vre", "roux", "four", "nier", "gi", "rard",
+                  "bon", "net", "gar", "nier", "fa", "bre", "ber", "trand", "ro", "bin"]
+
+TOWNS_LIST = ["Grenoble", "Paris", "Lyon", "Boston", "Kyoto", "Berlin", "Madrid",
+              "Montréal", "Sydney", "Seoul", "Milano", "Denver"]
+
+DOCTYPES_LIST = ["ART", "OUV", "COUV", "REPORT"]
+
+TITLE_WORDS = ["solid", "oxide", "fuel", "cell", "battery", "lithium", "sodium", "hydrogen",
+               "electrolyte", "membrane", "catalyst", "thin", "film", "photovoltaic", "silicon",
+               "perovskite", "thermal", "storage", "grid", "model", "simulation", "aging",
+               "interface", "coating", "recycling", "sensor", "nanowire", "graphene", "polymer",
+               "magnet", "alloy", "additive", "manufacturing", "diagnosis", "control", "heat"]
+
+
+def set_synthetic_org_tup():
+    """Sets Institute parameters compatible with the synthetic data.
+
+    Only the departments labels, at index 1 of the tuple, are used
+    by the `cmfuncts` package.
+
+    Returns:
+        (tup): Contains the synthetic Institute parameters.
+    """
+    return (None, SYNTH_DPT_LABEL_DICT)
+
+
+def _set_last_names(rng, names_nb):
+    """Sets distinct last names built by joining syllables.
+
+    Args:
+        rng (numpy.random.Generator): The random generator.
+        names_nb (int): The number of last names.
+    Returns:
+        (list): The last names (str).
+    """
+    names_set = set()
+    syllables_nb = 2
+    while len(names_set)<names_nb:
+        draws = rng.integers(0, len(NAME_SYLLABLES), size=(names_nb, syllables_nb))
+        for draw in draws:
+            name = "".join(NAME_SYLLABLES[idx] for idx in draw).capitalize()
+            names_set.add(name)
+            if len(names_set)>=names_nb:
+                break
+        syllables_nb += 1
+    return sorted(names_set)
+
+
+def _set_people(rng, people_nb):
+    """Sets the first and last names of people.
+
+    Args:
+        rng (numpy.random.Generator): The random generator.
+        people_nb (int): The number of people.
+    Returns:
+        (tup): (The first names (list), the last names (list)).
+    """
+    last_names_nb = max(people_nb // len(FIRST_NAMES) + 1, 10)
+    last_names = _set_last_names(rng, last_names_nb)
+    first_idx = rng.permutation(len(FIRST_NAMES) * last_names_nb)[:people_nb]
+    first_names = [FIRST_NAMES[idx % len(FIRST_NAMES)] for idx in first_idx]
+    last_names = [last_names[idx // len(FIRST_NAMES)] for idx in first_idx]
+    return first_names, last_names
+
+
+def _set_country_codes():
+    """Sets the ISO codes of countries from the dedicated config file.
+
+    Returns:
+        (list): The ISO codes (str) in lower case as given by HAL.
+    """
+    config_folder_path = Path(cm_cg.__file__).parent / Path(cm_ig.CONFIG_FOLDER)
+    country_iso_file_path = config_folder_path / Path(cm_cg.CM_ARCHI['country_iso_file'])
+    country_df = pd.read_excel(country_iso_file_path,
+                               sheet_name=cm_cg.CM_ARCHI['country_iso_sheet'],
+                               usecols=cm_cg.CM_ARCHI['country_iso_usecols'])
+    code_col = cm_cg.CM_ARCHI['country_iso_usecols'][0]
+    country_codes = [str(code).lower() for code in country_df[code_col].dropna()]
+    return country_codes
+
+
+def build_synthetic_hal_df(authorships_nb, corpus_year, authors_pool, seed=0):
+    """Builds synthetic data of a HAL extraction for a corpus year.
+
+    The number of publications is set so that the conferences data
+    built from the extraction have about the given number of authorships.
+    The columns are the values of the 'HAL_USE_COLS' global.
+
+    Args:
+        authorships_nb (int): The target number of authorships \
+        of contributions to conferences.
+        corpus_year (str): 4 digits year of the corpus.
+        authors_pool (list): The full names (str) of the possible authors.
+        seed (int): The seed of the random generator (default=0).
+    Returns:
+        (dataframe): The synthetic HAL extraction with one row per publication.
+    """
+    # Setting useful aliases
+    hal_cols = cm_cg.HAL_USE_COLS
+    conf_types = cm_cg.CONF_TYPES
+
+    rng = np.random.default_rng(seed)
+    pubs_nb = max(int(authorships_nb / (SYNTH_PARAMS['authors_mean']
+                                        * SYNTH_PARAMS['conf_ratio'])), 1)
+    country_codes = _set_country_codes()
+
+    # Drawing the attributes of the publications
+    authors_nbs = np.clip(rng.poisson(SYNTH_PARAMS['authors_mean'] - 1, pubs_nb) + 1,
+                          1, SYNTH_PARAMS['authors_max'])
+    is_conf = rng.random(pubs_nb)<SYNTH_PARAMS['conf_ratio']
+    doctypes = np.where(is_conf,
+                        rng.choice(conf_types, pubs_nb),
+                        rng.choice(DOCTYPES_LIST, pubs_nb))
+    countries = rng.choice(country_codes, pubs_nb)
+    towns = rng.choice(TOWNS_LIST, pubs_nb)
+    conf_nums = rng.integers(0, max(pubs_nb // 20, 1), pubs_nb)
+    months = rng.integers(1, 13, pubs_nb)
+    days = rng.integers(1, 29, pubs_nb)
+    na_doi = rng.random(pubs_nb)<0.3
+    authors_idx = rng.integers(0, len(authors_pool), int(authors_nbs.sum()))
+    title_words = rng.choice(TITLE_WORDS, size=(pubs_nb, 6))
+
+    data = []
+    start = 0
+    for pub_num in range(pubs_nb):
+        pub_authors = [authors_pool[idx] for idx
+                       in authors_idx[start: start + authors_nbs[pub_num]]]
+        start += authors_nbs[pub_num]
+        authors = ",".join(pub_authors)
+        title = " ".join(title_words[pub_num]).capitalize() + f" {pub_num}"
+        conf_name = f"International Conference on Topic {conf_nums[pub_num]}"
+        conf_date = f"{corpus_year}-{months[pub_num]:02d}-{days[pub_num]:02d}"
+        pub_date = f"{corpus_year}-{months[pub_num]:02d}-28"
+        country = countries[pub_num]
+        town = towns[pub_num]
+        full_ref = (f"{authors}. {title}. {conf_name}, {town} ({country.upper()}), "
+                    f"{corpus_year}")
+        data.append({hal_cols['authors']     : authors,
+                     hal_cols['title']       : title,
+                     hal_cols['pub_date']    : pub_date,
+                     hal_cols['journal']     : "NA",
+                     hal_cols['eissn']       : "NA",
+                     hal_cols['issn']        : "NA",
+                     hal_cols['conf_name']   : conf_name,
+                     hal_cols['conf_date']   : conf_date,
+                     hal_cols['commitee']    : "Oui",
+                     hal_cols['proceedings'] : "Non",
+                     hal_cols['affiliations']: "Synthetic laboratory",
+                     hal_cols['institutions']: "Synthetic institute",
+                     hal_cols['depts']       : "NA",
+                     hal_cols['organisms']   : "Synthetic organism",
+                     hal_cols['doctype']     : doctypes[pub_num],
+                     hal_cols['keywords']    : "synthetic,benchmark",
+                     hal_cols['doi']         : "NA" if na_doi[pub_num] else f"10.0000/synth.{pub_num}",
+                     hal_cols['url']         : f"https://hal.example.org/hal-{pub_num:08d}",
+                     hal_cols['country']     : country,
+                     hal_cols['full_ref']    : full_ref,
+                    })
+    hal_full_df = pd.DataFrame(data, columns=list(hal_cols.values()))
+    return hal_full_df
+
+
+def _build_employees_df(rng, first_names, last_names, matricules, dpt_labels):
+    """Builds synthetic employees data for a year.
+
+    Args:
+        rng (numpy.random.Generator): The random generator.
+        first_names (list): The first names (str) of the employees.
+        last_names (list): The last names (str) of the employees.
+        matricules (list): The employee numbers (str).
+        dpt_labels (list): The labels (str) of the departments.
+    Returns:
+        (dataframe): The employees data with the columns of the original \
+        employees workbook.
+    """
+    # Setting useful aliases
+    empl_cols = cm_eg.EMPLOYEES_USEFUL_COLS
+    add_cols = cm_eg.EMPLOYEES_ADD_COLS
+
+    empl_nb = len(matricules)
+    specific_values_dict = {'matricule'    : matricules,
+                            'name'         : [name.upper() for name in last_names],
+                            'first_name'   : [name.lower() for name in first_names],
+                            'category'     : rng.choice(["CAD", "NC"], empl_nb),
+                            'status'       : rng.choice(["-", "-", "-", "DOC", "POST"], empl_nb),
+                            'qualification': rng.choice(["-", "-", "-", "ALT", "STAG"], empl_nb),
+                            'dpt'          : rng.choice(dpt_labels, empl_nb),
+                            'serv'         : rng.choice(["S1", "S2", "S3"], empl_nb),
+                            'lab'          : rng.choice(["L1", "L2", "L3", "L4"], empl_nb),
+                           }
+    empl_dict = {}
+    for col_key, col_name in empl_cols.items():
+        empl_dict[col_name] = specific_values_dict.get(col_key, ["-"] * empl_nb)
+    empl_dict[add_cols['first_name_initials']] = [name[0] for name in first_names]
+    empl_dict[add_cols['employee_full_name']] = [""] * empl_nb
+    for col_name in add_cols.values():
+        empl_dict.setdefault(col_name, ["-"] * empl_nb)
+    return pd.DataFrame(empl_dict)
+
+
+def _misspell_name(full_name):
+    """Sets a misspelled variant of a full name.
+
+    Args:
+        full_name (str): The full name.
+    Returns:
+        (str): The misspelled full name.
+    """
+    first_name, last_name = full_name.split(" ", 1)
+    if len(last_name)>3:
+        last_name = last_name[:2] + last_name[3] + last_name[2] + last_name[4:]
+    else:
+        last_name = last_name + "e"
+    return first_name + " " + last_name
+
+
+def build_synthetic_wf(root_path, authorships_nb, corpus_year="2023",
+                       years_nb=3, seed=0):
+    """Builds a synthetic working folder with all the data needed
+    by the ConfMeter treatments of a corpus year.
+
+    The following data are generated and saved where the application
+    expects them:
+
+    - the HAL extraction, saved as the full extraction file of the corpus year;
+    - the original employees workbook with one sheet per year \
+    for 'years_nb' years up to the corpus year;
+    - the file of author-names spelling corrections, the misspelled \
+    names being used in the HAL extraction;
+    - the file of external PhD students who also author contributions.
+
+    Args:
+        root_path (path): The full path to the root folder to create.
+        authorships_nb (int): The target number of authorships \
+        of contributions to conferences.
+        corpus_year (str): 4 digits year of the corpus (default="2023").
+        years_nb (int): The number of years of employees data (default=3).
+        seed (int): The seed of the random generator (default=0).
+    Returns:
+        (tup): (The full path (path) to the root folder, the full path (path) \
+        to the working folder, the HAL extraction (dataframe)).
+    """
+    rng = np.random.default_rng(seed)
+    wf_root_path = Path(root_path)
+    wf_path = wf_root_path / Path("ConfMeter_Files-synthetic")
+    os.makedirs(wf_path, exist_ok=True)
+    _ = create_cm_archi(wf_path, corpus_year, verbose=False)
+
+    # Setting the employees and the external authors
+    empl_nb = int(min(max(authorships_nb // 10, 200), 50000))
+    ext_nb = int(min(max(authorships_nb // 5, 400), 200000))
+    first_names, last_names = _set_people(rng, empl_nb + ext_nb)
+    full_names = [f"{first} {last}" for first, last in zip(first_names, last_names)]
+    empl_full_names = full_names[:empl_nb]
+    matricules = [f"S{num:06d}" for num in range(empl_nb)]
+
+    # Setting misspelled names of some employees and external PhD students
+    ortho_nb = max(int(empl_nb * SYNTH_PARAMS['ortho_ratio']), 1)
+    ortho_names = list(rng.choice(empl_full_names, ortho_nb, replace=False))
+    misspelled_names = [_misspell_name(name) for name in ortho_names]
+    ext_docs_nb = max(int(empl_nb * SYNTH_PARAMS['ext_docs_ratio']), 1)
+    ext_docs_idx = list(range(empl_nb, empl_nb + ext_docs_nb))
+
+    # Building the authors pool with the expected share of employees
+    empl_weight = int(len(full_names[empl_nb:]) * SYNTH_PARAMS['empl_ratio']
+                      / (1 - SYNTH_PARAMS['empl_ratio']) / empl_nb) + 1
+    authors_pool = empl_full_names * empl_weight + full_names[empl_nb:] + misspelled_names
+    hal_full_df = build_synthetic_hal_df(authorships_nb, corpus_year, authors_pool, seed=seed)
+    paths_list, _ = set_extract_paths(wf_path, corpus_year)
+    hal_full_df.to_excel(paths_list[1], index=False)
+
+    # Building the original employees workbook
+    _, all_empl_path, _ = set_empl_paths(wf_root_path)[0]
+    os.makedirs(Path(all_empl_path).parent, exist_ok=True)
+    dpt_labels = sum(list(SYNTH_DPT_LABEL_DICT.values()), [])
+    years_list = [str(int(corpus_year) - num) for num in range(years_nb)][::-1]
+    with pd.ExcelWriter(all_empl_path) as writer:
+        for year in years_list:
+            year_idx = np.sort(rng.choice(empl_nb, int(empl_nb * 0.9), replace=False))
+            year_empl_df = _build_employees_df(rng,
+                                               [first_names[idx] for idx in year_idx],
+                                               [last_names[idx] for idx in year_idx],
+                                               [matricules[idx] for idx in year_idx],
+                                               dpt_labels)
+            year_empl_df.to_excel(writer, sheet_name=year, index=False)
+
+    # Building the orthograph file and the external PhD students file
+    orphan_path = wf_path / Path(cm_cg.ORPHAN_ARCHI["root"])
+    os.makedirs(orphan_path, exist_ok=True)
+    ortho_df = pd.DataFrame({cm_cg.ORTHO_COLS['pub_fullname'] : misspelled_names,
+                             cm_cg.ORTHO_COLS['empl_fullname']: ortho_names})
+    ortho_df.to_excel(orphan_path / Path(cm_cg.ORPHAN_ARCHI["orthograph file"]),
+                      index=False)
+
+    ext_docs_df = _build_employees_df(rng,
+                                      [first_names[idx] for idx in ext_docs_idx],
+                                      [last_names[idx] for idx in ext_docs_idx],
+                                      [f"X{num:06d}" for num in range(ext_docs_nb)],
+                                      dpt_labels)
+    ext_docs_cols = cm_eg.EXT_DOCS_USEFUL_COLS.copy()
+    ext_docs_cols[-2] = cm_eg.EMPLOYEES_ADD_COLS['first_name_initials']
+    ext_docs_df[cm_eg.EMPLOYEES_ADD_COLS['employee_full_name']] = [full_names[idx] for idx
+                                                                   in ext_docs_idx]
+    for col_name in ext_docs_cols:
+        if col_name not in ext_docs_df.columns:
+            ext_docs_df[col_name] = "-"
+    ext_docs_df[ext_docs_cols].to_excel(orphan_path / Path(cm_cg.ORPHAN_ARCHI["employees adds file"]),
+                                        sheet_name=cm_cg.ORPHAN_SHEET_NAMES["docs to add"],
+                                        index=False)
+
+    return wf_root_path, wf_path, hal_full_df
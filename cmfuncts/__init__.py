@@ -1,17 +1,103 @@
-""" `__init__` module of `cmfuncts` package."""
+""" `__init__` module of `cmfuncts` package.
+
+The public names of the submodules are loaded lazily (PEP 562) so that
+importing a single submodule, such as the globals modules, does not
+import pandas and the BiblioMeter packages through the other submodules.
+"""
 
 __version__ = '0.0.0'
 __author__  = 'BiblioMeter team'
 __license__ = 'MIT'
 
 
-from cmfuncts.institute_globals import *
-from cmfuncts.employees_globals import *
-from cmfuncts.conf_globals import *
-from cmfuncts.useful_functs import *
-from cmfuncts.hal_hash_id import *
-from cmfuncts.format_files import *
-from cmfuncts.build_employees import *
-from cmfuncts.conf_extract import *
-from cmfuncts.merge_conf_employees import *
-from cmfuncts.consolidate_conf_list import *
\ No newline at end of file
+# Standard Library imports
+import importlib
+
+# Submodules in order of the search of the public names,
+# the light globals modules being first
+SUBMODULES_LIST = ['institute_globals',
+                   'employees_globals',
+                   'conf_globals',
+                   'useful_functs',
+                   'wf_probe',
+                   'cancellation',
+                   'stage_cache',
+                   'wf_mirror',
+                   'stage_metrics',
+                   'session_cache',
+                   'progress_channel',
+                   'hal_hash_id',
+                   'format_files',
+                   'conf_tables',
+                   'conf_store',
+                   'conf_metrics',
+                   'author_type_rules',
+                   'build_employees',
+                   'conf_extract',
+                   'merge_stage',
+                   'merge_conf_employees',
+                   'merge_incremental',
+                   'merge_batch',
+                   'near_duplicates',
+                   'consolidate_conf_list',
+                   'cm_batch',
+                  ]
+
+
+def _import_submodule(submodule):
+    """Imports a submodule of the package.
+
+    Args:
+        submodule (str): The name of the submodule.
+    Returns:
+        (module): The imported submodule.
+    """
+    return importlib.import_module(f"{__name__}.{submodule}")
+
+
+def preload_submodules(submodules_list=None):
+    """Imports the submodules, for instance in a background thread
+    so that they are available when first used.
+
+    Args:
+        submodules_list (list): Optional names (str) of the submodules \
+        to import; if None, the 'SUBMODULES_LIST' global is used (default=None).
+    """
+    if submodules_list is None:
+        submodules_list = SUBMODULES_LIST
+    for submodule in submodules_list:
+        _ = _import_submodule(submodule)
+
+
+def __getattr__(name):
+    """Gets a public name from the first submodule of the 'SUBMODULES_LIST' 
+    global that exports it and caches it in the package namespace.
+
+    Args:
+        name (str): The public name or "__all__" for the list \
+        of the public names of all the submodules.
+    Returns:
+        The object bound to the name.
+    """
+    if name=="__all__":
+        all_list = []
+        for submodule in SUBMODULES_LIST:
+            all_list += list(_import_submodule(submodule).__all__)
+        globals()["__all__"] = all_list
+        return all_list
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    for submodule in SUBMODULES_LIST:
+        module = _import_submodule(submodule)
+        if name in module.__all__:
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Lists the names of the package namespace and the public names 
+    of the submodules.
+    """
+    return sorted(set(globals()) | set(__getattr__("__all__")))
@@ -0,0 +1,90 @@
+"""Module of functions for classifying authors by job type
+using rules on the employees information.
+
+The rules are given as a dict keyed by column name and valued
+by a dict keyed by job type and valued by the list of substrings
+that identify the job type in the column.
+When several rules match the same row, the last matching rule wins
+following the order of the columns and of the job types in the dict.
+
+"""
+
+__all__ = ['compile_author_type_rules',
+           'set_author_types',
+          ]
+
+
+# Standard Library imports
+import re
+
+# 3rd party imports
+import pandas as pd
+
+
+def compile_author_type_rules(author_types_dic):
+    """Compiles the rules of job types as one regular expression
+    per column and per job type.
+
+    Args:
+        author_types_dic (dict): The rules keyed by column name and \
+        valued by a dict keyed by job type and valued by the list \
+        of substrings identifying the job type.
+    Returns:
+        (list): The ordered list of compiled rules as tuples \
+        (column name (str), job type (str), regular expression (pattern)).
+    """
+    rules_list = []
+    for col_name, dic in author_types_dic.items():
+        for key, values_list in dic.items():
+            if not values_list:
+                continue
+            pattern = "|".join(re.escape(value) for value in values_list)
+            rules_list.append((col_name, key, re.compile(pattern)))
+    return rules_list
+
+
+def _set_rule_matches(values_series, regex):
+    """Sets the values of a column matching a compiled rule.
+
+    Args:
+        values_series (series): The distinct values of the column.
+        regex (pattern): The compiled regular expression of the rule.
+    Returns:
+        (list): The values matching the rule.
+    """
+    matches_list = [value for value in values_series
+                    if isinstance(value, str) and regex.search(value)]
+    return matches_list
+
+
+def set_author_types(df, rules_list, default_type='-'):
+    """Sets the job type of each row of data using compiled rules.
+
+    The rules built through the `compile_author_type_rules` function
+    are evaluated column by column on the distinct combinations
+    of the values of the rules columns. The job types are then mapped
+    back to the rows of the data.
+
+    Args:
+        df (dataframe): The data with the columns of the rules.
+        rules_list (list): The compiled rules.
+        default_type (str): The job type when no rule matches (default='-').
+    Returns:
+        (series): The job types with the same index as the data.
+    """
+    # Setting intermediate col name
+    type_temp_col = "Author type"
+
+    cols_list = list(dict.fromkeys(col_name for col_name, _, _ in rules_list))
+    if not cols_list:
+        return pd.Series(default_type, index=df.index)
+
+    combos_df = df[cols_list].drop_duplicates().reset_index(drop=True)
+    combos_df[type_temp_col] = default_type
+    for col_name, key, regex in rules_list:
+        matches_list = _set_rule_matches(combos_df[col_name].unique(), regex)
+        combos_df.loc[combos_df[col_name].isin(matches_list), type_temp_col] = key
+
+    types_df = df[cols_list].merge(combos_df, how='left', on=cols_list)
+    types_series = pd.Series(types_df[type_temp_col].values, index=df.index)
+    return types_series
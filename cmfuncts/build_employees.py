@@ -17,7 +17,11 @@ import pandas as pd
 
 # Local imports
 import cmfuncts.employees_globals as cm_eg
+from cmfuncts.cancellation import check_cancel_token
 from cmfuncts.format_files import add_sheets_to_workbook
+from cmfuncts.progress_channel import post_progress
+from cmfuncts.stage_metrics import instrument_stage
+from cmfuncts.stage_metrics import record_frame
 from cmfuncts.useful_functs import capitalize_name
 
 
@@ -52,19 +56,26 @@ def set_empl_paths(wf_root_path):
     return paths_list, filenames_list
 
 
-def update_hal_employees_data(wf_root_path, progress_callback=None):
+@instrument_stage(stage_name="employees_update",
+                  out_folders=lambda args: [set_empl_paths(args['wf_root_path'])[0][0]])
+def update_hal_employees_data(wf_root_path, progress_callback=None, cancel_token=None):
     """Adapts the existing employees data for the application by adding 
     a column of full_names.
 
     The updated data are saved as a multisheet xlsx file with 
     one sheet per year through the `add_sheets_to_workbook` function 
     imported from  the `cmfuncts.format_files` module.
+    The data of all the years are adapted before the saving, the 
+    cancellation token being checked for each year, so that a cancelled 
+    update leaves the existing file unchanged.
     
     Args:
         wf_root_path (path): The full path to the root folder where \
         the folder of Institute parameters is located.
         progress_callback (function): Function for updating ProgressBar \
         tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default = None).
     Returns:
         (tup): (Status (bool) of the employees-data update (True, if employees \
         data have been updated; False, if employees data are empty), \
@@ -102,21 +113,35 @@ def update_hal_employees_data(wf_root_path, progress_callback=None):
 
         if progress_callback:
             progress_bar = 20
-            final_progress_bar = 100
+            final_progress_bar = 90
             progress_callback(progress_bar)
             progress_step = (final_progress_bar - progress_bar) / steps_nb
 
         # Setting effectif full name with first name and last name
-        sheet_init = True
         hal_all_empl_dict = {}
+        rows_nb = 0
         for year in years_to_update:
+            check_cancel_token(cancel_token)
             year_empl_df = all_empl_dict[str(year)].copy()
+            record_frame(f"year_empl_df[{year}]", year_empl_df, copy_status=True)
             hal_year_empl_df = pd.DataFrame()
             for _,row in year_empl_df.iterrows():
                 first_name_cap = capitalize_name(row[first_name_col_alias])
                 last_name_cap = capitalize_name(row[last_name_col_alias])
                 row[fullname_col_alias] = first_name_cap + " " + last_name_cap
                 hal_year_empl_df = pd.concat([hal_year_empl_df, row.to_frame().T])
+            hal_all_empl_dict[year] = hal_year_empl_df
+            print(f"    addapted year  : {year}", end="\r")
+            rows_nb += len(year_empl_df)
+
+            if progress_callback:
+                progress_bar += progress_step
+                post_progress(progress_callback, progress_bar, rows=rows_nb)
+
+        # Saving the adapted employees data with one sheet per year
+        check_cancel_token(cancel_token)
+        sheet_init = True
+        for year, hal_year_empl_df in hal_all_empl_dict.items():
             sheet_name = str(year)
             if sheet_init:
                 hal_year_empl_df.to_excel(hal_all_empl_path, sheet_name=sheet_name,
@@ -124,12 +149,8 @@ def update_hal_employees_data(wf_root_path, progress_callback=None):
                 sheet_init = False
             else:
                 add_sheets_to_workbook(hal_all_empl_path, hal_year_empl_df, sheet_name)
-            hal_all_empl_dict[year] = hal_year_empl_df
-            print(f"    addapted year  : {year}", end="\r")
-
-            if progress_callback:
-                progress_bar += progress_step
-                progress_callback(progress_bar)
+        if progress_callback:
+            progress_callback(100)
         print("\nEmployees data addapted")
         update_empl_status = True
     else:
@@ -0,0 +1,70 @@
+"""Module of the cancellation token of the long-running treatments.
+
+The token is set by the user interface, from any thread, and checked
+by the treatments at chunk boundaries. The checks are only made before
+the saving of the output files so that a cancelled treatment leaves
+no partially written output files.
+
+"""
+
+__all__ = ['CancelToken',
+           'StageCancelledError',
+           'check_cancel_token',
+          ]
+
+
+# Standard Library imports
+import threading
+
+
+class StageCancelledError(Exception):
+    """Exception raised by a treatment when its cancellation
+    has been requested through a `CancelToken` instance.
+    """
+
+
+class CancelToken:
+    """Thread-safe token for requesting the cancellation
+    of a treatment.
+
+    Args:
+        stage (str): Optional name of the cancelled treatment \
+        used in the exception message (default="").
+    """
+
+    def __init__(self, stage=""):
+        self.stage = stage
+        self._event = threading.Event()
+
+    def cancel(self):
+        """Requests the cancellation."""
+        self._event.set()
+
+    def reset(self):
+        """Clears the cancellation request for a new treatment."""
+        self._event.clear()
+
+    def is_cancelled(self):
+        """Checks if the cancellation has been requested.
+
+        Returns:
+            (bool): True if the cancellation has been requested.
+        """
+        return self._event.is_set()
+
+    def check(self):
+        """Raises `StageCancelledError` if the cancellation
+        has been requested.
+        """
+        if self._event.is_set():
+            raise StageCancelledError(f"Treatment cancelled: {self.stage}".rstrip(": "))
+
+
+def check_cancel_token(cancel_token):
+    """Checks the cancellation token if any.
+
+    Args:
+        cancel_token (CancelToken): The cancellation token or None.
+    """
+    if cancel_token is not None:
+        cancel_token.check()
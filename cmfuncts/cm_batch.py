@@ -0,0 +1,512 @@
+"""Module of functions for running the ConfMeter treatments
+without the GUI, for instance for unattended batch runs.
+
+The steps of the treatments are the same as the ones launched
+from the GUI pages, without any confirmation dialog:
+
+- 'employees': adaptation of the employees data to the HAL extractions;
+- 'extract': extraction of the contributions to conferences from HAL;
+- 'merge': merge of the contributions with the employees data;
+- 'conso': consolidation of the list of contributions to conferences \
+and of the cube of metrics;
+- 'store': filling of the contributions store from the files of the \
+corpus years treated before the store was available.
+
+With the mirror option, the treatments run on a local copy of the
+working folder that is synchronized back to the network share at the end.
+
+A first interruption by the user (Ctrl+C) cancels the treatments at the
+next check of the cancellation token, without partially written files;
+a second one interrupts them immediately.
+
+Usage example:
+    confmeter-batch Liten "C:/.../ConfMeter_Files" 2023 2024 --steps merge conso --jobs 2
+
+"""
+
+__all__ = ['run_cm_batch',
+          ]
+
+
+# Standard Library imports
+import argparse
+import os
+import signal
+import sys
+from pathlib import Path
+from zipfile import BadZipFile
+
+# 3rd party imports
+from bmfuncts.config_utils import set_org_params
+
+# Local imports
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.build_employees import set_empl_paths
+from cmfuncts.build_employees import update_hal_employees_data
+from cmfuncts.cancellation import CancelToken
+from cmfuncts.cancellation import StageCancelledError
+from cmfuncts.cancellation import check_cancel_token
+from cmfuncts.conf_extract import set_extract_paths
+from cmfuncts.conf_extract import set_hal_to_conf
+from cmfuncts.conf_metrics import read_year_metrics_cube
+from cmfuncts.conf_store import read_store_years
+from cmfuncts.conf_store import update_conf_store
+from cmfuncts.consolidate_conf_list import build_final_conf_list
+from cmfuncts.hal_hash_id import read_hash_data
+from cmfuncts.merge_batch import batch_year_search
+from cmfuncts.merge_conf_employees import read_corr_tables
+from cmfuncts.merge_conf_employees import read_merged_tables
+from cmfuncts.merge_incremental import incremental_year_search
+from cmfuncts.merge_stage import set_merge_paths
+from cmfuncts.progress_channel import ProgressChannel
+from cmfuncts.progress_channel import print_progress_status
+from cmfuncts.stage_metrics import save_memory_report
+from cmfuncts.stage_metrics import set_instrument_params
+from cmfuncts.useful_functs import create_cm_archi
+from cmfuncts.wf_mirror import pull_mirror
+from cmfuncts.wf_mirror import push_mirror
+
+
+STEPS_LIST = ['employees', 'extract', 'merge', 'conso', 'store']
+
+# Errors of a step that are recorded without stopping the other steps
+_STEP_ERRORS = (OSError, ValueError, KeyError, BadZipFile, StageCancelledError)
+
+
+def _run_employees_step(wf_root_path, force, channel=None, cancel_token=None):
+    """Runs the adaptation of the employees data through
+    the `update_hal_employees_data` function imported from
+    the `cmfuncts.build_employees` module.
+
+    The adaptation is skipped if the adapted employees data
+    are available and the force status is False.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        force (bool): Status for running the step even if its \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (tup): (Status (bool) of the employees-data update, \
+        the adapted employees data (dict) keyed by year).
+    """
+    paths_list, _ = set_empl_paths(wf_root_path)
+    _, all_empl_path, hal_all_empl_path = paths_list
+    if not force and os.path.isfile(hal_all_empl_path):
+        print("\nAdapted employees data already available: adaptation skipped")
+        return False, {}
+    if not os.path.isfile(all_empl_path):
+        raise FileNotFoundError(f"Employees data missing: {all_empl_path}")
+    if channel:
+        channel.set_stage("employees")
+    return update_hal_employees_data(wf_root_path, progress_callback=channel,
+                                     cancel_token=cancel_token)
+
+
+def _run_extract_step(institute, wf_path, corpus_year, force, channel=None,
+                      cancel_token=None):
+    """Runs the extraction of the contributions to conferences
+    through the `set_hal_to_conf` function imported from
+    the `cmfuncts.conf_extract` module.
+
+    The extraction is skipped if the extracted data are available
+    and the force status is False.
+
+    Args:
+        institute (str): The name of the Institute.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        force (bool): Status for running the step even if its \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    """
+    paths_list, _ = set_extract_paths(wf_path, corpus_year)
+    conf_file_path = paths_list[-1]
+    if not force and os.path.isfile(conf_file_path):
+        print(f"\nExtraction already available for {corpus_year}: extraction skipped")
+        return
+    if channel:
+        channel.set_stage(f"extract {corpus_year}")
+    _ = set_hal_to_conf(institute, wf_path, corpus_year, progress_callback=channel,
+                        cancel_token=cancel_token)
+    print(f"\nExtraction of contributions to conferences performed for {corpus_year}")
+
+
+def _run_merge_step(wf_root_path, wf_path, corpus_years,
+                    empl_tup, jobs, force, channel=None, cancel_token=None):
+    """Runs the merge of the contributions to conferences
+    with the employees data.
+
+    The corpus years with an available merge are updated through
+    the `incremental_year_search` function, unless the force status
+    is True or the employees data have been updated. The other
+    corpus years are merged through the `batch_year_search` function.
+    These functions are imported from the `cmfuncts.merge_incremental`
+    and `cmfuncts.merge_batch` modules respectively. The cancellation token is checked before each corpus year
+    and before the batch merge.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        empl_tup (tup): (Status (bool) of the employees-data update, \
+        the adapted employees data (dict) keyed by year).
+        jobs (int): The number of worker processes for the merge.
+        force (bool): Status for running the step even if its \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (dict): The merge status (bool) keyed by corpus year.
+    """
+    empl_update_status, employees_dict = empl_tup
+    if not employees_dict:
+        print("\nReading employees data...")
+        employees_dict = read_hal_employees_data(wf_root_path)
+
+    full_years = []
+    merge_status_dict = {}
+    for corpus_year in corpus_years:
+        paths_list, _ = set_merge_paths(wf_path, corpus_year)
+        valid_file_path = paths_list[1]
+        if force or empl_update_status or not os.path.isfile(valid_file_path):
+            full_years.append(corpus_year)
+        else:
+            check_cancel_token(cancel_token)
+            if channel:
+                channel.set_stage(f"merge {corpus_year}")
+            merge_status, _ = incremental_year_search(wf_root_path, wf_path, corpus_year,
+                                                      employees_dict=employees_dict,
+                                                      progress_callback=channel,
+                                                      cancel_token=cancel_token)
+            merge_status_dict[corpus_year] = merge_status
+
+    if full_years:
+        check_cancel_token(cancel_token)
+        if channel:
+            channel.set_stage(f"merge {' '.join(full_years)}")
+        merge_status_dict.update(batch_year_search(wf_root_path, wf_path, full_years,
+                                                   employees_dict=employees_dict,
+                                                   jobs=jobs, progress_callback=channel))
+    return merge_status_dict
+
+
+def _run_conso_step(wf_path, org_tup, corpus_year, force, channel=None,
+                    cancel_token=None):
+    """Runs the consolidation of the list of contributions to conferences
+    through the `build_final_conf_list` function imported from
+    the `cmfuncts.consolidate_conf_list` module.
+
+    The consolidation is skipped by this function if its inputs
+    are unchanged since its previous run and the force status is False.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        org_tup (tup): Contains Institute parameters.
+        corpus_year (str): 4 digits year of the corpus.
+        force (bool): Status for running the step even if its \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    """
+    if channel:
+        channel.set_stage(f"conso {corpus_year}")
+    _, split_ratio, conf_nb = build_final_conf_list(wf_path, org_tup, corpus_year,
+                                                    progress_callback=channel,
+                                                    force=force,
+                                                    cancel_token=cancel_token)
+    print(f"\nConsolidated list of {conf_nb} contributions to conferences available "
+          f"for {corpus_year} (split ratio: {split_ratio} %)")
+
+
+def _run_store_step(wf_path, corpus_year, force, channel=None):
+    """Fills the contributions store with the available files of a corpus year
+    through the `update_conf_store` function imported from the
+    `cmfuncts.conf_store` module.
+
+    The store is filled by the other steps; this step is skipped
+    if the corpus year is already in the store and the force status
+    is False.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        force (bool): Status for running the step even if its \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events (default=None).
+    """
+    if not force and corpus_year in read_store_years(wf_path):
+        print(f"\nContributions store already filled for {corpus_year}: filling skipped")
+        return
+    if channel:
+        channel.set_stage(f"store {corpus_year}")
+    conf_tables = read_corr_tables(wf_path, corpus_year)
+    valid_auth_df = None
+    merge_paths_list, _ = set_merge_paths(wf_path, corpus_year)
+    if os.path.isfile(merge_paths_list[1]):
+        _, valid_auth_df = read_merged_tables(wf_path, corpus_year)
+    try:
+        hash_id_df = read_hash_data(wf_path, corpus_year)
+    except FileNotFoundError:
+        hash_id_df = None
+    try:
+        cube_df = read_year_metrics_cube(wf_path, corpus_year)
+    except FileNotFoundError:
+        cube_df = None
+    if update_conf_store(wf_path, corpus_year, conf_tables=conf_tables,
+                         valid_auth_df=valid_auth_df, hash_id_df=hash_id_df,
+                         cube_df=cube_df):
+        print(f"\nContributions store filled for {corpus_year}")
+
+
+def _run_cm_steps(institute, wf_path, org_tup, corpus_years, steps, jobs, force,
+                  channel=None, cancel_token=None):
+    """Runs the steps of the ConfMeter treatments for several corpus years.
+
+    The folder of each corpus year is created through the `create_cm_archi`
+    function imported from the `cmfuncts.useful_functs` module if it
+    does not exist. A failing corpus year does not stop the treatments
+    of the other corpus years. When the treatments are cancelled through
+    'cancel_token', the cancelled step is recorded as error and the
+    following steps are not run.
+
+    Args:
+        institute (str): The name of the Institute.
+        wf_path (path): The full path to the working folder.
+        org_tup (tup): Contains Institute parameters.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        steps (list): The steps (str) to run.
+        jobs (int): The number of worker processes for the merge.
+        force (bool): Status for running the steps even if their \
+        results are available.
+        channel (ProgressChannel): Optional channel of the progress \
+        events of the steps (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (dict): The errors (str) keyed by the failing step names \
+        and corpus years.
+    """
+    wf_root_path = wf_path.parent
+
+    for corpus_year in corpus_years:
+        if not (wf_path / Path(corpus_year)).is_dir():
+            _ = create_cm_archi(wf_path, corpus_year, verbose=False)
+
+    errors_dict = {}
+    empl_tup = (False, {})
+    if 'employees' in steps:
+        try:
+            empl_tup = _run_employees_step(wf_root_path, force, channel, cancel_token)
+        except _STEP_ERRORS as err:
+            errors_dict['employees'] = str(err)
+            return errors_dict
+
+    if 'extract' in steps:
+        for corpus_year in corpus_years:
+            try:
+                _run_extract_step(institute, wf_path, corpus_year, force, channel,
+                                  cancel_token)
+            except StageCancelledError as err:
+                errors_dict[f"extract {corpus_year}"] = str(err)
+                return errors_dict
+            except _STEP_ERRORS as err:
+                errors_dict[f"extract {corpus_year}"] = str(err)
+
+    years_to_merge = [year for year in corpus_years if f"extract {year}" not in errors_dict]
+    if 'merge' in steps and years_to_merge:
+        try:
+            merge_status_dict = _run_merge_step(wf_root_path, wf_path, years_to_merge,
+                                                empl_tup, jobs, force, channel, cancel_token)
+            for corpus_year, merge_status in merge_status_dict.items():
+                if not merge_status:
+                    errors_dict[f"merge {corpus_year}"] = "merge not performed"
+        except StageCancelledError as err:
+            errors_dict["merge"] = str(err)
+            return errors_dict
+        except _STEP_ERRORS as err:
+            for corpus_year in years_to_merge:
+                errors_dict[f"merge {corpus_year}"] = str(err)
+
+    if 'conso' in steps:
+        for corpus_year in corpus_years:
+            if f"extract {corpus_year}" in errors_dict or f"merge {corpus_year}" in errors_dict:
+                continue
+            try:
+                _run_conso_step(wf_path, org_tup, corpus_year, force, channel,
+                                cancel_token)
+            except StageCancelledError as err:
+                errors_dict[f"conso {corpus_year}"] = str(err)
+                return errors_dict
+            except _STEP_ERRORS as err:
+                errors_dict[f"conso {corpus_year}"] = str(err)
+
+    if 'store' in steps:
+        for corpus_year in corpus_years:
+            if f"extract {corpus_year}" in errors_dict:
+                continue
+            try:
+                _run_store_step(wf_path, corpus_year, force, channel)
+            except _STEP_ERRORS as err:
+                errors_dict[f"store {corpus_year}"] = str(err)
+    return errors_dict
+
+
+def run_cm_batch(institute, wf_path, corpus_years, steps=None, jobs=None, force=False,
+                 channel=None, cancel_token=None, mirror=False, cache_root=None):
+    """Runs the ConfMeter treatments for several corpus years without GUI.
+
+    The steps are run through the `_run_cm_steps` internal function.
+    In mirror mode, the inputs of the corpus years are first copied
+    into a local mirror of the working folder through the `pull_mirror`
+    function, the steps are run on the local mirror and the changed files
+    are finally copied back to the working folder through the `push_mirror`
+    function, even if a step fails. These functions are imported from
+    the `cmfuncts.wf_mirror` module. The organization parameters of
+    the Institute are then read from the local mirror. The steps are
+    not run if local changes not yet copied back conflict with changes
+    of the working folder. The files in conflict are recorded as errors.
+
+    Args:
+        institute (str): The name of the Institute.
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        steps (list): Optional steps (str) to run among those \
+        of the 'STEPS_LIST' global; if None, all steps are run (default=None).
+        jobs (int): Optional number of worker processes for the merge \
+        (default=None).
+        force (bool): Status for running the steps even if their \
+        results are available (default=False).
+        channel (ProgressChannel): Optional channel of the progress \
+        events of the steps (default=None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+        mirror (bool): Optional status for running the steps on a local \
+        mirror of the working folder (default=False).
+        cache_root (path): Optional full path to the local folder of the \
+        mirrors; if None, the default one of the `cmfuncts.wf_mirror` \
+        module is used (default=None).
+    Returns:
+        (dict): The errors (str) keyed by the failing step names \
+        and corpus years or by the files in conflict.
+    """
+    if steps is None:
+        steps = STEPS_LIST
+    wf_path = Path(wf_path)
+    if not mirror:
+        org_tup = set_org_params(institute, wf_path.parent)
+        return _run_cm_steps(institute, wf_path, org_tup, corpus_years, steps,
+                             jobs, force, channel, cancel_token)
+
+    local_wf_path, conflicts_list = pull_mirror(wf_path, corpus_years, cache_root=cache_root)
+    errors_dict = {f"pull {rel_path}": "changed both locally and in the working folder"
+                   for rel_path in conflicts_list}
+    if errors_dict:
+        return errors_dict
+    try:
+        org_tup = set_org_params(institute, local_wf_path.parent)
+        errors_dict = _run_cm_steps(institute, local_wf_path, org_tup, corpus_years, steps,
+                                    jobs, force, channel, cancel_token)
+    finally:
+        _, conflicts_list = push_mirror(wf_path, corpus_years, cache_root=cache_root)
+        for rel_path in conflicts_list:
+            errors_dict[f"push {rel_path}"] = "changed in the working folder since the pull"
+    return errors_dict
+
+
+def _set_interrupt_handler(cancel_token):
+    """Sets the handler of the user interruption (Ctrl+C) so that
+    the first interruption cancels the treatments through the
+    cancellation token and the second one interrupts them immediately.
+
+    Args:
+        cancel_token (CancelToken): The cancellation token.
+    """
+    def _interrupt_handler(_signum, _frame):
+        if cancel_token.is_cancelled():
+            raise KeyboardInterrupt
+        print("\nCancellation requested: treatments stop at the next check "
+              "(Ctrl+C again to interrupt immediately)")
+        cancel_token.cancel()
+
+    signal.signal(signal.SIGINT, _interrupt_handler)
+
+
+def _build_parser():
+    """Builds the parser of the command-line arguments.
+
+    Returns:
+        (argparse.ArgumentParser): The parser.
+    """
+    parser = argparse.ArgumentParser(prog="confmeter-batch",
+                                     description="Runs the ConfMeter treatments without GUI.")
+    parser.add_argument("institute", help="Institute name")
+    parser.add_argument("wf_path", help="full path to the working folder")
+    parser.add_argument("years", nargs="+", help="4 digits corpus years")
+    parser.add_argument("--steps", nargs="+", choices=STEPS_LIST, default=STEPS_LIST,
+                        help="steps to run (default: all steps)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="number of worker processes for the merge "
+                             "(default: number of CPUs)")
+    parser.add_argument("--force", action="store_true",
+                        help="runs the steps even if their results are available")
+    parser.add_argument("--profile", action="store_true",
+                        help="dumps the cProfile stats of each step in the corpus-year folder")
+    parser.add_argument("--memory", action="store_true",
+                        help="records the memory metrics of each step and saves "
+                             "a memory report in the corpus-year folder")
+    parser.add_argument("--mirror", nargs="?", const="", default=None, metavar="CACHE_FOLDER",
+                        help="runs the steps on a local mirror of the working folder, "
+                             "optionally kept in CACHE_FOLDER, synchronized back at the end")
+    return parser
+
+
+def main(argv=None):
+    """Main function of the 'confmeter-batch' console script.
+
+    Args:
+        argv (list): Optional command-line arguments; if None, \
+        the arguments of the command line are used (default=None).
+    Returns:
+        (int): The exit code (0 if all the steps succeeded, 1 otherwise).
+    """
+    args = _build_parser().parse_args(argv)
+    if args.profile:
+        set_instrument_params(profile=True)
+    if args.memory:
+        set_instrument_params(memory=True)
+    channel = ProgressChannel(listener=print_progress_status)
+    cancel_token = CancelToken(stage="confmeter-batch")
+    _set_interrupt_handler(cancel_token)
+    errors_dict = run_cm_batch(args.institute, args.wf_path, args.years,
+                               steps=args.steps, jobs=args.jobs, force=args.force,
+                               channel=channel, cancel_token=cancel_token,
+                               mirror=args.mirror is not None,
+                               cache_root=args.mirror or None)
+    if args.memory:
+        for corpus_year in args.years:
+            print(save_memory_report(Path(args.wf_path), corpus_year))
+    if errors_dict:
+        print("\nFailing steps:")
+        for step, error in errors_dict.items():
+            print(f"    {step}: {error}")
+        return 1
+    print("\nAll steps performed")
+    return 0
+
+
+if __name__=="__main__":
+    sys.exit(main())
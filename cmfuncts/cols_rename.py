@@ -28,6 +28,7 @@ def build_hal_col_conversion_dic(org_tup):
     #"Liste ordonnée de tous les auteurs"                                 
 
     init_cm_cols_list = sum([[cm_cg.HASH_COL['hash_id'],
+                              cm_cg.HASH_COL['other_years'],
                               cm_cg.CONF_COLS['pub_id'],
                               cm_cg.CONF_COLS['pub_year'],
                               cm_cg.CONF_COLS['conf_year'],
@@ -51,6 +52,7 @@ def build_hal_col_conversion_dic(org_tup):
                             ], [])
 
     final_cm_cols_list = sum([[cm_cg.HASH_COL['hash_id'],
+                               cm_cg.HASH_COL['other_years'],
                                cm_cg.CONF_COLS['pub_id'],
                                cm_cg.CONF_COLS['pub_year'],
                                cm_cg.CONF_COLS['conf_year'],
@@ -7,7 +7,10 @@ in terms of:
 
 """
 
-__all__ = ['read_conf_extract',
+__all__ = ['build_hal_conf_tables',
+           'clean_hal_conf_data',
+           'read_conf_extract',
+           'read_conf_tables',
            'set_extract_paths',
            'set_hal_to_conf',
           ]
@@ -22,6 +25,15 @@ import pandas as pd
 
 # Local imports
 import cmfuncts.conf_globals as cm_cg
+import cmfuncts.institute_globals as cm_ig
+from cmfuncts.cancellation import check_cancel_token
+from cmfuncts.conf_store import update_conf_store
+from cmfuncts.conf_tables import build_conf_view
+from cmfuncts.conf_tables import split_conf_data
+from cmfuncts.progress_channel import post_progress
+from cmfuncts.stage_metrics import instrument_stage
+from cmfuncts.stage_metrics import record_frame
+from cmfuncts.stage_metrics import stage_record
 
 
 def _set_country_iso_dict():
@@ -37,7 +49,7 @@ def _set_country_iso_dict():
     country_cols_alias = cm_cg.CM_ARCHI['country_iso_usecols']  # ["Code", "English name"]
     
     # Setting specific paths independant from corpus_year
-    config_folder_path = Path(__file__).parent / Path(cm_cg.CONFIG_FOLDER)
+    config_folder_path = Path(__file__).parent / Path(cm_ig.CONFIG_FOLDER)
     country_iso_file_path = config_folder_path / Path(country_iso_file_alias)
 
     # Building ISO code-country dict
@@ -117,29 +129,30 @@ def _save_hal_data(wf_path, corpus_year, hal_full_df, hal_conf_df):
     return year_full_file, year_conf_file, hal_corpus_path
 
 
-def set_hal_to_conf(institute, wf_path, corpus_year, progress_callback=None):
+@instrument_stage(stage_name="hal_cleaning")
+def build_hal_conf_tables(hal_full_df, progress_callback=None, cancel_token=None):
     """Builts clean data of Institute contributions to conferences 
-    from the HAL extraction data for a corpus year.
-
-    The data are extracted from HAL database through the 
-    `build_hal_df_from_api` function of the `HalToJson` 
-    package imported as 'haj'. 
-    Then, the conferences data are built from the original data 
-    resulting from the HAL extraction. In particular, the country 
-    code is replaced by the country name using the 'code_country_dict' 
-    dict built through the `_set_country_iso_dict` internal function.
-    The final columns of the built data are defined by the values 
-    of the 'CONF_COLS' global. 
-    Finally, the built data are saved as xlsx files.
+    from the HAL extraction data as a publications table and 
+    an authorships table.
+
+    The publications table is built from the original data resulting 
+    from the HAL extraction with one row per publication. In particular, 
+    the country code is replaced by the country name using the 
+    'code_country_dict' dict built through the `_set_country_iso_dict` 
+    internal function. Its columns are given by the 'CONF_PUB_COLS_LIST' 
+    global. The authorships table is built by splitting the authors 
+    of each publication with the columns given by the 'CONF_AUTH_COLS_LIST' 
+    global.
 
     Args:
-        institute (str): The name of the Institute.
-        wf_path (path): The full path to the working folder.
-        corpus_year (str): 4 digits year of the corpus.
+        hal_full_df (dataframe): The data extracted from the HAL database.
         progress_callback (function): Function for updating ProgressBar \
         tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token checked \
+        for each publication (default = None).
     Returns:
-        (dataframe): The built data.
+        (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
     """
     # Setting useful aliases
     unknown_alias = cm_cg.INDISPONIBLE
@@ -157,64 +170,137 @@ def set_hal_to_conf(institute, wf_path, corpus_year, progress_callback=None):
     doctype_alias = cm_cg.CONF_COLS['doctype']            # "Type de document"
     full_ref_alias = cm_cg.HAL_USE_COLS['full_ref']       # "01"
 
-    # Extracting the HAL corpus
-    hal_full_df = haj.build_hal_df_from_api(corpus_year, institute.lower())   
-    if progress_callback:
-        progress_callback(20)
-    
-
     # Selecting communications and posters to build the conferences data
     init_hal_conf_df = hal_full_df[hal_full_df[doctype_alias].isin(cm_cg.CONF_TYPES)]
 
     # Cleaning the conferences data
-    clean_hal_conf_df = init_hal_conf_df.copy()
-    clean_hal_conf_df.replace(to_replace="NA", value=unknown_alias,
-                              inplace=True)
-    clean_hal_conf_df.reindex()
-    
+    pub_df = init_hal_conf_df.reset_index(drop=True)
+    record_frame("pub_df", pub_df, copy_status=True)
+    pub_df.replace(to_replace="NA", value=unknown_alias, inplace=True)
+
     # Getting ISO code-country to convert the country code
     # into the country name in the conferences data
     code_country_dict = _set_country_iso_dict()
-      
-    steps_nb = int(len(clean_hal_conf_df))    
-    if steps_nb:    
+
+    steps_nb = int(len(pub_df))
+    if steps_nb:
         if progress_callback:
             progress_bar = 40
             progress_callback(progress_bar)
             final_progress_bar = 90
             progress_step = (final_progress_bar - progress_bar) / steps_nb
 
-    # Adding useful columns to the conferences data 
-    new_hal_conf_df = pd.DataFrame(columns=cm_cg.HAL_USE_COLS.values())
-    pub_id = 0
-    for _, row in clean_hal_conf_df.iterrows():
-        row[pub_id_alias] = pub_id
-        row[town_alias] = row[full_ref_alias].split(", ")[-2].split("(")[0]
-        country_iso = str(row[country_alias]).upper()
-        row[country_alias] = code_country_dict[country_iso]
-        authors_list = row[authors_alias].split(",")
-        auth_id = 0
-        for author in authors_list:
-            row[auth_idx_alias] = auth_id
-            row[co_auth_alias] = author
-            row[first_author_alias] = authors_list[0]
-            row[conf_year_alias] = row[conf_date_alias][0:4]
-            row[pub_year_alias] = row[pub_date_alias][0:4]
-            new_hal_conf_df = pd.concat([new_hal_conf_df, row.to_frame().T])
-            auth_id += 1
-        pub_id += 1
+    # Building the authorships table
+    pub_ids, auth_idxs, co_authors, first_authors = [], [], [], []
+    for pub_id, authors in enumerate(pub_df[authors_alias]):
+        check_cancel_token(cancel_token)
+        authors_list = authors.split(",")
+        pub_ids += [pub_id] * len(authors_list)
+        auth_idxs += list(range(len(authors_list)))
+        co_authors += authors_list
+        first_authors.append(authors_list[0])
         if progress_callback:
             progress_bar += progress_step
-            progress_callback(progress_bar)
-    hal_conf_df = new_hal_conf_df[cm_cg.CONF_COLS.values()]
+            post_progress(progress_callback, progress_bar, rows=pub_id + 1)
+    auth_df = pd.DataFrame({pub_id_alias  : pub_ids,
+                            auth_idx_alias: auth_idxs,
+                            co_auth_alias : co_authors},
+                           columns=cm_cg.CONF_AUTH_COLS_LIST)
+
+    # Adding useful columns to the publications table
+    pub_df[pub_id_alias] = range(steps_nb)
+    pub_df[town_alias] = [full_ref.split(", ")[-2].split("(")[0]
+                          for full_ref in pub_df[full_ref_alias]]
+    pub_df[country_alias] = [code_country_dict[str(country_iso).upper()]
+                             for country_iso in pub_df[country_alias]]
+    pub_df[first_author_alias] = first_authors
+    pub_df[conf_year_alias] = [conf_date[0:4] for conf_date in pub_df[conf_date_alias]]
+    pub_df[pub_year_alias] = [pub_date[0:4] for pub_date in pub_df[pub_date_alias]]
+    pub_df = pub_df[cm_cg.CONF_PUB_COLS_LIST]
+    return pub_df, auth_df
+
+
+def clean_hal_conf_data(hal_full_df, progress_callback=None, cancel_token=None):
+    """Builts clean data of Institute contributions to conferences 
+    from the HAL extraction data with one row per author.
+
+    The publications and authorships tables are built through the 
+    `build_hal_conf_tables` function of the same module and joined 
+    through the `build_conf_view` function imported from the 
+    `cmfuncts.conf_tables` module. 
+    The final columns of the built data are defined by the values 
+    of the 'CONF_COLS' global. 
+
+    Args:
+        hal_full_df (dataframe): The data extracted from the HAL database.
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token checked \
+        for each publication (default = None).
+    Returns:
+        (dataframe): The built data.
+    """
+    pub_df, auth_df = build_hal_conf_tables(hal_full_df, progress_callback=progress_callback,
+                                            cancel_token=cancel_token)
+    hal_conf_df = build_conf_view(pub_df, auth_df)
+    return hal_conf_df
+
+
+@instrument_stage(stage_name="extraction")
+def set_hal_to_conf(institute, wf_path, corpus_year, progress_callback=None,
+                    cancel_token=None):
+    """Builts clean data of Institute contributions to conferences 
+    from the HAL extraction data for a corpus year.
+
+    The data are extracted from HAL database through the 
+    `build_hal_df_from_api` function of the `HalToJson` 
+    package imported as 'haj'. 
+    Then, the publications and authorships tables are built from the 
+    original data resulting from the HAL extraction through the 
+    `build_hal_conf_tables` function of the same module. 
+    Finally, the conferences data with one row per author are built 
+    from these tables through the `build_conf_view` function imported 
+    from the `cmfuncts.conf_tables` module and saved as xlsx files; 
+    the tables are also saved in the contributions store through the 
+    `update_conf_store` function imported from the `cmfuncts.conf_store` 
+    module.
+    The cancellation token is checked after the extraction, for each 
+    publication of the cleaning and before the saving so that no file 
+    is written when the treatment is cancelled.
+
+    Args:
+        institute (str): The name of the Institute.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default = None).
+    Returns:
+        (dataframe): The built data.
+    """
+    # Extracting the HAL corpus
+    with stage_record("hal_fetch") as record:
+        hal_full_df = haj.build_hal_df_from_api(corpus_year, institute.lower())
+        record['rows_out'] = len(hal_full_df)
+    if progress_callback:
+        progress_callback(20)
+    check_cancel_token(cancel_token)
+
+    # Building the conferences tables
+    pub_df, auth_df = build_hal_conf_tables(hal_full_df, progress_callback=progress_callback,
+                                            cancel_token=cancel_token)
 
     # Setting useful paths
     paths_list, _ = set_extract_paths(wf_path, corpus_year)
     _, full_file_path, conf_file_path = paths_list
 
     # Saving the full data and the conferences data
+    check_cancel_token(cancel_token)
+    hal_conf_df = build_conf_view(pub_df, auth_df)
     hal_full_df.to_excel(full_file_path, index=False)
     hal_conf_df.to_excel(conf_file_path, index=False)    
+    update_conf_store(wf_path, corpus_year, conf_tables=(pub_df, auth_df))
     if progress_callback:
         progress_callback(100)
 
@@ -242,3 +328,22 @@ def read_conf_extract(wf_path, corpus_year):
     conf_df = pd.read_excel(conf_file_path, usecols=cm_cg.CONF_COLS.values())
 
     return conf_df
+
+
+def read_conf_tables(wf_path, corpus_year):
+    """Gets the data of the contributions to conferences resulting 
+    from the HAL extraction as a publications table and an authorships table.
+
+    The data are read through the `read_conf_extract` function of the 
+    same module and split through the `split_conf_data` function 
+    imported from the `cmfuncts.conf_tables` module.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
+    """
+    conf_df = read_conf_extract(wf_path, corpus_year)
+    return split_conf_data(conf_df)
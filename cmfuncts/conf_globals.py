@@ -4,21 +4,32 @@ management and analysis.
 
 __all__ = ['CM_ARCHI',
            'CONF_ADD_COLS',
+           'CONF_AUTH_COLS_LIST',
            'CONF_COLS',
+           'CONF_CUBE_ALL',
+           'CONF_CUBE_COLS',
            'CONF_DF_TITLE',
            'CONF_NAMES_DIC',
+           'CONF_PUB_COLS_LIST',
+           'CONF_STORE_COLS',
+           'CONF_STORE_PARAMS',
            'CONF_TYPES',
            'CONF_TYPES_DIC',
-           'CONFIG_FOLDER',
            'DEDUP_COLS_LIST',
            'HAL_USE_COLS',
            'HASH_COL',
            'INDISPONIBLE',
+           'INSTRUMENT_PARAMS',
+           'MIRROR_PARAMS',
            'ORPHAN_ARCHI',
            'ORPHAN_SHEET_NAMES',
+           'NEAR_DUP_COLS',
+           'NEAR_DUP_PARAMS',
            'ORTHO_COLS',
            'PUB_ID_SHIFT',
            'ROW_COLORS',
+           'SESSION_CACHE_MAX_MB',
+           'XL_EXPORT_ENGINE',
            'XL_INDEX_BASE',
           ]
 
@@ -29,15 +40,35 @@ import bmfuncts.pub_globals as bm_pg
 INDISPONIBLE = "indisponible"
 
 
-CONFIG_FOLDER = 'ConfigFiles'
-
-
 PUB_ID_SHIFT = 500
 
 
 XL_INDEX_BASE = bm_pg.XL_INDEX_BASE
 
 
+XL_EXPORT_ENGINE = 'stream'
+
+
+SESSION_CACHE_MAX_MB = 500
+
+
+MIRROR_PARAMS = {'cache_folder': "ConfMeter_Miroir",
+                 'tmp_suffix'  : ".sync_tmp",
+                }
+
+
+CONF_STORE_PARAMS = {'version'  : 2,
+                     'timeout_s': 30,
+                    }
+
+
+INSTRUMENT_PARAMS = {'run_log'    : True,
+                     'profile'    : False,
+                     'memory'     : False,
+                     'max_records': 2000,
+                    }
+
+
 ROW_COLORS = bm_pg.ROW_COLORS
 
 
@@ -51,8 +82,21 @@ CM_ARCHI = {'corpus_folder'        : "0- HAL corpus",
             'hal_conf_file_base'   : " HAL conf.xlsx",
             'hal_corr_file_base'   : " HAL corr.xlsx",
             'hash_id_file_name'    : "Hash ID.xlsx",
+            'hash_registry_file'   : "Registre des Hash ID.json",
             'valid_authors'        : "Auteurs identifiés.xlsx",
             'orphan_authors'       : "Orphan.xlsx",
+            'merge_deps_file'      : "Dépendances du croisement.json",
+            'merge_manifest_file'  : "Manifeste du croisement.json",
+            'conso_manifest_file'  : "Manifeste de la consolidation.json",
+            'near_dup_file_name'   : "Doublons suspects.xlsx",
+            'near_dup_sheet_name'  : "Doublons suspects",
+            'run_log_file'         : "Journal d'exécution.json",
+            'profiles_folder'      : "Profils d'exécution",
+            'memory_report_file'   : "Rapport mémoire.xlsx",
+            'mirror_state_file'    : "Etat du miroir.json",
+            'conf_store_file'      : "Base des contributions.db",
+            'metrics_cube_file'    : "Cube des indicateurs.xlsx",
+            'metrics_cube_sheet'   : "Cube des indicateurs",
             'conf_list_file_base'  : bm_pg.ARCHI_YEAR["pub list file name base"],
            }
 
@@ -118,7 +162,28 @@ CONF_COLS = {'pub_id'      : "Pub_id",
              'organisms'   : HAL_USE_COLS['organisms'],             
             }
 
-HASH_COL = {'hash_id' : "Hash_id",}
+# Columns of the authorships table keyed by ['pub_id', 'author_idx'],
+# the other columns of 'CONF_COLS' being those of the publications table
+CONF_AUTH_COLS_LIST = [CONF_COLS['pub_id'],
+                       CONF_COLS['author_idx'],
+                       CONF_COLS['co_author'],]
+
+CONF_PUB_COLS_LIST = [CONF_COLS['pub_id']] + [col for col in CONF_COLS.values()
+                                             if col not in CONF_AUTH_COLS_LIST]
+
+HASH_COL = {'hash_id'     : "Hash_id",
+            'other_years' : "Autres années de corpus",
+           }
+
+CONF_STORE_COLS = {'corpus_year' : "Année de corpus",}
+
+NEAR_DUP_COLS = {'score' : "Similarité",}
+
+NEAR_DUP_PARAMS = {'shingle_size' : 5,
+                   'perm_nb'      : 64,
+                   'bands_nb'     : 16,
+                   'threshold'    : 0.7,
+                  }
 
 ORTHO_COLS = {'pub_fullname'  : "Nom pub complet",
               'empl_fullname' : "Nom eff complet",
@@ -137,6 +202,17 @@ CONF_ADD_COLS = {'author_type' : bm_pg.COL_NAMES_BONUS['author_type'],
                  'all_authors'  : bm_pg.COL_NAMES_BONUS['liste auteurs'],
                 }
 
+CONF_CUBE_COLS = {'corpus_year' : CONF_STORE_COLS['corpus_year'],
+                  'dpt'         : "Département",
+                  'doc_type'    : "Type de document",
+                  'country'     : CONF_COLS['country'],
+                  'author_type' : CONF_ADD_COLS['author_type'],
+                  'conf_nb'     : "Nombre de contributions",
+                  'auth_nb'     : "Nombre d'auteurs",
+                 }
+
+CONF_CUBE_ALL = "Tous"
+
 DEDUP_COLS_LIST = [CONF_COLS['pub_id'],
                    CONF_COLS['conf_year'],
                    CONF_COLS['first_author'],
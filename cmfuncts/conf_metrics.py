@@ -0,0 +1,266 @@
+"""Module of functions for the cube of metrics of the Institute
+contributions to conferences.
+
+The cube gives, for each corpus year, the counts of contributions
+and of Institute authorships by department, document type, country
+and author job type. It is built by the consolidation, saved in the
+final results folder of the corpus year and merged across the corpus
+years in the contributions store so that the multi-year trend tables
+are built from the precomputed cells without reading the lists.
+
+"""
+
+__all__ = ['build_metrics_cube',
+           'build_metrics_trend',
+           'read_metrics_cube',
+           'read_year_metrics_cube',
+           'save_metrics_cube',
+           'set_doc_type_keys',
+           'set_dpt_key_dict',
+          ]
+
+
+# Standard Library imports
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+from cmfuncts.conf_store import read_store_cube
+from cmfuncts.stage_metrics import instrument_stage
+
+
+def set_dpt_key_dict(dpt_label_dict):
+    """Sets the inverted index of the departments labels.
+
+    When a label is given for several departments, the last
+    department is kept.
+
+    Args:
+        dpt_label_dict (dict): The departments labels keyed by department.
+    Returns:
+        (dict): The departments keyed by label.
+    """
+    dpt_key_dict = {}
+    for key, values in dpt_label_dict.items():
+        for value in values:
+            dpt_key_dict[value] = key
+    return dpt_key_dict
+
+
+def set_doc_type_keys(doctype_series):
+    """Sets the key of the 'CONF_TYPES_DIC' global of each document type,
+    the document types not found in the global being set to 'others'.
+
+    Args:
+        doctype_series (series): The document types (str).
+    Returns:
+        (series): The keys (str) of the document types.
+    """
+    doctype_key_dict = {}
+    for key, doctype_list in cm_cg.CONF_TYPES_DIC.items():
+        for doctype in doctype_list:
+            doctype_key_dict[doctype.upper()] = key
+    keys_series = doctype_series.str.upper().map(doctype_key_dict)
+    keys_series = keys_series.fillna('others')
+    return keys_series
+
+
+@instrument_stage(stage_name="metrics_cube")
+def build_metrics_cube(org_tup, corpus_year, merged_df):
+    """Builds the cube of metrics of the contributions to conferences
+    of a corpus year.
+
+    The cells are keyed by department, document type, country and author
+    job type and give the number of distinct contributions and the number
+    of Institute authorships. The department of each author is got from
+    the inverted index of the departments labels built through the
+    `set_dpt_key_dict` function of the same module, the authors of
+    no department being set to the 'others' value of the 'CONF_NAMES_DIC'
+    global. As a contribution may have authors of several departments
+    and job types, the numbers of contributions are not additive along
+    these two dimensions; the cells where the department, the job type
+    or both are set to the 'CONF_CUBE_ALL' global are thus also computed.
+    The numbers are additive along the corpus years, the document types
+    and the countries.
+
+    Args:
+        org_tup (tup): Contains Institute parameters.
+        corpus_year (str): 4 digits year of the corpus.
+        merged_df (dataframe): The list of Institute contributions \
+        to conferences with one row per Institute-affiliated author \
+        merged with employees data and with the author job type.
+    Returns:
+        (dataframe): The cube with the columns of the 'CONF_CUBE_COLS' global.
+    """
+    # Setting useful aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    auth_idx_alias = cm_cg.CONF_COLS['author_idx']
+    doctype_alias = cm_cg.CONF_COLS['doctype']
+    country_alias = cm_cg.CONF_COLS['country']
+    author_type_alias = cm_cg.CONF_ADD_COLS['author_type']
+    dept_alias = cm_eg.EMPLOYEES_USEFUL_COLS['dpt']
+    corpus_year_col = cm_cg.CONF_CUBE_COLS['corpus_year']
+    dpt_col = cm_cg.CONF_CUBE_COLS['dpt']
+    doc_type_col = cm_cg.CONF_CUBE_COLS['doc_type']
+    country_col = cm_cg.CONF_CUBE_COLS['country']
+    author_type_col = cm_cg.CONF_CUBE_COLS['author_type']
+    conf_nb_col = cm_cg.CONF_CUBE_COLS['conf_nb']
+    auth_nb_col = cm_cg.CONF_CUBE_COLS['auth_nb']
+    all_alias = cm_cg.CONF_CUBE_ALL
+
+    dims_list = [dpt_col, doc_type_col, country_col, author_type_col]
+    if merged_df.empty:
+        return pd.DataFrame(columns=list(cm_cg.CONF_CUBE_COLS.values()))
+
+    # Setting the dimensions of each Institute authorship
+    dpt_key_dict = set_dpt_key_dict(org_tup[1])
+    authors_df = merged_df.drop_duplicates(subset=[pub_id_alias, auth_idx_alias])
+    dpt_series = authors_df[dept_alias].map(dpt_key_dict)\
+                                       .fillna(cm_cg.CONF_NAMES_DIC['others'])
+    doc_type_series = set_doc_type_keys(authors_df[doctype_alias].astype(str))\
+                                       .map(cm_cg.CONF_NAMES_DIC)
+    facts_df = pd.DataFrame({pub_id_alias   : authors_df[pub_id_alias],
+                             dpt_col        : dpt_series,
+                             doc_type_col   : doc_type_series,
+                             country_col    : authors_df[country_alias].fillna(cm_cg.INDISPONIBLE),
+                             author_type_col: authors_df[author_type_alias].fillna(cm_cg.INDISPONIBLE),
+                            })
+    facts_df = facts_df.astype({country_col: str, author_type_col: str})
+
+    # Counting for each grouping set of the departments and job types
+    cubes_list = []
+    for all_cols_list in [[], [author_type_col], [dpt_col], [dpt_col, author_type_col]]:
+        set_df = facts_df.assign(**{col: all_alias for col in all_cols_list})
+        set_cube_df = set_df.groupby(dims_list, sort=False)\
+                            .agg(**{conf_nb_col: (pub_id_alias, 'nunique'),
+                                    auth_nb_col: (pub_id_alias, 'size')})\
+                            .reset_index()
+        cubes_list.append(set_cube_df)
+    cube_df = pd.concat(cubes_list, ignore_index=True)
+    cube_df.insert(0, corpus_year_col, corpus_year)
+    cube_df = cube_df.sort_values(by=dims_list).reset_index(drop=True)
+    return cube_df
+
+
+def _set_cube_path(wf_path, corpus_year):
+    """Sets the full path to the file of the cube of metrics of a corpus year.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (path): The full path to the file.
+    """
+    year_cmf_path = wf_path / Path(corpus_year)
+    results_folder_path = year_cmf_path / Path(cm_cg.CM_ARCHI['final_results_folder'])
+    cube_path = results_folder_path / Path(cm_cg.CM_ARCHI['metrics_cube_file'])
+    return cube_path
+
+
+def save_metrics_cube(wf_path, corpus_year, cube_df):
+    """Saves the cube of metrics of a corpus year in the final results folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        cube_df (dataframe): The cube got through the `build_metrics_cube` \
+        function of the same module.
+    Returns:
+        (str): End message.
+    """
+    cube_path = _set_cube_path(wf_path, corpus_year)
+    cube_df.to_excel(cube_path, index=False,
+                     sheet_name=cm_cg.CM_ARCHI['metrics_cube_sheet'])
+    message = (f"\nCube of metrics of {len(cube_df)} cells saved in file: "
+               f"\n  {cube_path}")
+    return message
+
+
+def read_year_metrics_cube(wf_path, corpus_year):
+    """Reads the cube of metrics of a corpus year saved
+    in the final results folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (dataframe): The cube of the corpus year.
+    """
+    cube_df = pd.read_excel(_set_cube_path(wf_path, corpus_year),
+                            dtype={cm_cg.CONF_CUBE_COLS['corpus_year']: str},
+                            keep_default_na=False)
+    return cube_df
+
+
+def read_metrics_cube(wf_path, corpus_years=None):
+    """Reads the cube of metrics merged across the corpus years.
+
+    The cube is read from the contributions store through the
+    `read_store_cube` function imported from the `cmfuncts.conf_store`
+    module, where the cube of each corpus year is replaced at each
+    consolidation.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): Optional 4 digits corpus years (str); \
+        if None, all the corpus years of the store are read (default=None).
+    Returns:
+        (dataframe): The cube with the columns of the 'CONF_CUBE_COLS' global.
+    """
+    cube_df = read_store_cube(wf_path, corpus_years=corpus_years)
+    if cube_df.empty:
+        return pd.DataFrame(columns=list(cm_cg.CONF_CUBE_COLS.values()))
+    return cube_df
+
+
+def build_metrics_trend(cube_df, dims_list=None, measure='conf_nb'):
+    """Builds a multi-year trend table from the cube of metrics.
+
+    The dimensions not kept are summed over, using the cells where
+    the department and the job type are set to the 'CONF_CUBE_ALL'
+    global when these dimensions are not kept, so that each contribution
+    is counted once.
+
+    ex:
+       build_metrics_trend(cube_df, dims_list=['dpt', 'doc_type'])
+       => one row per department and document type, one column per corpus year.
+
+    Args:
+        cube_df (dataframe): The cube got through the `read_metrics_cube` \
+        function of the same module.
+        dims_list (list): Optional keys (str) of the 'CONF_CUBE_COLS' global \
+        among 'dpt', 'doc_type', 'country' and 'author_type' of the dimensions \
+        kept as rows; if None, 'dpt' is kept (default=None).
+        measure (str): The key of the 'CONF_CUBE_COLS' global of the counts, \
+        either 'conf_nb' or 'auth_nb' (default='conf_nb').
+    Returns:
+        (dataframe): The counts with the kept dimensions as index and \
+        the corpus years as columns.
+    """
+    # Setting useful aliases
+    corpus_year_col = cm_cg.CONF_CUBE_COLS['corpus_year']
+    measure_col = cm_cg.CONF_CUBE_COLS[measure]
+    all_alias = cm_cg.CONF_CUBE_ALL
+
+    if dims_list is None:
+        dims_list = ['dpt']
+
+    # Selecting the cells of the grouping set of the kept dimensions
+    trend_df = cube_df
+    for key in ['dpt', 'author_type']:
+        col = cm_cg.CONF_CUBE_COLS[key]
+        if key in dims_list:
+            trend_df = trend_df[trend_df[col]!=all_alias]
+        else:
+            trend_df = trend_df[trend_df[col]==all_alias]
+
+    # Summing over the other dimensions
+    index_cols_list = [cm_cg.CONF_CUBE_COLS[key] for key in dims_list]
+    trend_df = trend_df.groupby(index_cols_list + [corpus_year_col])[measure_col].sum()
+    if not index_cols_list:
+        return trend_df.to_frame().T
+    return trend_df.unstack(corpus_year_col, fill_value=0)
@@ -0,0 +1,346 @@
+"""Module of functions for the SQLite store of the contributions
+to conferences of all the corpus years of a working folder.
+
+The store is a single SQLite file located in the working folder and
+populated incrementally by the treatment stages, each stage replacing
+the rows of its corpus year:
+
+- the extraction and the merge fill the 'publications' and \
+'authorships' tables;
+- the merge fills the 'employee_matches' table with the employee \
+attributes of the Institute-affiliated authors;
+- the creation of the hash IDs fills the 'hash_ids' table;
+- the consolidation fills the 'metrics_cube' table with the cube \
+of metrics of the corpus year.
+
+The tables are indexed on the matricule, the department, the years,
+the conference name and the hash ID so that the cross-year queries
+of the `query_conf_store` function do not open any workbook.
+The store is derived data: it is rebuilt when its schema version
+changes and a failing update does not fail the treatment stage.
+
+"""
+
+__all__ = ['query_conf_store',
+           'read_store_cube',
+           'read_store_years',
+           'update_conf_store',
+          ]
+
+
+# Standard Library imports
+import sqlite3
+from contextlib import closing
+from contextlib import contextmanager
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+
+
+# Columns of the tables keyed by the store column name
+# and valued by the column name of the dataframes
+_PUB_COLS_DICT = {key: col for key, col in cm_cg.CONF_COLS.items()
+                  if col in cm_cg.CONF_PUB_COLS_LIST}
+_AUTH_COLS_DICT = {key: col for key, col in cm_cg.CONF_COLS.items()
+                   if col in cm_cg.CONF_AUTH_COLS_LIST}
+_MATCH_COLS_DICT = {'pub_id'    : cm_cg.CONF_COLS['pub_id'],
+                    'author_idx': cm_cg.CONF_COLS['author_idx'],
+                    **cm_eg.EMPLOYEES_USEFUL_COLS}
+_HASH_COLS_DICT = {'pub_id' : cm_cg.CONF_COLS['pub_id'],
+                   'hash_id': cm_cg.HASH_COL['hash_id']}
+_CUBE_COLS_DICT = {key: col for key, col in cm_cg.CONF_CUBE_COLS.items()
+                   if key!='corpus_year'}
+
+# Store tables valued by (columns (dict), primary-key columns (list))
+_STORE_TABLES = {'publications'    : (_PUB_COLS_DICT, ['pub_id']),
+                 'authorships'     : (_AUTH_COLS_DICT, ['pub_id', 'author_idx']),
+                 'employee_matches': (_MATCH_COLS_DICT, []),
+                 'hash_ids'        : (_HASH_COLS_DICT, ['pub_id']),
+                 'metrics_cube'    : (_CUBE_COLS_DICT, ['dpt', 'doc_type', 'country',
+                                                        'author_type']),
+                }
+
+# Store indexes valued by (table, indexed columns (list))
+_STORE_INDEXES = {'idx_matches_matricule': ('employee_matches', ['matricule']),
+                  'idx_matches_dpt'      : ('employee_matches', ['dpt']),
+                  'idx_matches_pub'      : ('employee_matches', ['corpus_year', 'pub_id']),
+                  'idx_pubs_conf_year'   : ('publications', ['conf_year']),
+                  'idx_pubs_conf_name'   : ('publications', ['conf_name']),
+                  'idx_hash_ids_hash_id' : ('hash_ids', ['hash_id']),
+                  'idx_cube_dpt'         : ('metrics_cube', ['dpt']),
+                 }
+
+_INT_COLS_LIST = ['pub_id', 'author_idx', 'conf_nb', 'auth_nb']
+
+
+def _set_store_path(wf_path):
+    """Sets the full path to the store of the working folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+    Returns:
+        (path): The full path to the store file.
+    """
+    store_path = Path(wf_path) / Path(cm_cg.CM_ARCHI['conf_store_file'])
+    return store_path
+
+
+def _create_store_tables(conn, store_version):
+    """Drops the tables of the store and creates again its tables
+    and indexes for a schema version.
+
+    The version is checked again once the store is locked as another
+    process may have created the tables meanwhile.
+
+    Args:
+        conn (sqlite3.Connection): The connection to the store.
+        store_version (int): The schema version of the store.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    with conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0]==store_version:
+            return
+        for table in _STORE_TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        for table, (cols_dict, key_cols_list) in _STORE_TABLES.items():
+            cols_list = ["corpus_year TEXT NOT NULL"]
+            cols_list += [f"{col} INTEGER" if col in _INT_COLS_LIST else f"{col} TEXT"
+                          for col in cols_dict]
+            if key_cols_list:
+                cols_list.append(f"PRIMARY KEY ({', '.join(['corpus_year'] + key_cols_list)})")
+            conn.execute(f"CREATE TABLE {table} ({', '.join(cols_list)})")
+        for index, (table, index_cols_list) in _STORE_INDEXES.items():
+            conn.execute(f"CREATE INDEX {index} ON {table} ({', '.join(index_cols_list)})")
+        conn.execute(f"PRAGMA user_version = {int(store_version)}")
+
+
+@contextmanager
+def _connect_store(wf_path):
+    """Opens a connection to the store of the working folder
+    and creates its tables and indexes if needed.
+
+    The tables are dropped and created again through
+    the `_create_store_tables` internal function when the schema
+    version of the store differs from the 'version' key
+    of the 'CONF_STORE_PARAMS' global. The connection is closed
+    when leaving the context, even if the tables creation fails.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+    Yields:
+        (sqlite3.Connection): The connection to the store.
+    """
+    store_version = cm_cg.CONF_STORE_PARAMS['version']
+    with closing(sqlite3.connect(_set_store_path(wf_path),
+                                 timeout=cm_cg.CONF_STORE_PARAMS['timeout_s'])) as conn:
+        if conn.execute("PRAGMA user_version").fetchone()[0]!=store_version:
+            _create_store_tables(conn, store_version)
+        yield conn
+
+
+def _set_table_rows(df, cols_dict, corpus_year):
+    """Sets the rows to insert in a store table from a dataframe.
+
+    The missing columns and values are set to NULL, the ID columns
+    are converted to integers and the other values to strings.
+
+    Args:
+        df (dataframe): The data to insert.
+        cols_dict (dict): The dataframe column names keyed by store column name.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (list): The rows (tup) to insert.
+    """
+    values_list = [[corpus_year] * len(df)]
+    for key, col in cols_dict.items():
+        if col not in df.columns:
+            values_list.append([None] * len(df))
+        elif key in _INT_COLS_LIST:
+            values_list.append([None if pd.isna(value) else int(value) for value in df[col]])
+        else:
+            values_list.append([None if pd.isna(value) else str(value) for value in df[col]])
+    return list(zip(*values_list))
+
+
+def _unset_year_pub_id(year_pub_id):
+    """Sets back the initial ID of a contribution from its year ID
+    set by the consolidation, such as "22_501" for the initial ID 1
+    with the 'PUB_ID_SHIFT' global equal to 500.
+
+    Args:
+        year_pub_id (str): The year ID of the contribution.
+    Returns:
+        (int): The initial ID of the contribution.
+    """
+    pub_id = int(str(year_pub_id).rsplit("_", 1)[-1]) - cm_cg.PUB_ID_SHIFT
+    return pub_id
+
+
+def update_conf_store(wf_path, corpus_year, conf_tables=None, valid_auth_df=None,
+                      hash_id_df=None, cube_df=None):
+    """Replaces the rows of a corpus year in the tables of the store
+    for the given data.
+
+    All the given data are written in a single transaction.
+    A failure of the store, such as a lock held too long by another
+    process, is printed without being raised.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        conf_tables (tup): Optional (publications table (dataframe), \
+        authorships table (dataframe)) built through the `split_conf_data` \
+        function imported from the `cmfuncts.conf_tables` module (default=None).
+        valid_auth_df (dataframe): Optional authorships merged with \
+        employees data (default=None).
+        hash_id_df (dataframe): Optional data of hash ID per year ID \
+        of the contributions set by the consolidation (default=None).
+        cube_df (dataframe): Optional cube of metrics built through \
+        the `build_metrics_cube` function imported from \
+        the `cmfuncts.conf_metrics` module (default=None).
+    Returns:
+        (bool): True if the store has been updated.
+    """
+    tables_dict = {}
+    if conf_tables is not None:
+        tables_dict['publications'], tables_dict['authorships'] = conf_tables
+    if valid_auth_df is not None:
+        tables_dict['employee_matches'] = valid_auth_df
+    if hash_id_df is not None:
+        pub_id_alias = cm_cg.CONF_COLS['pub_id']
+        hash_id_df = hash_id_df.assign(**{pub_id_alias: hash_id_df[pub_id_alias]
+                                          .map(_unset_year_pub_id)})
+        tables_dict['hash_ids'] = hash_id_df
+    if cube_df is not None:
+        tables_dict['metrics_cube'] = cube_df
+
+    try:
+        with _connect_store(wf_path) as conn:
+            with conn:
+                for table, df in tables_dict.items():
+                    cols_dict, _ = _STORE_TABLES[table]
+                    conn.execute(f"DELETE FROM {table} WHERE corpus_year = ?", (corpus_year,))
+                    placeholders = ", ".join(["?"] * (len(cols_dict) + 1))
+                    conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})",
+                                     _set_table_rows(df, cols_dict, corpus_year))
+    except sqlite3.Error as err:
+        print(f"\nContributions store not updated for {corpus_year}: {err}")
+        return False
+    return True
+
+
+def read_store_years(wf_path):
+    """Reads the corpus years available in the store.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+    Returns:
+        (list): The sorted corpus years (str) with publications \
+        in the store; empty list if the store does not exist.
+    """
+    if not _set_store_path(wf_path).is_file():
+        return []
+    with _connect_store(wf_path) as conn:
+        rows_list = conn.execute("SELECT DISTINCT corpus_year FROM publications "
+                                 "ORDER BY corpus_year").fetchall()
+    return [row[0] for row in rows_list]
+
+
+def read_store_cube(wf_path, corpus_years=None):
+    """Reads the cube of metrics of the corpus years of the store.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): Optional 4 digits corpus years (str); \
+        if None, all the corpus years are read (default=None).
+    Returns:
+        (dataframe): The cube with the columns of the 'CONF_CUBE_COLS' \
+        global; empty dataframe if the store does not exist.
+    """
+    if not _set_store_path(wf_path).is_file():
+        return pd.DataFrame()
+
+    query = f"SELECT corpus_year, {', '.join(_CUBE_COLS_DICT)} FROM metrics_cube"
+    params_list = []
+    if corpus_years:
+        placeholders = ", ".join(["?"] * len(corpus_years))
+        query += f" WHERE corpus_year IN ({placeholders})"
+        params_list = [str(year) for year in corpus_years]
+    query += " ORDER BY corpus_year, dpt, doc_type, country, author_type"
+
+    with _connect_store(wf_path) as conn:
+        cube_df = pd.read_sql_query(query, conn, params=params_list)
+    cube_df = cube_df.rename(columns=cm_cg.CONF_CUBE_COLS)
+    return cube_df
+
+
+def query_conf_store(wf_path, matricule=None, dpt_labels=None, corpus_years=None,
+                     conf_name=None, hash_id=None):
+    """Queries the contributions to conferences of all the corpus years
+    of the store matching all the given criteria.
+
+    ex:
+       query_conf_store(wf_path, matricule="123456")
+       => all the contributions of the employee across the corpus years.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        matricule (str): Optional matricule of an Institute-affiliated \
+        author of the contributions (default=None).
+        dpt_labels (list): Optional department labels (str) of at least \
+        one author of the contributions, such as the labels of a department \
+        given by the Institute parameters (default=None).
+        corpus_years (list): Optional 4 digits corpus years (str) (default=None).
+        conf_name (str): Optional conference name (default=None).
+        hash_id (str): Optional hash ID of the contributions (default=None).
+    Returns:
+        (dataframe): The contributions with one row per corpus year and \
+        'Pub_id' sorted by corpus year and 'Pub_id'.
+    """
+    # Setting useful aliases
+    corpus_year_alias = cm_cg.CONF_STORE_COLS['corpus_year']
+
+    if not _set_store_path(wf_path).is_file():
+        return pd.DataFrame()
+
+    match_query = ("(p.corpus_year, p.pub_id) IN (SELECT corpus_year, pub_id "
+                   "FROM employee_matches WHERE {})")
+    conditions_list, params_list = [], []
+    if matricule is not None:
+        conditions_list.append(match_query.format("matricule = ?"))
+        params_list.append(str(matricule))
+    if dpt_labels:
+        placeholders = ", ".join(["?"] * len(dpt_labels))
+        conditions_list.append(match_query.format(f"dpt IN ({placeholders})"))
+        params_list += [str(label) for label in dpt_labels]
+    if corpus_years:
+        placeholders = ", ".join(["?"] * len(corpus_years))
+        conditions_list.append(f"p.corpus_year IN ({placeholders})")
+        params_list += [str(year) for year in corpus_years]
+    if conf_name is not None:
+        conditions_list.append("p.conf_name = ?")
+        params_list.append(conf_name)
+    if hash_id is not None:
+        conditions_list.append("h.hash_id = ?")
+        params_list.append(str(hash_id))
+
+    pub_cols_list = [f"p.{key}" for key in _PUB_COLS_DICT if key!='pub_id']
+    query = (f"SELECT p.corpus_year, p.pub_id, h.hash_id, {', '.join(pub_cols_list)} "
+             "FROM publications p LEFT JOIN hash_ids h "
+             "ON h.corpus_year = p.corpus_year AND h.pub_id = p.pub_id")
+    if conditions_list:
+        query += " WHERE " + " AND ".join(conditions_list)
+    query += " ORDER BY p.corpus_year, p.pub_id"
+
+    with _connect_store(wf_path) as conn:
+        store_df = pd.read_sql_query(query, conn, params=params_list)
+    cols_rename_dict = {'corpus_year': corpus_year_alias,
+                        'hash_id'    : cm_cg.HASH_COL['hash_id'],
+                        **_PUB_COLS_DICT}
+    store_df = store_df.rename(columns=cols_rename_dict)
+    return store_df
@@ -0,0 +1,76 @@
+"""Module of functions for handling the data of the contributions
+to conferences as two normalized tables:
+
+- the publications table with one row per publication keyed by 'Pub_id' \
+and the columns of the 'CONF_PUB_COLS_LIST' global;
+- the authorships table with one row per author keyed by 'Pub_id' \
+and 'Idx_author' with the columns of the 'CONF_AUTH_COLS_LIST' global \
+and any column specific to the author such as the join key or the \
+employee attributes added by the merge.
+
+The treatments work on these tables and the wide data with one row
+per author carrying all the publication attributes, as saved in the
+files of the working folder, is only built for the export.
+
+"""
+
+__all__ = ['build_conf_view',
+           'split_conf_data',
+          ]
+
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+
+
+def split_conf_data(conf_df):
+    """Splits the data of contributions to conferences with one row
+    per author into the publications table and the authorships table.
+
+    The publication attributes are taken from the first row
+    of each publication.
+
+    Args:
+        conf_df (dataframe): The data with one row per author.
+    Returns:
+        (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
+    """
+    # Setting useful aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+
+    pub_cols_list = [col for col in cm_cg.CONF_PUB_COLS_LIST if col in conf_df.columns]
+    auth_cols_list = [pub_id_alias] + [col for col in conf_df.columns
+                                       if col not in pub_cols_list]
+    pub_df = conf_df[pub_cols_list].drop_duplicates(subset=[pub_id_alias])
+    pub_df = pub_df.reset_index(drop=True)
+    auth_df = conf_df[auth_cols_list].reset_index(drop=True)
+    return pub_df, auth_df
+
+
+def build_conf_view(pub_df, auth_df):
+    """Builds the data of contributions to conferences with one row
+    per author from the publications table and the authorships table.
+
+    The rows follow the order of the authorships table. The columns
+    of the 'CONF_COLS' global come first in their order followed by
+    the other columns of the authorships table.
+
+    Args:
+        pub_df (dataframe): The publications table.
+        auth_df (dataframe): The authorships table.
+    Returns:
+        (dataframe): The data with one row per author.
+    """
+    # Setting useful aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+
+    if pub_id_alias not in auth_df.columns:
+        return pd.DataFrame()
+    view_df = auth_df.merge(pub_df, how='left', on=pub_id_alias)
+    conf_cols_list = [col for col in cm_cg.CONF_COLS.values() if col in view_df.columns]
+    other_cols_list = [col for col in auth_df.columns if col not in conf_cols_list]
+    return view_df[conf_cols_list + other_cols_list]
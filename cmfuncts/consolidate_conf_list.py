@@ -19,11 +19,27 @@ from bmfuncts.useful_functs import set_year_pub_id
 # Local imports
 import cmfuncts.conf_globals as cm_cg
 import cmfuncts.employees_globals as cm_eg
+from cmfuncts.author_type_rules import compile_author_type_rules
+from cmfuncts.author_type_rules import set_author_types
+from cmfuncts.cancellation import check_cancel_token
 from cmfuncts.cols_rename import build_hal_col_conversion_dic
+from cmfuncts.conf_metrics import build_metrics_cube
+from cmfuncts.conf_metrics import save_metrics_cube
+from cmfuncts.conf_metrics import set_doc_type_keys
+from cmfuncts.conf_metrics import set_dpt_key_dict
+from cmfuncts.conf_store import update_conf_store
 from cmfuncts.hal_hash_id import create_hal_hash_id
+from cmfuncts.hal_hash_id import read_hash_registry
 from cmfuncts.format_files import format_hal_page
 from cmfuncts.merge_conf_employees import read_merged_data
 from cmfuncts.merge_conf_employees import save_merged_data
+from cmfuncts.near_duplicates import find_near_duplicates
+from cmfuncts.near_duplicates import save_near_duplicates
+from cmfuncts.stage_cache import check_stage_manifest
+from cmfuncts.stage_cache import save_stage_manifest
+from cmfuncts.stage_cache import set_file_fingerprint
+from cmfuncts.stage_cache import set_params_fingerprint
+from cmfuncts.stage_metrics import instrument_stage
 
 
 def _add_hal_author_job_type(merged_df):
@@ -33,6 +49,9 @@ def _add_hal_author_job_type(merged_df):
     The job type is got from the employee information available 
     in 3 columns which names are given by 'category_col_alias', 
     'status_col_alias' and 'qualification_col_alias'. 
+    The rules are compiled through the `compile_author_type_rules` 
+    function and applied through the `set_author_types` function 
+    imported from the `cmfuncts.author_type_rules` module.
     The name of the new column is given by 'author_type_col_alias'.
 
     Args:
@@ -42,16 +61,6 @@ def _add_hal_author_job_type(merged_df):
     Returns:
         (dataframe): The updated data.
     """
-    # internal functions:
-    def _get_author_type(row):
-        author_type = '-'
-        for col_name, dic in author_types_dic.items():
-            for key,values_list in dic.items():
-                values_status = [True for value in values_list if value in row[col_name]]
-                if any(values_status):
-                    author_type = key
-        return author_type
-
     # Setting useful aliases
     category_col_alias = cm_eg.EMPLOYEES_USEFUL_COLS['category']
     status_col_alias = cm_eg.EMPLOYEES_USEFUL_COLS['status']
@@ -62,7 +71,8 @@ def _add_hal_author_job_type(merged_df):
                         status_col_alias        : cm_eg.STATUS_DIC,
                         qualification_col_alias : cm_eg.QUALIFICATION_DIC}
 
-    merged_df[author_type_col_alias] = merged_df.apply(_get_author_type, axis=1)
+    rules_list = compile_author_type_rules(author_types_dic)
+    merged_df[author_type_col_alias] = set_author_types(merged_df, rules_list)
     
     return merged_df
 
@@ -70,6 +80,10 @@ def _add_hal_author_job_type(merged_df):
 def _set_hal_full_ref(title, first_author, conf_name, conf_year, conf_country, pub_year, doi):
     """Builds the full reference of a publication.
 
+    The items may be either strings or series of strings, 
+    in which case the full references are built for all 
+    the items at once.
+
     Args:
         title (str): Title of the publication.
         first_author (str): First author of the publication formated as 'NAME IJ' \
@@ -78,14 +92,14 @@ def _set_hal_full_ref(title, first_author, conf_name, conf_year, conf_country, p
         pub_year (str): Publication year defined by 4 digits.
         doi (str): Digital identification of the publication.
     Returns:
-        (str): Full reference of the publication.
+        (str or series): Full reference of the publication.
     """
-    full_ref  = f'{title}, '                     # add the reference's title
-    full_ref += f'{first_author}. et al., '      # add the reference's first author
-    full_ref += f'{conf_name}, '                 # add the reference's conference name
-    full_ref += f'{conf_country}-{conf_year}, '  # add the reference's conference country and year
-    full_ref += f'{pub_year}'                    # add the reference's publication year
-    full_ref += f'{doi}'                         # add the reference's DOI if available
+    full_ref  = title + ', '                          # add the reference's title
+    full_ref += first_author + '. et al., '           # add the reference's first author
+    full_ref += conf_name + ', '                      # add the reference's conference name
+    full_ref += conf_country + '-' + conf_year + ', ' # add the reference's conference country and year
+    full_ref += pub_year                              # add the reference's publication year
+    full_ref += doi                                   # add the reference's DOI if available
     return full_ref
 
 
@@ -99,6 +113,8 @@ def _add_conf_full_ref(merged_df):
     These items are got from the columns which names are given by 
     'title_alias', 'first_author_alias', 'conf_name_alias', 'conf_year_alias', 
     'country_alias', 'pub_year_alias' and 'pub_doi_alias', respectively. 
+    The full references are built at once on the first row of each 
+    publication and then mapped on all the author rows.
     The name of the new column is given by 'conf_full_ref_alias'.
 
     Args:
@@ -119,23 +135,23 @@ def _add_conf_full_ref(merged_df):
     title_alias = cm_cg.CONF_COLS['title']                      # "Titres"
     conf_full_ref_alias = cm_cg.CONF_ADD_COLS['full_ref']       # "Référence bibliographique complète"
 
-    # Splitting the frame into subframes with same Pub_id
-    conf_plus_full_ref_df = pd.DataFrame()
-    for _, pub_id_df in merged_df.groupby(pub_id_alias):
-        # Select the first row and build the full reference
-        pub_id_first_row = pub_id_df.iloc[0]
-        title        = str(pub_id_first_row[title_alias])
-        first_author = str(pub_id_first_row[first_author_alias])
-        conf_name    = str(pub_id_first_row[conf_name_alias])
-        conf_year    = str(pub_id_first_row[conf_year_alias])
-        conf_country = str(pub_id_first_row[country_alias])
-        pub_year     = str(pub_id_first_row[pub_year_alias])
-        doi = ""
-        if pub_id_first_row[doi_alias]!=unknown_alias:
-            doi = ", " + str(pub_id_first_row[doi_alias])
-        pub_id_df[conf_full_ref_alias] = _set_hal_full_ref(title, first_author, conf_name,
-                                                          conf_year, conf_country, pub_year, doi)
-        conf_plus_full_ref_df = pd.concat([conf_plus_full_ref_df, pub_id_df])
+    # Selecting the first row of each publication
+    pub_df = merged_df.drop_duplicates(subset=[pub_id_alias])
+
+    # Building the full references of the publications
+    doi_series = (", " + pub_df[doi_alias].astype(str)).where(pub_df[doi_alias]!=unknown_alias, "")
+    full_ref_series = _set_hal_full_ref(pub_df[title_alias].astype(str),
+                                        pub_df[first_author_alias].astype(str),
+                                        pub_df[conf_name_alias].astype(str),
+                                        pub_df[conf_year_alias].astype(str),
+                                        pub_df[country_alias].astype(str),
+                                        pub_df[pub_year_alias].astype(str),
+                                        doi_series)
+    full_ref_dict = dict(zip(pub_df[pub_id_alias], full_ref_series))
+
+    # Mapping the full references on the author rows ordered by publication
+    conf_plus_full_ref_df = merged_df.sort_values(by=[pub_id_alias], kind='stable')
+    conf_plus_full_ref_df[conf_full_ref_alias] = conf_plus_full_ref_df[pub_id_alias].map(full_ref_dict)
 
     return conf_plus_full_ref_df
 
@@ -153,6 +169,14 @@ def _add_hal_authors_name_list(org_tup, merged_df):
         service affiliation, laboratoire affiliation);
         - ...".
 
+    A column per department is also added with value 1 if at least 
+    one author of the contribution is affiliated to the department 
+    and 0 otherwise. The departments are got from the inverted index 
+    of the departments labels built through the `set_dpt_key_dict` 
+    function imported from the `cmfuncts.conf_metrics` module and the department columns are built at once 
+    through a crosstab on the publications. The co-authors lists 
+    are built through a single sort and aggregation by publication.
+
     Args:
         org_tup (tup): Contains Institute parameters.
         merged_df (dataframe): The list of Institute contributions \
@@ -161,19 +185,11 @@ def _add_hal_authors_name_list(org_tup, merged_df):
     Returns:
         (dataframe): The updated data.
     """
-    # Internal functions
-    def _get_dpt_key(dpt_raw):
-        return_key = None
-        for key, values in dpt_label_dict.items():
-            if dpt_raw in values:
-                return_key = key
-        return return_key
-
     # Setting institute parameters
     dpt_label_dict = org_tup[1]
+    dpt_col_list = list(dpt_label_dict.keys())
 
     # Setting useful aliases
-    unknown_alias = cm_cg.INDISPONIBLE
     pub_id_alias = cm_cg.CONF_COLS['pub_id']                    # 'Pub_id'
     auth_idx_alias = cm_cg.CONF_COLS['author_idx']              # 'Idx_author'
     author_type_alias = cm_cg.CONF_ADD_COLS['author_type']      # "Type de l'auteur"    
@@ -184,42 +200,50 @@ def _add_hal_authors_name_list(org_tup, merged_df):
     dept_alias = cm_eg.EMPLOYEES_USEFUL_COLS['dpt']             # "Dpt/DOB (lib court)"
     serv_alias = cm_eg.EMPLOYEES_USEFUL_COLS['serv']            # "Service (lib court)"
     lab_alias = cm_eg.EMPLOYEES_USEFUL_COLS['lab']              # "Laboratoire (lib court)"
-    
-    # Setting intermediate col name
+
+    # Setting intermediate col names
     names_temp_col = "Nom, Prénom"
+    dpt_key_temp_col = "Dpt key"
+    author_temp_col = "Author"
 
     # Reading the excel file
-    init_df = merged_df.copy()
+    init_df = merged_df.sort_values(by=[pub_id_alias], kind='stable')
+    init_df = init_df.drop(columns=[x for x in dpt_col_list if x in init_df.columns])
 
     # Adding the column 'names_temp_col' that will be used to create the authors fullname list
     init_df[prenom_alias] = init_df[prenom_alias].apply(lambda x: x.capitalize())
     init_df[names_temp_col] = init_df[nom_alias] + ', ' + init_df[prenom_alias]
 
-    out_df = pd.DataFrame()
-    for _, pub_id_df in init_df.groupby(pub_id_alias):
-        raw_depts_list = pub_id_df[dept_alias].to_list()
-        depts_list = [_get_dpt_key(x) for x in raw_depts_list]
-        for dept in dpt_label_dict.keys():
-            pub_id_df[dept] = 0
-            if dept in depts_list:
-                pub_id_df[dept] = 1
-        
-        authors_tup_list = sorted(list(set(zip(pub_id_df[auth_idx_alias],
-                                               pub_id_df[names_temp_col],
-                                               pub_id_df[matricule_alias],
-                                               pub_id_df[author_type_alias],
-                                               pub_id_df[dept_alias],
-                                               pub_id_df[serv_alias],
-                                               pub_id_df[lab_alias]))))
-
-        authors_str_list = [(f'{x[1]} ({x[2]},'
-                             f'{x[3]},{_get_dpt_key(x[4])},{x[5]},{x[6]})')
-                            for x in authors_tup_list]
-        authors_full_str = "; ".join(authors_str_list)
-        pub_id_df[inst_auth_list_alias] = authors_full_str
-
-        out_df = pd.concat([out_df, pub_id_df])
-    return out_df
+    # Setting the department of each author
+    dpt_key_dict = set_dpt_key_dict(dpt_label_dict)
+    dpt_keys_series = init_df[dept_alias].map(dpt_key_dict)
+
+    # Adding the departments columns
+    dpt_flags_df = pd.crosstab(init_df[pub_id_alias], dpt_keys_series)
+    dpt_flags_df = dpt_flags_df.reindex(index=init_df[pub_id_alias].unique(),
+                                        columns=dpt_col_list, fill_value=0)
+    dpt_flags_df = dpt_flags_df.gt(0).astype(int)
+    init_df = init_df.join(dpt_flags_df, on=pub_id_alias)
+
+    # Building the ordered list of the Institute authors of each publication
+    authors_cols_list = [auth_idx_alias, names_temp_col, matricule_alias,
+                         author_type_alias, dept_alias, serv_alias, lab_alias]
+    authors_df = init_df[[pub_id_alias] + authors_cols_list].drop_duplicates()
+    authors_df = authors_df.sort_values(by=[pub_id_alias] + authors_cols_list)
+    authors_df[dpt_key_temp_col] = authors_df[dept_alias].map(dpt_key_dict)\
+                                                        .astype(object)\
+                                                        .where(lambda x: x.notna(), None)
+    authors_df[author_temp_col] = (authors_df[names_temp_col].astype(str) + ' ('
+                                   + authors_df[matricule_alias].astype(str) + ','
+                                   + authors_df[author_type_alias].astype(str) + ','
+                                   + authors_df[dpt_key_temp_col].astype(str) + ','
+                                   + authors_df[serv_alias].astype(str) + ','
+                                   + authors_df[lab_alias].astype(str) + ')')
+    authors_full_str_series = authors_df.groupby(pub_id_alias, sort=False)[author_temp_col]\
+                                        .agg("; ".join)
+    init_df[inst_auth_list_alias] = init_df[pub_id_alias].map(authors_full_str_series)
+
+    return init_df
 
 
 def _build_useful_names(base_name, key_name, corpus_year):
@@ -313,7 +337,14 @@ def _split_conf_list_by_doc_type(wf_path, corpus_year,
     to conferences into data corresponding to different documents types.
 
     This is done for the 'corpus_year' corpus. 
-    These data are saved through the `_save_final_df` internal function.
+    Each row is assigned in a single pass to one of the keys 
+    of the 'CONF_TYPES_DIC' global or to the 'others' key through 
+    the `set_doc_type_keys` function imported from the 
+    `cmfuncts.conf_metrics` module. 
+    The data of the keys are then saved one after the other through 
+    the `_save_final_df` internal function, in the thread of the 
+    consolidation so that the metrics of the export are recorded 
+    in the consolidation stage.
 
     Args:
         wf_path (path): Full path to working folder.
@@ -328,29 +359,18 @@ def _split_conf_list_by_doc_type(wf_path, corpus_year,
     # Setting useful column names
     pub_id_col = cols_rename_dict[cm_cg.CONF_COLS['pub_id']]
     doc_type_col = cols_rename_dict[cm_cg.CONF_COLS['doctype']]
-    
-    others_dg = full_conf_list_df.copy()
+    others_key = 'others'
+
+    # Assigning each row to a key
+    keys_series = set_doc_type_keys(full_conf_list_df[doc_type_col])
+
     conf_nb = len(full_conf_list_df)
-    key_conf_nb = 0
-    for key, doctype_list in cm_cg.CONF_TYPES_DIC.items():
-        doctype_list = [x.upper() for x in doctype_list]
-        key_dg = pd.DataFrame(columns=full_conf_list_df.columns)
-        for doc_type, dg in full_conf_list_df.groupby(doc_type_col):
-            if doc_type.upper() in doctype_list:
-                key_dg = pd.concat([key_dg, dg])
-                others_dg = others_dg.drop(dg.index)
-        key_dg = key_dg.sort_values(by=[pub_id_col])
-        key_conf_nb += len(key_dg)
-        
-        # saving key data
-        _save_final_df(wf_path, corpus_year, key,
-                       key_dg, cols_rename_dict)
-
-    others_dg = others_dg.sort_values(by=[pub_id_col])
-    
-    # saving others data
-    _save_final_df(wf_path, corpus_year, 'others',
-                   others_dg, cols_rename_dict)
+    key_conf_nb = int((keys_series!=others_key).sum())
+
+    # Saving the data of each key
+    for key in list(cm_cg.CONF_TYPES_DIC.keys()) + [others_key]:
+        key_dg = full_conf_list_df[keys_series==key].sort_values(by=[pub_id_col])
+        _save_final_df(wf_path, corpus_year, key, key_dg, cols_rename_dict)
 
     split_ratio = 100
     if conf_nb!=0:
@@ -358,10 +378,87 @@ def _split_conf_list_by_doc_type(wf_path, corpus_year,
     return split_ratio, conf_nb
 
 
+def _set_registry_fingerprint(wf_path, corpus_year):
+    """Sets the fingerprint of the registry of hash IDs restricted 
+    to the entries used by the consolidation of a corpus year.
+
+    Only the sorted hash IDs of each of the other corpus years are 
+    used, as they give the other years flagged for the contributions, 
+    so that the consolidation of a corpus year does not change 
+    the fingerprint for the other corpus years.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (str): The fingerprint set through the `set_params_fingerprint` \
+        function imported from the `cmfuncts.stage_cache` module.
+    """
+    registry_dict = read_hash_registry(wf_path)
+    years_hash_ids_dict = {}
+    for hash_id, years_dict in registry_dict.items():
+        for year in years_dict:
+            if year!=corpus_year:
+                years_hash_ids_dict.setdefault(year, []).append(hash_id)
+    years_hash_ids_dict = {year: sorted(hash_ids_list)
+                           for year, hash_ids_list in years_hash_ids_dict.items()}
+    return set_params_fingerprint(years_hash_ids_dict)
+
+
+def _set_conso_stage(wf_path, org_tup, corpus_year):
+    """Sets the parameters of the consolidation stage used for skipping 
+    the consolidation when its inputs are unchanged.
+
+    The inputs are the merged data, the Institute parameters and 
+    the entries of the registry of hash IDs of the other corpus years 
+    got through the `_set_registry_fingerprint` internal function.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        org_tup (tup): Contains Institute parameters.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (full path (path) to the manifest file, fingerprints (dict) \
+        of the inputs keyed by input name, full paths (list) to the output files).
+    """
+    # Setting useful aliases
+    conf_empl_folder_alias = cm_cg.CM_ARCHI['conf_empl_folder']
+    results_folder_alias = cm_cg.CM_ARCHI['final_results_folder']
+
+    # Setting useful paths
+    year_cmf_path = wf_path / Path(corpus_year)
+    conf_empl_folder_path = year_cmf_path / Path(conf_empl_folder_alias)
+    results_folder_path = year_cmf_path / Path(results_folder_alias)
+    manifest_path = results_folder_path / Path(cm_cg.CM_ARCHI['conso_manifest_file'])
+    valid_file_path = conf_empl_folder_path / Path(cm_cg.CM_ARCHI['valid_authors'])
+
+    inputs_dict = {'merged'  : set_file_fingerprint(valid_file_path),
+                   'org'     : set_params_fingerprint(org_tup),
+                   'registry': _set_registry_fingerprint(wf_path, corpus_year)}
+    outputs_list = [set_results_paths(wf_path, corpus_year, key)[0][1]
+                    for key in cm_cg.CONF_NAMES_DIC]
+    outputs_list += [results_folder_path / Path(cm_cg.CM_ARCHI['near_dup_file_name']),
+                     results_folder_path / Path(cm_cg.CM_ARCHI['metrics_cube_file']),
+                     conf_empl_folder_path / Path(cm_cg.CM_ARCHI['hash_id_file_name'])]
+    return manifest_path, inputs_dict, outputs_list
+
+
+@instrument_stage(stage_name="consolidation")
 def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(),
-                          verbose=False, progress_callback=None):
+                          verbose=False, progress_callback=None, force=False,
+                          cancel_token=None):
     """Builds the final list of Institute contributions to conferences.
 
+    The consolidation is skipped if its inputs, its outputs and the code 
+    are unchanged since the previous consolidation, unless 'force' is True. 
+    This is checked through the `check_stage_manifest` function imported 
+    from the `cmfuncts.stage_cache` module using the manifest of the inputs 
+    set through the `_set_conso_stage` internal function. In this case, 
+    the existing final list is returned. The given merged data are expected 
+    to be the data of the file of merged data, as handed by the merge step, 
+    so that the fingerprint of this file is used whatever the data source. 
+    The manifest is saved after each consolidation.
+
     First, The list of contributions, with one row per Institute-affiliated 
     author, merged with employees data is added with:
 
@@ -377,9 +474,25 @@ def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(
     the keys of the dict 'cols_rename_dict' built through the 
     `build_hal_col_conversion_dic` function imported from the 
     `cmfuncts.cols_rename` module. 
-    Then, the duplicate rows are dropped in the obtained data. 
-    Finally, the final list of contributions to conferences is saved 
-    through the `_save_final_conf_list` internal function.
+    Then, the duplicate rows are dropped in the obtained data and 
+    the suspected near duplicates are saved for review through 
+    the `find_near_duplicates` and `save_near_duplicates` functions 
+    imported from the `cmfuncts.near_duplicates` module. 
+    Then, the final list of contributions to conferences is saved 
+    through the `_save_final_conf_list` internal function. 
+    Finally, the cube of metrics of the corpus year is built from 
+    the data with one row per author through the `build_metrics_cube` 
+    function, saved through the `save_metrics_cube` function, both 
+    imported from the `cmfuncts.conf_metrics` module, and merged 
+    with the cubes of the other corpus years in the contributions 
+    store through the `update_conf_store` function imported from 
+    the `cmfuncts.conf_store` module.
+
+    The cancellation token is checked after each step until the saving 
+    of the hash IDs, which is the first saving of the consolidation, 
+    so that a cancelled consolidation leaves the existing files unchanged; 
+    the intermediate data are thus kept in memory and saved after 
+    the hash IDs when verbose is True.
 
     Args:
         wf_path (path): The full path to the working folder.
@@ -390,42 +503,63 @@ def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(
         merged with employees data (default=empty dataframe).
         verbose (bool): Status for intermediate data saving and \
         prints (default=False).
+        force (bool): Status for consolidating even if the inputs are \
+        unchanged (default=False).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
     Returns:
-        (dataframe): The final list of Institute contributions \
-        to conferences.
+        (tup): (The final list of Institute contributions to conferences \
+        (dataframe), the split ratio (int) by document types, \
+        the number (int) of contributions).
     """
     # Setting useful aliases
     pub_id_alias = cm_cg.CONF_COLS['pub_id']
     pub_year_alias = cm_cg.CONF_COLS['pub_year']
     shift_alias = cm_cg.PUB_ID_SHIFT
     
+    # Checking if the consolidation can be skipped
+    manifest_path, inputs_dict, outputs_list = _set_conso_stage(wf_path, org_tup,
+                                                                corpus_year)
+    if not force:
+        skip_status, reason, results_dict = check_stage_manifest(manifest_path, inputs_dict,
+                                                                 outputs_list)
+        if skip_status:
+            print(f"\nConsolidation skipped for {corpus_year}: {reason}")
+            conf_list_df = pd.read_excel(outputs_list[0])
+            return conf_list_df, results_dict['split_ratio'], results_dict['conf_nb']
+        print(f"\nConsolidation performed for {corpus_year}: {reason}")
+
     # Setting the initial list of Institute contributions to conferences
     if merged_df.empty:
         merged_df = read_merged_data(wf_path, corpus_year)
 
     # Adding author job type
+    verbose_steps_list = []
     merged_df = _add_hal_author_job_type(merged_df)
+    check_cancel_token(cancel_token)
     if verbose:
-        save_merged_data(wf_path, corpus_year, merged_df, step="Job_")
-        print(("\nColumn with author job-type is added to the contributions "
-               "list to conferences, with one row per Institute-affiliated "
-               "author, merged with employees data."))
+        verbose_steps_list.append(("Job_", merged_df.copy(),
+                                   ("\nColumn with author job-type is added to the contributions "
+                                    "list to conferences, with one row per Institute-affiliated "
+                                    "author, merged with employees data.")))
 
     # Adding full reference of each contribution to a conference
     merged_df = _add_conf_full_ref(merged_df)
+    check_cancel_token(cancel_token)
     if verbose:
-        save_merged_data(wf_path, corpus_year, merged_df, step="Fullref_")
-        print(("\nColumn with contribution full-reference is added "
-               "to the contributions list to conferences, with one row "
-               "per Institute-affiliated author, merged with employees data."))
+        verbose_steps_list.append(("Fullref_", merged_df.copy(),
+                                   ("\nColumn with contribution full-reference is added "
+                                    "to the contributions list to conferences, with one row "
+                                    "per Institute-affiliated author, merged with employees data.")))
 
     # Adding list of Institute authors with attributes
     merged_df = _add_hal_authors_name_list(org_tup, merged_df)
+    check_cancel_token(cancel_token)
     if verbose:
-        save_merged_data(wf_path, corpus_year, merged_df, step="Authlist_")
-        print(("\nColumn with the list of Institute co-authors is added "
-               "to the list of contributions to conferences, with one row "
-               "per Institute-affiliated author, merged with employees data."))
+        verbose_steps_list.append(("Authlist_", merged_df.copy(),
+                                   ("\nColumn with the list of Institute co-authors is added "
+                                    "to the list of contributions to conferences, with one row "
+                                    "per Institute-affiliated author, merged with employees data.")))
 
     # Setting year pub ID
     merged_df[pub_id_alias] = merged_df[pub_id_alias].apply(lambda x: str(int(x) + shift_alias))
@@ -433,12 +567,18 @@ def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(
     set_year_pub_id(merged_df, year, pub_id_alias)
     
     # Adding hash ID data
-    merged_df = create_hal_hash_id(wf_path, corpus_year, merged_df)
+    merged_df = create_hal_hash_id(wf_path, corpus_year, merged_df,
+                                   cancel_token=cancel_token)
     if verbose:
-        save_merged_data(wf_path, corpus_year, merged_df, step="Hash_")
-        print(("\nColumn with the hash IDs is added to the list of contributions "
-               "to conferences, with one row per Institute-affiliated author, "
-               "merged with employees data."))
+        verbose_steps_list.append(("Hash_", merged_df,
+                                   ("\nColumn with the hash IDs is added to the list of contributions "
+                                    "to conferences, with one row per Institute-affiliated author, "
+                                    "merged with employees data.")))
+
+    # Saving the intermediate data now that the consolidation can no more be cancelled
+    for step, step_df, step_message in verbose_steps_list:
+        save_merged_data(wf_path, corpus_year, step_df, step=step)
+        print(step_message)
 
     # Getting the dict for renaming columns
     cols_rename_dict = build_hal_col_conversion_dic(org_tup)
@@ -447,6 +587,12 @@ def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(
     select_cols_list = cols_rename_dict.keys()
     sub_merged_df = merged_df[select_cols_list]
     conf_list_df = sub_merged_df.drop_duplicates(cm_cg.DEDUP_COLS_LIST)
+
+    # Saving the suspected near duplicates for review
+    pairs_df = find_near_duplicates(conf_list_df)
+    message = save_near_duplicates(wf_path, corpus_year, pairs_df)
+    print(message)
+
     conf_list_df = conf_list_df.rename(columns=cols_rename_dict)
     
     # Saving final conferences list
@@ -457,5 +603,16 @@ def build_final_conf_list(wf_path, org_tup, corpus_year, merged_df=pd.DataFrame(
     split_ratio, conf_nb = _split_conf_list_by_doc_type(wf_path, corpus_year,
                                                         conf_list_df, cols_rename_dict)
 
+    # Building and saving the cube of metrics
+    cube_df = build_metrics_cube(org_tup, corpus_year, merged_df)
+    message = save_metrics_cube(wf_path, corpus_year, cube_df)
+    print(message)
+    update_conf_store(wf_path, corpus_year, cube_df=cube_df)
+
+    # Saving the manifest of the consolidation
+    results_dict = {'split_ratio': int(split_ratio), 'conf_nb': int(conf_nb)}
+    save_stage_manifest(manifest_path, inputs_dict, outputs_list,
+                        results_dict=results_dict)
+
     return conf_list_df, split_ratio, conf_nb
 
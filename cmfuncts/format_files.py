@@ -5,8 +5,14 @@ may be used by several modules of package `cmfuncts`.
 
 __all__ = ['add_sheets_to_workbook',
            'format_hal_page',
+           'measure_export_time',
           ]
 
+# Standard Library imports
+import time
+from copy import copy
+from io import BytesIO
+
 # 3rd party imports
 import pandas as pd
 from bmfuncts.format_files import build_cell_fill_patterns
@@ -15,6 +21,7 @@ from bmfuncts.format_files import align_cell
 from bmfuncts.format_files import format_heading
 from bmfuncts.format_files import set_col_width
 from openpyxl import Workbook as openpyxl_Workbook
+from openpyxl.cell import WriteOnlyCell as openpyxl_WriteOnlyCell
 from openpyxl.utils.dataframe import dataframe_to_rows \
     as openpyxl_dataframe_to_rows
 from openpyxl.utils import get_column_letter \
@@ -23,10 +30,12 @@ from openpyxl.styles import Font as openpyxl_Font
 from openpyxl.styles import PatternFill as openpyxl_PatternFill
 from openpyxl.styles import Alignment as openpyxl_Alignment
 from openpyxl.styles import Border as openpyxl_Border
+from openpyxl.styles import NamedStyle as openpyxl_NamedStyle
 from openpyxl.styles import Side as openpyxl_Side
 
 # Local imports
 import cmfuncts.conf_globals as cm_cg
+from cmfuncts.stage_metrics import instrument_stage
 
 
 def add_sheets_to_workbook(file_full_path, df_to_add, sheet_name):
@@ -65,6 +74,7 @@ def _set_hal_col_attr(cols_rename_dict):
         list of the column names that have attributes).
     """
     init_col_attr = {cm_cg.HASH_COL['hash_id']           : [15, "center"],
+                     cm_cg.HASH_COL['other_years']       : [15, "center"],
                      cm_cg.CONF_COLS['pub_id']           : [15, "center"],
                      cm_cg.CONF_COLS['pub_year']         : [12, "center"],
                      cm_cg.CONF_COLS['conf_year']        : [12, "center"],
@@ -92,8 +102,8 @@ def _set_hal_col_attr(cols_rename_dict):
     return col_attr, col_set_list
 
 
-def format_hal_page(df, cols_rename_dict, wb=None):
-    """Formats a worksheet of an openpyxl workbook using 
+def _format_hal_page_cells(df, cols_rename_dict, wb=None):
+    """Formats a worksheet of an openpyxl workbook cell by cell using 
     columns attributes set through the `_set_hal_col_attr` 
     internal function.
 
@@ -154,3 +164,226 @@ def format_hal_page(df, cols_rename_dict, wb=None):
     ws.row_dimensions[first_row_num].height = 50
 
     return wb, ws
+
+
+def _set_cell_style_key(cell):
+    """Sets the key identifying the style of a cell.
+
+    Args:
+        cell (openpyxl cell): The cell.
+    Returns:
+        (tup): The style attributes of the cell.
+    """
+    style_key = (copy(cell.font), copy(cell.fill), copy(cell.border),
+                 copy(cell.alignment), cell.number_format, copy(cell.protection))
+    return style_key
+
+
+def _build_hal_page_template(columns_list, cols_rename_dict, rows_nb):
+    """Builds the template of the formats of a worksheet from sample data 
+    formatted through the `_format_hal_page_cells` internal function.
+
+    The sample data have the columns of the data to format and a number 
+    of rows with the same parity as the data. The rows styles of the 
+    template are defined as follows:
+
+    - The heading row and the two first rows have their own styles;
+    - The last row has its own style;
+    - The other rows alternate between two styles.
+
+    Args:
+        columns_list (list): The columns of the data to format.
+        cols_rename_dict (dict): The dict for using the renamed \
+        columns of the data.
+        rows_nb (int): The number of rows of the data to format.
+    Returns:
+        (dict): The template with the rows styles, the columns widths, \
+        the first row dimensions and the freeze panes or None if the \
+        formats cannot be reproduced from the template.
+    """
+    # Setting the sample data
+    sample_rows_nb = 6 + rows_nb % 2
+    sample_df = pd.DataFrame([["-"] * len(columns_list)] * sample_rows_nb,
+                             columns=columns_list)
+    _, sample_ws = _format_hal_page_cells(sample_df, cols_rename_dict)
+
+    # Checking that the formats are reproducible from the template
+    if (sample_ws.merged_cells.ranges or sample_ws.auto_filter.ref
+        or sample_ws.conditional_formatting or sample_ws.data_validations.dataValidation):
+        return None
+
+    rows_styles_list = [[_set_cell_style_key(cell) for cell in row]
+                        for row in sample_ws.iter_rows()]
+    if rows_styles_list[3]!=rows_styles_list[5]:
+        return None
+
+    template_dict = {'rows_styles'   : rows_styles_list,
+                     'widths'        : {letter: dim.width for letter, dim
+                                        in sample_ws.column_dimensions.items()},
+                     'first_row_dims': sample_ws.row_dimensions[1],
+                     'freeze_panes'  : sample_ws.freeze_panes}
+    return template_dict
+
+
+def _set_row_style_idx(row_num, rows_nb):
+    """Sets the index of the row styles in the template built through 
+    the `_build_hal_page_template` internal function.
+
+    Args:
+        row_num (int): The number of the row (1 for the heading row).
+        rows_nb (int): The number of rows of the data.
+    Returns:
+        (int): The index of the row styles in the template.
+    """
+    sample_rows_nb = 6 + rows_nb % 2
+    if row_num<=3:
+        return row_num - 1
+    if row_num==rows_nb + 1:
+        return sample_rows_nb
+    return 3 + (row_num - 4) % 2
+
+
+def _format_hal_page_stream(df, cols_rename_dict, wb=None):
+    """Formats a worksheet of an openpyxl workbook written in 
+    streaming mode with shared named styles.
+
+    The styles, the columns widths and the first-row height are got 
+    from the template built through the `_build_hal_page_template` 
+    internal function so that the visual result is the same as the one 
+    of the `_format_hal_page_cells` internal function. Each distinct 
+    style is registered once as a named style of the workbook. 
+    The number format set by openpyxl from the value of each cell, 
+    such as the format of dates, is kept when applying the named style 
+    which number format is the one of the sample data. 
+    The `_format_hal_page_cells` internal function is used when the 
+    workbook wb is given, when the data are too small for the template 
+    or when the template cannot be built.
+
+    Args:
+        df (dataframe): The dataframe to be formatted.
+        cols_rename_dict (dict): The dict for using the renamed \
+        columns of the data.
+        wb (openpyxl workbook): Optional worbook of the worksheet \
+        to be formatted (default = None).
+    Returns:
+        (tup): (worbook of the formatted worksheet (openpyxl workbook), \
+        formatted worksheet in write-only mode).
+    """
+    rows_nb = len(df)
+    columns_list = list(df.columns)
+    template_dict = None
+    if wb is None and rows_nb>=7:
+        template_dict = _build_hal_page_template(columns_list, cols_rename_dict, rows_nb)
+    if template_dict is None:
+        return _format_hal_page_cells(df, cols_rename_dict, wb=wb)
+
+    # Initializing the workbook in write-only mode
+    wb = openpyxl_Workbook(write_only=True)
+    ws = wb.create_sheet()
+
+    # Registering the distinct styles as named styles
+    style_names_dict = {}
+    rows_style_names_list = []
+    for row_styles_list in template_dict['rows_styles']:
+        row_style_names_list = []
+        for style_key in row_styles_list:
+            if style_key not in style_names_dict:
+                style_name = f"cm_style_{len(style_names_dict)}"
+                font, fill, border, alignment, number_format, protection = style_key
+                named_style = openpyxl_NamedStyle(name=style_name,
+                                                  font=copy(font),
+                                                  fill=copy(fill),
+                                                  border=copy(border),
+                                                  alignment=copy(alignment),
+                                                  number_format=number_format,
+                                                  protection=copy(protection))
+                wb.add_named_style(named_style)
+                style_names_dict[style_key] = style_name
+            row_style_names_list.append(style_names_dict[style_key])
+        rows_style_names_list.append(row_style_names_list)
+
+    # Setting the columns widths, the first row height and the freeze panes
+    for letter, width in template_dict['widths'].items():
+        ws.column_dimensions[letter].width = width
+    ws.row_dimensions[1] = copy(template_dict['first_row_dims'])
+    ws.freeze_panes = template_dict['freeze_panes']
+
+    # Writing the styled rows
+    ws_rows = openpyxl_dataframe_to_rows(df, index=False, header=True)
+    for row_num, row in enumerate(ws_rows, start=1):
+        style_names_list = rows_style_names_list[_set_row_style_idx(row_num, rows_nb)]
+        cells_list = []
+        for value, style_name in zip(row, style_names_list):
+            cell = openpyxl_WriteOnlyCell(ws, value=value)
+            number_format = cell.number_format
+            cell.style = style_name
+            cell.number_format = number_format
+            cells_list.append(cell)
+        ws.append(cells_list)
+
+    return wb, ws
+
+
+_EXPORT_ENGINES = {'cells' : _format_hal_page_cells,
+                   'stream': _format_hal_page_stream,
+                  }
+
+
+@instrument_stage(stage_name="export_formatting")
+def format_hal_page(df, cols_rename_dict, wb=None, engine=None):
+    """Formats a worksheet of an openpyxl workbook using 
+    columns attributes set through the `_set_hal_col_attr` 
+    internal function.
+
+    The formatting is performed by the export engine selected 
+    in the '_EXPORT_ENGINES' dict:
+
+    - 'cells': cell by cell through the `_format_hal_page_cells` \
+    internal function;
+    - 'stream': with shared named styles in write-only mode through \
+    the `_format_hal_page_stream` internal function. In this case, \
+    the returned workbook can be saved only once.
+
+    When the workbook wb is not None, this is applied 
+    to the active worksheet of the passed workbook. 
+    If the workbook wb is None, then the workbook is created.
+
+    Args:
+        df (dataframe): The dataframe to be formatted.
+        cols_rename_dict (dict): The dict for using the renamed \
+        columns of the data.
+        wb (openpyxl workbook): Optional worbook of the worksheet \
+        to be formatted (default = None).
+        engine (str): Optional name of the export engine; if None, \
+        the engine given by the 'XL_EXPORT_ENGINE' global is used \
+        (default = None).
+    Returns:
+        (tup): (worbook of the formatted worksheet (openpyxl workbook), \
+        formatted active sheet).
+    """
+    if engine is None:
+        engine = cm_cg.XL_EXPORT_ENGINE
+    wb, ws = _EXPORT_ENGINES[engine](df, cols_rename_dict, wb=wb)
+    return wb, ws
+
+
+def measure_export_time(df, cols_rename_dict, engine=None):
+    """Measures the time for formatting and saving data as a workbook 
+    through the `format_hal_page` function.
+
+    The workbook is saved in memory.
+
+    Args:
+        df (dataframe): The dataframe to be exported.
+        cols_rename_dict (dict): The dict for using the renamed \
+        columns of the data.
+        engine (str): Optional name of the export engine (default = None).
+    Returns:
+        (float): The export time in seconds per 10k rows of data.
+    """
+    start_time = time.perf_counter()
+    wb, _ = format_hal_page(df, cols_rename_dict, engine=engine)
+    wb.save(BytesIO())
+    export_time = time.perf_counter() - start_time
+    time_per_10k_rows = export_time * 10000 / max(len(df), 1)
+    return time_per_10k_rows
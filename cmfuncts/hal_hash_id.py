@@ -3,10 +3,16 @@ that is independent of the extraction from the external databases.
 
 """
 
-__all__ = ['create_hal_hash_id']
+__all__ = ['create_hal_hash_id',
+           'read_hash_data',
+           'read_hash_registry',
+           'set_hash_other_years',
+          ]
 
 
 # Standard Library imports
+import importlib.util
+import json
 from pathlib import Path
 
 # 3rd party imports
@@ -16,18 +22,26 @@ from bmfuncts.useful_functs import reorder_df
 
 # Local imports
 import cmfuncts.conf_globals as cm_cg
+from cmfuncts.cancellation import check_cancel_token
+from cmfuncts.conf_store import update_conf_store
+from cmfuncts.stage_metrics import instrument_stage
+from cmfuncts.stage_metrics import record_frame
 
+PARQUET_STATUS = importlib.util.find_spec("pyarrow") is not None
 
-def save_hash_data(cm_files_path, corpus_year, hash_id_df):
-    """Saves, for a corpus year, the data of hash ID per ID 
-    of the contributions to conferences.
+
+def _set_hash_paths(cm_files_path, corpus_year):
+    """Sets the full paths to the files of hash IDs of a corpus year.
+
+    The columnar sidecar file is a parquet file if the 'pyarrow' 
+    package is available, otherwise a csv file.
 
     Args:
         cm_files_path (path): The full path to the working folder.
         corpus_year (str): 4 digits year of the corpus.
-        hash_id_df (dataframe): The data to save.
     Returns:
-        (str): End message.
+        (tup): (full path (path) to the xlsx file of hash IDs, \
+        full path (path) to the sidecar file of hash IDs).
     """
     # Setting useful aliases
     conf_empl_folder_alias = cm_cg.CM_ARCHI['conf_empl_folder']
@@ -37,9 +51,68 @@ def save_hash_data(cm_files_path, corpus_year, hash_id_df):
     year_cmf_path = cm_files_path / Path(corpus_year)
     conf_empl_folder_path = year_cmf_path / Path(conf_empl_folder_alias)
     hash_file_path = conf_empl_folder_path / Path(hash_file_alias)
+    sidecar_suffix = ".parquet" if PARQUET_STATUS else ".csv"
+    sidecar_path = hash_file_path.with_suffix(sidecar_suffix)
+    return hash_file_path, sidecar_path
+
+
+def read_hash_data(cm_files_path, corpus_year):
+    """Reads, for a corpus year, the data of hash ID per ID 
+    of the contributions to conferences.
+
+    The data are read from the columnar sidecar file if it exists 
+    and is up to date, otherwise from the xlsx file.
+
+    Args:
+        cm_files_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (dataframe): The data of hash ID per ID of contributions.
+    """
+    # Setting useful aliases
+    hash_id_alias = cm_cg.HASH_COL['hash_id']
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+
+    # Setting specific paths
+    hash_file_path, sidecar_path = _set_hash_paths(cm_files_path, corpus_year)
+
+    # Reading the data
+    col_types = {hash_id_alias: str, pub_id_alias: str}
+    sidecar_status = sidecar_path.is_file() and (not hash_file_path.is_file()
+                     or sidecar_path.stat().st_mtime>=hash_file_path.stat().st_mtime)
+    if sidecar_status and PARQUET_STATUS:
+        hash_id_df = pd.read_parquet(sidecar_path)
+    elif sidecar_status:
+        hash_id_df = pd.read_csv(sidecar_path, dtype=col_types)
+    else:
+        hash_id_df = pd.read_excel(hash_file_path, dtype=col_types)
+    return hash_id_df
+
+
+def save_hash_data(cm_files_path, corpus_year, hash_id_df):
+    """Saves, for a corpus year, the data of hash ID per ID 
+    of the contributions to conferences.
+
+    The data are saved as xlsx file and as columnar sidecar file 
+    for fast reload through the `read_hash_data` function 
+    of the same module.
+
+    Args:
+        cm_files_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        hash_id_df (dataframe): The data to save.
+    Returns:
+        (str): End message.
+    """
+    # Setting specific paths
+    hash_file_path, sidecar_path = _set_hash_paths(cm_files_path, corpus_year)
 
     # Saving the data
     hash_id_df.to_excel(hash_file_path, index=False)
+    if PARQUET_STATUS:
+        hash_id_df.to_parquet(sidecar_path, index=False)
+    else:
+        hash_id_df.to_csv(sidecar_path, index=False)
 
     hash_id_nb = len(hash_id_df)
     message = (f"\n{hash_id_nb} hash IDs of contributions to conferences created "
@@ -47,7 +120,98 @@ def save_hash_data(cm_files_path, corpus_year, hash_id_df):
     return message
 
 
-def create_hal_hash_id(cm_files_path, corpus_year, valid_df):
+def _set_hash_registry_path(cm_files_path):
+    """Sets the full path to the registry of hash IDs of all corpus years.
+
+    Args:
+        cm_files_path (path): The full path to the working folder.
+    Returns:
+        (path): The full path to the registry file.
+    """
+    registry_path = cm_files_path / Path(cm_cg.CM_ARCHI['hash_registry_file'])
+    return registry_path
+
+
+def read_hash_registry(cm_files_path):
+    """Reads the registry of hash IDs of all corpus years.
+
+    Args:
+        cm_files_path (path): The full path to the working folder.
+    Returns:
+        (dict): The registry keyed by hash ID (str) and valued by \
+        a dict keyed by corpus year (str) and valued by the 'Pub_id' (str) \
+        of the contribution in the corpus year; empty dict if the registry \
+        does not exist.
+    """
+    registry_path = _set_hash_registry_path(cm_files_path)
+    if not registry_path.is_file():
+        return {}
+    with open(registry_path, 'r', encoding='utf-8') as registry_file:
+        registry_dict = json.load(registry_file)
+    return registry_dict
+
+
+def _update_hash_registry(cm_files_path, corpus_year, hash_id_df):
+    """Updates the registry of hash IDs of all corpus years 
+    with the hash IDs of a corpus year.
+
+    The previous entries of the corpus year are replaced 
+    by the new ones and the entries of the other corpus years 
+    are kept unchanged. The registry is saved with the hash IDs 
+    and the corpus years of each entry sorted, so that an unchanged 
+    registry is saved with the same content.
+
+    Args:
+        cm_files_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        hash_id_df (dataframe): The data of hash ID per ID \
+        of the contributions of the corpus year.
+    Returns:
+        (dict): The updated registry.
+    """
+    # Setting useful aliases
+    hash_id_alias = cm_cg.HASH_COL['hash_id']
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+
+    registry_dict = read_hash_registry(cm_files_path)
+
+    # Removing the previous entries of the corpus year
+    for hash_id in list(registry_dict.keys()):
+        years_dict = registry_dict[hash_id]
+        if corpus_year in years_dict:
+            del years_dict[corpus_year]
+            if not years_dict:
+                del registry_dict[hash_id]
+
+    # Adding the entries of the corpus year
+    for hash_id, pub_id in zip(hash_id_df[hash_id_alias], hash_id_df[pub_id_alias]):
+        registry_dict.setdefault(hash_id, {})[corpus_year] = str(pub_id)
+
+    registry_path = _set_hash_registry_path(cm_files_path)
+    with open(registry_path, 'w', encoding='utf-8') as registry_file:
+        json.dump(registry_dict, registry_file, ensure_ascii=False, sort_keys=True)
+    return registry_dict
+
+
+def set_hash_other_years(registry_dict, hash_id, corpus_year):
+    """Sets the other corpus years where a contribution has already been seen.
+
+    Args:
+        registry_dict (dict): The registry of hash IDs got through \
+        the `read_hash_registry` function of the same module.
+        hash_id (str): The hash ID of the contribution.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (str): The sorted other corpus years joined by comma; \
+        empty string if the contribution is not found in other corpus years.
+    """
+    years_dict = registry_dict.get(hash_id, {})
+    other_years_list = sorted(year for year in years_dict if year!=corpus_year)
+    return ", ".join(other_years_list)
+
+
+@instrument_stage(stage_name="hash_id")
+def create_hal_hash_id(cm_files_path, corpus_year, valid_df, cancel_token=None):
     """Builds data which columns are given by 'hash_id_col_alias' 
     and 'pub_id_alias' and add column with hash IDs to the data 
     of contributions to conferences.
@@ -55,7 +219,7 @@ def create_hal_hash_id(cm_files_path, corpus_year, valid_df):
     The content of these columns in the built data is as follows:
 
     - The 'hash_id_col_alias' column contains the unique hash ID \
-    built for each contribution to conferences through the `_my_hash` \
+    built once for each contribution to conferences through the `_my_hash` \
     function imported from the `bmfuncts.create_hash_id` on the basis \
     of the values of 'conf_year_alias', 'conf_name_alias', 'country_alias', \
     'doctype_alias', 'title_alias' and 'authors_alias' columns.
@@ -63,7 +227,12 @@ def create_hal_hash_id(cm_files_path, corpus_year, valid_df):
     in the list of contributions to conferences.
 
     The built data are saved through the `save_hash_data` function of 
-    the same module.
+    the same module and are used to update the registry of hash IDs 
+    of all corpus years and the contributions store through the 
+    `update_conf_store` function imported from the `cmfuncts.conf_store` 
+    module. The other corpus years where each contribution 
+    has already been seen are added in the 'other_years_alias' column.
+    The cancellation token is checked before the saving.
 
     Args:
         cm_files_path (path): The full path to the working folder.
@@ -71,11 +240,14 @@ def create_hal_hash_id(cm_files_path, corpus_year, valid_df):
         valid_df (dataframe): The list of contributions to conferences, \
         with one row per Institute-affiliated author, merged with \
         employees data.
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
     Returns:
         (dataframe): The updated list of contributions to conferences.        
     """
     # Setting useful aliases
     hash_id_alias = cm_cg.HASH_COL['hash_id']
+    other_years_alias = cm_cg.HASH_COL['other_years']
     pub_id_alias = cm_cg.CONF_COLS['pub_id']                    # 'Pub_id'
     authors_alias = cm_cg.HAL_USE_COLS['authors']               # 'Auteurs'
     title_alias = cm_cg.CONF_COLS['title']                      # "Titres"
@@ -88,31 +260,37 @@ def create_hal_hash_id(cm_files_path, corpus_year, valid_df):
     useful_cols = [pub_id_alias, conf_year_alias, conf_name_alias, country_alias,
                    doctype_alias, title_alias, authors_alias]
 
-    # Concatenate de dataframes to hash
-    valid_to_hash = valid_df[useful_cols].copy()
-
-    data = []
-    for row_idx, row in valid_to_hash.iterrows():
-        pub_id = row[pub_id_alias]
-        text   = (f"{str(row[conf_year_alias])}"
-                  f"{str(row[conf_name_alias])}"
-                  f"{str(row[country_alias])}"
-                  f"{str(row[doctype_alias])}"
-                  f"{str(row[title_alias])}"
-                  f"{str(row[authors_alias])}")
-        hash_id = _my_hash(text)
-        data.append([hash_id, pub_id])
-    hash_id_df = pd.DataFrame(data, columns=[hash_id_alias, pub_id_alias])
+    # Keeping one row per contribution to hash
+    valid_to_hash = valid_df[useful_cols].drop_duplicates()
+    record_frame("valid_to_hash", valid_to_hash, copy_status=True)
+
+    # Building the texts to hash
+    texts = valid_to_hash[conf_year_alias].astype(str)
+    for col in useful_cols[2:]:
+        texts = texts + valid_to_hash[col].astype(str)
+
+    hash_id_df = pd.DataFrame({hash_id_alias: [_my_hash(text) for text in texts],
+                               pub_id_alias : valid_to_hash[pub_id_alias].values})
     hash_id_df = hash_id_df.drop_duplicates()
 
-    # Adding column of Hash-IDs and reordering columns in valid_df
+    check_cancel_token(cancel_token)
+    message = save_hash_data(cm_files_path, corpus_year, hash_id_df)
+    print(message)
+
+    # Flagging contributions already seen in other corpus years
+    registry_dict = _update_hash_registry(cm_files_path, corpus_year, hash_id_df)
+    update_conf_store(cm_files_path, corpus_year, hash_id_df=hash_id_df)
+    hash_id_df[other_years_alias] = [set_hash_other_years(registry_dict, hash_id, corpus_year)
+                                     for hash_id in hash_id_df[hash_id_alias]]
+    dup_nb = int((hash_id_df[other_years_alias]!="").sum())
+    if dup_nb:
+        print(f"\n{dup_nb} contributions to conferences already found in other corpus years")
+
+    # Adding columns of Hash-IDs and of other years and reordering columns in valid_df
     valid_df = valid_df.merge(hash_id_df,
                               how="inner",
                               on=pub_id_alias)
-    col_dict = {hash_id_alias: 0}
+    col_dict = {hash_id_alias: 0, other_years_alias: 1}
     valid_df = reorder_df(valid_df, col_dict)
-    
-    message = save_hash_data(cm_files_path, corpus_year, hash_id_df)
-    print(message)
 
     return valid_df
@@ -2,13 +2,15 @@
 
 """
 
-__all__ = ['CONFIG_JSON_FILES_DICT',
+__all__ = ['CONFIG_FOLDER',
+           'CONFIG_JSON_FILES_DICT',
            'DPT_LABEL_KEY',
            'DPT_OTP_KEY',
            'FILES_FOLDER',
            'INSTITUTES_LIST',
            'INVALIDE',
            'ROOT_FOLDERS_DICT', 
+           'WF_PROBE_TIMEOUT_S',
            'WORKING_FOLDERS_DICT',
           ]
 
@@ -19,6 +21,9 @@ INSTITUTES_LIST = ["Liten", "Leti"]
 # Setting default working folder of each institute
 FILES_FOLDER = "ConfMeter_Files"
 
+# Setting the timeout in seconds of the probe of the working folder access
+WF_PROBE_TIMEOUT_S = 10
+
 ROOT_FOLDERS_DICT = {'Liten': ("S:\\130-LITEN\\130.1-Direction\\130.1.2-Direction Scientifique\\"
                                   "130.1.2.2-Infos communes\\BiblioMeter\\Bibliometry"),
                      'Leti' : "S:\\120-LETI\\120.38-BiblioMeter\\Bibliometry",
@@ -27,6 +32,9 @@ ROOT_FOLDERS_DICT = {'Liten': ("S:\\130-LITEN\\130.1-Direction\\130.1.2-Directio
 WORKING_FOLDERS_DICT = dict(zip(INSTITUTES_LIST, [ROOT_FOLDERS_DICT[inst] + "\\" + FILES_FOLDER 
                                                   for inst in INSTITUTES_LIST]))
 
+# Setting the folder of the configuration files
+CONFIG_FOLDER = 'ConfigFiles'
+
 CONFIG_JSON_FILES_DICT = {}
 for institute in INSTITUTES_LIST:
     CONFIG_JSON_FILES_DICT[institute] = institute + 'Org_config.json'
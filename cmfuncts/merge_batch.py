@@ -0,0 +1,177 @@
+"""Module of functions for the merge of the contributions to conferences
+with the employees data for several corpus years in parallel worker
+processes sharing the inputs common to the corpus years.
+
+"""
+
+__all__ = ['batch_year_search',
+          ]
+
+
+# Standard Library imports
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from zipfile import BadZipFile
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+from cmfuncts.build_employees import adapt_search_depth
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.merge_conf_employees import merge_corpus_year
+from cmfuncts.merge_conf_employees import set_merge_inputs
+from cmfuncts.merge_stage import set_merge_stage
+from cmfuncts.progress_channel import post_progress
+from cmfuncts.stage_cache import save_stage_manifest
+
+
+_BATCH_INPUTS = {}
+
+# Errors of a corpus year that do not stop the merge of the other corpus years
+_YEAR_ERRORS = (OSError, ValueError, KeyError, BadZipFile)
+
+
+def _init_batch_worker(batch_inputs):
+    """Sets the inputs shared by the corpus years in a worker process 
+    of the `batch_year_search` function.
+
+    Args:
+        batch_inputs (dict): The shared inputs.
+    """
+    _BATCH_INPUTS.update(batch_inputs)
+
+
+def _batch_year_worker(wf_root_path, wf_path, corpus_year):
+    """Merges a corpus year using the inputs set through 
+    the `_init_batch_worker` internal function.
+
+    The manifest of the merge of the corpus year is set through 
+    the `set_merge_stage` function imported from the 
+    `cmfuncts.merge_stage` module before reading the conferences 
+    data and saved after the merge.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (The corpus year (str), the search status (bool), \
+        the number of rows of the merged data (int)).
+    """
+    inputs_tup = _BATCH_INPUTS['inputs']
+    _, years_to_search = adapt_search_depth(corpus_year, inputs_tup[0])
+    if not years_to_search:
+        return corpus_year, False, 0
+
+    stage_tup = set_merge_stage(wf_root_path, wf_path, corpus_year, years_to_search)
+    valid_df = merge_corpus_year(wf_path, corpus_year, pd.DataFrame(),
+                                 years_to_search, inputs_tup)
+    save_stage_manifest(*stage_tup)
+    return corpus_year, True, len(valid_df)
+
+
+def _print_year_status(corpus_year, search_status):
+    """Prints the status of the merge of a corpus year.
+
+    Args:
+        corpus_year (str): 4 digits year of the corpus.
+        search_status (bool): The search status of the corpus year.
+    """
+    if search_status:
+        print(f"\nMerge performed for {corpus_year}")
+    else:
+        print(f"\nMerge not performed for {corpus_year}: no employees data available")
+
+
+def batch_year_search(wf_root_path, wf_path, corpus_years, employees_dict=None,
+                      jobs=None, progress_callback=None):
+    """Searches for the authors affiliated to the institute in the 
+    employees data for several corpus years.
+
+    The employees data with their join keys, the spelling corrections 
+    and the external PhD students data are set once for all the corpus 
+    years through the `set_merge_inputs` function imported from the 
+    `cmfuncts.merge_conf_employees` module. Then, each corpus year is 
+    merged through the `merge_corpus_year` function imported from 
+    the same module in parallel worker processes that receive these 
+    inputs once through the `_init_batch_worker` internal function. 
+    Each corpus year is saved with its usual merged and orphan files 
+    and the manifest of its merge. 
+    A corpus year failing on a file or data error is printed and gets 
+    a False status without stopping the merge of the other corpus years; 
+    any other error is raised.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        employees_dict (dict): The employees data keyed by year; \
+        read if None or empty (default=None).
+        jobs (int): The number of worker processes; \
+        if None, the number of CPUs is used; \
+        if 1, the corpus years are merged in the current process (default=None).
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+    Returns:
+        (dict): The search status (bool) keyed by corpus year.
+    """
+    if not employees_dict:
+        # Reading employees data
+        print("\nReading employees data...")
+        employees_dict = read_hal_employees_data(wf_root_path)
+    if progress_callback:
+        progress_callback(10)
+
+    # Setting the inputs common to all corpus years
+    batch_inputs = {'inputs': set_merge_inputs(wf_root_path, wf_path, employees_dict)}
+    if progress_callback:
+        progress_bar = 20
+        progress_callback(progress_bar)
+        progress_step = 80 / max(len(corpus_years), 1)
+
+    search_status_dict = {}
+    rows_nb = 0
+    workers_nb = min(jobs or os.cpu_count() or 1, len(corpus_years))
+    if workers_nb<=1:
+        _init_batch_worker(batch_inputs)
+        for corpus_year in corpus_years:
+            try:
+                _, search_status, year_rows_nb = _batch_year_worker(wf_root_path, wf_path,
+                                                                    corpus_year)
+                _print_year_status(corpus_year, search_status)
+            except _YEAR_ERRORS as err:
+                print(f"\nMerge failed for {corpus_year}: {type(err).__name__}: {err}")
+                search_status, year_rows_nb = False, 0
+            search_status_dict[corpus_year] = search_status
+            rows_nb += year_rows_nb
+            if progress_callback:
+                progress_bar += progress_step
+                post_progress(progress_callback, progress_bar, rows=rows_nb)
+    else:
+        with ProcessPoolExecutor(max_workers=workers_nb,
+                                 initializer=_init_batch_worker,
+                                 initargs=(batch_inputs,)) as executor:
+            futures_dict = {executor.submit(_batch_year_worker, wf_root_path,
+                                            wf_path, year): year
+                            for year in corpus_years}
+            for future in as_completed(futures_dict):
+                corpus_year = futures_dict[future]
+                try:
+                    _, search_status, year_rows_nb = future.result()
+                    _print_year_status(corpus_year, search_status)
+                except _YEAR_ERRORS as err:
+                    print(f"\nMerge failed for {corpus_year}: {type(err).__name__}: {err}")
+                    search_status, year_rows_nb = False, 0
+                search_status_dict[corpus_year] = search_status
+                rows_nb += year_rows_nb
+                if progress_callback:
+                    progress_bar += progress_step
+                    post_progress(progress_callback, progress_bar, rows=rows_nb)
+
+    if progress_callback:
+        progress_callback(100)
+    return search_status_dict
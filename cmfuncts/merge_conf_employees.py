@@ -8,14 +8,24 @@ of the Institute to conferences taking care of:
 
 """
 
-__all__ = ['read_merged_data',
+__all__ = ['check_hal_names_spelling',
+           'merge_conf_tables',
+           'merge_corpus_year',
+           'read_corr_tables',
+           'read_merged_data',
+           'read_merged_tables',
+           'read_ortho_data',
            'recursive_year_search',
+           'save_merge_results',
            'save_merged_data',
-           'set_merge_paths',
+           'save_names_corr_data',
+           'search_employees',
+           'set_merge_inputs',
           ]
 
 
 # Standard Library imports
+import os
 import warnings
 from pathlib import Path
 
@@ -27,7 +37,23 @@ import cmfuncts.conf_globals as cm_cg
 import cmfuncts.employees_globals as cm_eg
 from cmfuncts.build_employees import adapt_search_depth
 from cmfuncts.build_employees import read_hal_employees_data
-from cmfuncts.conf_extract import read_conf_extract
+from cmfuncts.cancellation import check_cancel_token
+from cmfuncts.conf_extract import read_conf_tables
+from cmfuncts.conf_store import update_conf_store
+from cmfuncts.conf_tables import build_conf_view
+from cmfuncts.conf_tables import split_conf_data
+from cmfuncts.merge_stage import save_merge_deps
+from cmfuncts.merge_stage import set_inputs_signatures
+from cmfuncts.merge_stage import set_merge_paths
+from cmfuncts.merge_stage import set_merge_stage
+from cmfuncts.merge_stage import set_ortho_dict
+from cmfuncts.merge_stage import set_ortho_rows
+from cmfuncts.merge_stage import set_year_signatures
+from cmfuncts.progress_channel import post_progress
+from cmfuncts.stage_cache import check_stage_manifest
+from cmfuncts.stage_cache import save_stage_manifest
+from cmfuncts.stage_metrics import instrument_stage
+from cmfuncts.stage_metrics import record_frame
 from cmfuncts.useful_functs import capitalize_name
 from cmfuncts.useful_functs import standardize_name
 
@@ -71,7 +97,7 @@ def _build_corr_author(ortho_empl_name):
     return author
 
 
-def _save_names_corr_data(confmeter_path, corpus_year, conf_df):
+def save_names_corr_data(confmeter_path, corpus_year, conf_df):
     """Saves, for a corpus year, the HAL conferences data after 
     check of author-names spelling.
 
@@ -96,33 +122,23 @@ def _save_names_corr_data(confmeter_path, corpus_year, conf_df):
     conf_df.to_excel(corr_file_path, index=False)
 
 
-def _check_hal_names_spelling(wf_path, corpus_year, conf_df):
-    """Replace author names in conferences data by the employee name.
+def read_ortho_data(wf_path):
+    """Reads the data of author-names spelling corrections.
 
-    This is done when a name-spelling discrepency is given in the 
-    dedicated file which name is given by 'orthograph_file_alias' 
-    parameter and located in the folder of the working folder 
-    which name is given by 'orphan_treat_root_alias' parameter.
-    The corrected conferences data are saved through the 
-    `_save_names_corr_data` internal function.
+    These data are read from the dedicated file which name is given 
+    by 'orthograph_file_alias' parameter and located in the folder 
+    of the working folder which name is given by 'orphan_treat_root_alias' 
+    parameter.
 
     Args:
         wf_path (path): Full path to working folder.
-        conf_df (dataframe): Data of contributions to conferences \
-        with one row per author where author names should be corrected.
     Returns:
-        (dataframe): Publications list with one row per author where \
-        spelling of author names have been corrected.
+        (dataframe): The spelling corrections with one row per \
+        author name to be corrected.
     """
     # Setting useful aliases
     orphan_treat_root_alias = cm_cg.ORPHAN_ARCHI["root"]
     orthograph_file_name_alias = cm_cg.ORPHAN_ARCHI["orthograph file"]
-
-    # Setting useful column names (name stands for fullname)
-    pub_id_alias = cm_cg.CONF_COLS['pub_id']
-    pub_name_alias = cm_cg.CONF_COLS['co_author']
-    first_author_alias = cm_cg.CONF_COLS['first_author']
-    authors_alias = cm_cg.CONF_COLS['authors']
     ortho_pub_name_alias = cm_cg.ORTHO_COLS['pub_fullname']
     ortho_empl_name_alias = cm_cg.ORTHO_COLS['empl_fullname']
 
@@ -135,36 +151,111 @@ def _check_hal_names_spelling(wf_path, corpus_year, conf_df):
                        ortho_empl_name_alias]
     warnings.simplefilter(action='ignore', category=UserWarning)
     ortho_df = pd.read_excel(ortho_path, usecols=ortho_cols_list)
+    return ortho_df
+
+
+@instrument_stage(stage_name="spelling_check")
+def check_hal_names_spelling(wf_path, corpus_year, conf_tables,
+                             ortho_df=None, save_status=True, cancel_token=None):
+    """Replace author names in conferences data by the employee name.
 
-    new_conf_df = conf_df.copy()
-    new_conf_df.reset_index(drop=True, inplace=True)
-    new_conf_df[pub_name_alias] = new_conf_df[pub_name_alias].apply(standardize_name)
-    new_conf_df[first_author_alias] = new_conf_df[first_author_alias].apply(standardize_name)
-    for pub_row_num, pub_row in new_conf_df.iterrows():
-        pub_id = new_conf_df.loc[pub_row_num, pub_id_alias]
-        init_pub_name = new_conf_df.loc[pub_row_num, pub_name_alias].lower()
-        init_first_author = new_conf_df.loc[pub_row_num, first_author_alias].lower()
-        init_authors = new_conf_df.loc[pub_row_num, authors_alias]
-        for ortho_row_num, ortho_row in ortho_df.iterrows():
-            ortho_pub_name = ortho_df.loc[ortho_row_num, ortho_pub_name_alias].lower()
-            if init_pub_name==ortho_pub_name:                
-                ortho_empl_name = ortho_df.loc[ortho_row_num, ortho_empl_name_alias]
-                new_pub_name = _build_corr_author(ortho_empl_name)
-                new_authors = _build_corr_authors(init_authors, init_pub_name, new_pub_name)
-                new_conf_df.loc[pub_row_num, pub_name_alias] = new_pub_name
-                if init_first_author==init_pub_name:
-                    pub_id_idxs = new_conf_df.index[new_conf_df[pub_id_alias]==pub_id]
-                    new_conf_df.loc[pub_id_idxs, first_author_alias] = new_pub_name
-                    new_conf_df.loc[pub_id_idxs, authors_alias] = new_authors
-    new_conf_df[authors_alias] = new_conf_df[authors_alias].apply(_build_all_authors_list)
+    This is done when a name-spelling discrepency is given in the 
+    dedicated file read through the `read_ortho_data` function 
+    of the same module. The author names are corrected in the authorships table; 
+    when the corrected author is the first author of the publication, 
+    the first author and the authors list are corrected once in the 
+    publications table.
+    The corrected conferences data are saved through the 
+    `save_names_corr_data` function of the same module.
+
+    Args:
+        wf_path (path): Full path to working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        conf_tables (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)) of the contributions \
+        to conferences where author names should be corrected.
+        ortho_df (dataframe): Optional spelling corrections already \
+        read (default=None).
+        save_status (bool): Optional status for saving the corrected \
+        data (default=True).
+        cancel_token (CancelToken): Optional cancellation token checked \
+        for each corrected author row (default=None).
+    Returns:
+        (tup): (The publications table (dataframe), the authorships \
+        table (dataframe)) where spelling of author names have been corrected.
+    """
+    # Setting useful column names (name stands for fullname)
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    pub_name_alias = cm_cg.CONF_COLS['co_author']
+    first_author_alias = cm_cg.CONF_COLS['first_author']
+    authors_alias = cm_cg.CONF_COLS['authors']
+    ortho_pub_name_alias = cm_cg.ORTHO_COLS['pub_fullname']
+    ortho_empl_name_alias = cm_cg.ORTHO_COLS['empl_fullname']
+
+    # Getting the spelling corrections
+    if ortho_df is None:
+        ortho_df = read_ortho_data(wf_path)
+    ortho_dict = dict(zip(ortho_df[ortho_pub_name_alias].str.lower(),
+                          ortho_df[ortho_empl_name_alias]))
+
+    pub_df, auth_df = conf_tables
+    new_pub_df = pub_df.copy()
+    new_auth_df = auth_df.copy()
+    record_frame("new_auth_df", new_auth_df, copy_status=True)
+    new_auth_df.reset_index(drop=True, inplace=True)
+    new_auth_df[pub_name_alias] = new_auth_df[pub_name_alias].apply(standardize_name)
+    new_pub_df[first_author_alias] = new_pub_df[first_author_alias].apply(standardize_name)
+
+    # Correcting the author rows in the order of the authorships table
+    first_author_dict = dict(zip(new_pub_df[pub_id_alias], new_pub_df[first_author_alias]))
+    authors_dict = dict(zip(new_pub_df[pub_id_alias], new_pub_df[authors_alias]))
+    init_pub_names = new_auth_df[pub_name_alias].str.lower()
+    hit_status = init_pub_names.isin(ortho_dict.keys())
+    for pub_row_num, pub_id, init_pub_name in zip(new_auth_df.index[hit_status],
+                                                  new_auth_df.loc[hit_status, pub_id_alias],
+                                                  init_pub_names[hit_status]):
+        check_cancel_token(cancel_token)
+        new_pub_name = _build_corr_author(ortho_dict[init_pub_name])
+        new_auth_df.loc[pub_row_num, pub_name_alias] = new_pub_name
+        if first_author_dict[pub_id].lower()==init_pub_name:
+            authors_dict[pub_id] = _build_corr_authors(authors_dict[pub_id],
+                                                       init_pub_name, new_pub_name)
+            first_author_dict[pub_id] = new_pub_name
+    new_pub_df[first_author_alias] = new_pub_df[pub_id_alias].map(first_author_dict)
+    new_pub_df[authors_alias] = new_pub_df[pub_id_alias].map(authors_dict)\
+                                                       .map(_build_all_authors_list)
 
     # Saving the corrected conferences data
-    _save_names_corr_data(wf_path, corpus_year, new_conf_df)
-    return new_conf_df
+    if save_status:
+        save_names_corr_data(wf_path, corpus_year, build_conf_view(new_pub_df, new_auth_df))
+    return new_pub_df, new_auth_df
 
 
-def _add_hal_ext_docs(wf_path, init_valid_df, init_orphan_df,
-                      merge_auth_col, fullname_col):
+def _set_join_key(names_series):
+    """Sets the join key of author names used for the merge 
+    of the contributions to conferences with the employees data.
+
+    Args:
+        names_series (series): The full names.
+    Returns:
+        (series): The lowered full names without accentuated \
+        characters and minus symbols.
+    """
+    join_key_series = names_series.apply(lambda x: standardize_name(x)\
+                                         .lower().replace("-"," "))
+    return join_key_series
+
+
+def _read_hal_ext_docs(wf_path, merge_auth_col, fullname_col):
+    """Reads the data of the external PhD students and sets their join key.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        merge_auth_col (str): The name of the column of the join key.
+        fullname_col (str): The name of the column of the full names.
+    Returns:
+        (dataframe): The data of the external PhD students.
+    """
     # Setting useful aliases
     orphan_treat_root_alias = cm_cg.ORPHAN_ARCHI["root"]
     adds_file_name_alias = cm_cg.ORPHAN_ARCHI["employees adds file"]
@@ -191,9 +282,15 @@ def _add_hal_ext_docs(wf_path, init_valid_df, init_orphan_df,
                                 converters=converters_alias)
     ext_docs_df.dropna(how='all', inplace=True)
     ext_docs_df.reset_index(drop=True, inplace=True)
-    ext_docs_df[merge_auth_col] = ext_docs_df[fullname_col].apply(lambda x:
-                                                                  standardize_name(x)\
-                                                                  .lower().replace("-"," "))
+    ext_docs_df[merge_auth_col] = _set_join_key(ext_docs_df[fullname_col])
+    return ext_docs_df
+
+
+def _add_hal_ext_docs(wf_path, init_valid_df, init_orphan_df,
+                      merge_auth_col, fullname_col, ext_docs_df=None):
+    # Getting the external PhD students data
+    if ext_docs_df is None:
+        ext_docs_df = _read_hal_ext_docs(wf_path, merge_auth_col, fullname_col)
 
     valid_adds_df = init_orphan_df.merge(ext_docs_df, how='inner', on=merge_auth_col)
     new_valid_df = pd.concat([init_valid_df, valid_adds_df])
@@ -204,35 +301,24 @@ def _add_hal_ext_docs(wf_path, init_valid_df, init_orphan_df,
     return new_valid_df, new_orphan_df
 
 
-def set_merge_paths(wf_path, corpus_year):
-    """Sets the parameters of the files resulting from merge of data of 
-    the contributions to conferences with the data of employees.
+def _set_employees_join_keys(employees_dict, fullname_col, merge_auth_col):
+    """Adds the join key of the employee names to the employees data of each year.
 
     Args:
-        wf_path (path): The full path to the working folder.
-        corpus_year (str): 4 digits year of the corpus.
+        employees_dict (dict): The employees data keyed by year.
+        fullname_col (str): The name of the column of the full names.
+        merge_auth_col (str): The name of the column of the join key.
     Returns:
-        (tup): (The list composed of the full path (path) to the folder  \
-        where are located the two files generated by the merge \
-        and of the full paths (path) to these two files, \
-        the list of the names (str) of these two files).
+        (dict): The employees data keyed by year with the join-key column.
     """
-    # Setting useful aliases
-    conf_empl_folder_alias = cm_cg.CM_ARCHI['conf_empl_folder']
-    valid_file_alias = cm_cg.CM_ARCHI['valid_authors']
-    orphan_file_alias = cm_cg.CM_ARCHI['orphan_authors']
-
-    # Setting specific paths
-    year_cmf_path = wf_path / Path(corpus_year)
-    conf_empl_folder_path = year_cmf_path / Path(conf_empl_folder_alias)
-    valid_file_path = conf_empl_folder_path / Path(valid_file_alias)
-    orphan_file_path = conf_empl_folder_path / Path(orphan_file_alias)
-
-    # Setting the return lists
-    filenames_list = [valid_file_alias, orphan_file_alias]
-    paths_list = [conf_empl_folder_path, valid_file_path, orphan_file_path]
-
-    return paths_list, filenames_list
+    keyed_employees_dict = {}
+    for year, empl_df in employees_dict.items():
+        keyed_empl_df = empl_df.copy()
+        record_frame(f"keyed_empl_df[{year}]", keyed_empl_df, copy_status=True)
+        if merge_auth_col not in keyed_empl_df.columns:
+            keyed_empl_df[merge_auth_col] = _set_join_key(keyed_empl_df[fullname_col])
+        keyed_employees_dict[year] = keyed_empl_df
+    return keyed_employees_dict
 
 
 def save_merged_data(wf_path, corpus_year, valid_df,
@@ -272,7 +358,8 @@ def save_merged_data(wf_path, corpus_year, valid_df,
         orphan_df.to_excel(orphan_file_path, index=False)
 
 
-def _year_search(wf_path, dfs_list, cols_list, first_step):
+@instrument_stage(stage_name="year_search")
+def _year_search(wf_path, dfs_list, cols_list, first_step, ext_docs_df=None):
     """Searches for the author affiliated to the institute in the 
     employees data of the year.
     
@@ -284,6 +371,8 @@ def _year_search(wf_path, dfs_list, cols_list, first_step):
     For the first year search, the external PhD students are added 
     as employees of the Institute through the `_add_hal_ext_docs` 
     internal function.
+    The join key of the employee names is computed only if not already 
+    set through the `_set_employees_join_keys` internal function.
 
     Args:
         dfs_list (list): [The employees data of the year (dataframe), \
@@ -292,6 +381,8 @@ def _year_search(wf_path, dfs_list, cols_list, first_step):
         cols_list (list): The list of the useful columns names.
         first_step (bool): The status of the search, true for the first search \
         year at which the the external PhD students are added.
+        ext_docs_df (dataframe): Optional data of the external PhD students \
+        already read (default=None).
     Returns:
         (tup): (The updated merged data with the employees data of the year (dataframe), \
         The updated out of merge data of the year (dataframe)).
@@ -300,9 +391,8 @@ def _year_search(wf_path, dfs_list, cols_list, first_step):
     empl_df, valid_df, orphan_df = dfs_list 
 
     # Merging with employees data
-    empl_df[merge_auth_col] = empl_df[fullname_col].apply(lambda x:
-                                                          standardize_name(x)\
-                                                          .lower().replace("-"," "))                
+    if merge_auth_col not in empl_df.columns:
+        empl_df[merge_auth_col] = _set_join_key(empl_df[fullname_col])
 
     valid_adds_df = orphan_df.merge(empl_df, how='inner', on=merge_auth_col)
     valid_df = pd.concat([valid_df, valid_adds_df])
@@ -313,26 +403,321 @@ def _year_search(wf_path, dfs_list, cols_list, first_step):
     if first_step:
         # Merging with external PhD students data
         valid_df, orphan_df = _add_hal_ext_docs(wf_path, valid_df, orphan_df,
-                                                merge_auth_col, fullname_col)
+                                                merge_auth_col, fullname_col,
+                                                ext_docs_df=ext_docs_df)
 
     return valid_df, orphan_df
 
 
+def search_employees(wf_path, auth_df, employees_dict, years_to_search,
+                     ext_docs_df=None, progress_callback=None, cancel_token=None):
+    """Searches recursively on the years of employees data for the authors 
+    of the contributions to conferences through the `_year_search` 
+    internal function.
+
+    The search is done on the authorships table so that the publication 
+    attributes are not carried through the successive merges.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        auth_df (dataframe): The authorships table of the contributions \
+        to conferences after check of the names spelling.
+        employees_dict (dict): The employees data keyed by year.
+        years_to_search (list): The years (str) of employees data to search.
+        ext_docs_df (dataframe): Optional data of the external PhD students \
+        already read (default=None).
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token checked \
+        for each year (default=None).
+    Returns:
+        (tup): (The authorships merged with the employees data (dataframe), \
+        The out of merge authorships (dataframe), the dict keyed by year \
+        and valued by the list of [publication ID, author index] \
+        of the author rows found in the employees data of the year).
+    """
+    # Setting specific aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']                              # 'Pub_id'
+    auth_idx_alias = cm_cg.CONF_COLS['author_idx']                        # 'Idx_author'
+    co_auth_alias = cm_cg.CONF_COLS['co_author']                          # 'Co_auteur' => 'Co_author'
+    fullname_alias = cm_eg.EMPLOYEES_ADD_COLS['employee_full_name']       # 'Employee_full_name'
+    merge_auth_alias = cm_eg.TEMP_COLS["merge_author"]                    # "Join co-author"
+
+    # Setting useful columns list
+    cols_list = [pub_id_alias, auth_idx_alias, fullname_alias, merge_auth_alias]
+    row_cols_list = [pub_id_alias, auth_idx_alias]
+
+    # Initializing orphan data through standardization of co-authors name
+    orphan_df = auth_df.copy()
+    record_frame("orphan_df", orphan_df, copy_status=True)
+    orphan_df[merge_auth_alias] = _set_join_key(auth_df[co_auth_alias])
+    if progress_callback:
+        progress_bar = 20
+        final_progress_bar = 90
+        progress_callback(progress_bar)
+        progress_step = (final_progress_bar - progress_bar) / len(years_to_search)
+
+    valid_df = pd.DataFrame()
+    year_rows_dict = {}
+    first_step = True
+    rows_nb = 0
+    for year in years_to_search:
+        check_cancel_token(cancel_token)
+
+        # Merging with employees data of year
+        empl_df = employees_dict[year].copy()
+        record_frame(f"empl_df[{year}]", empl_df, copy_status=True)
+        init_rows_set = set(orphan_df[row_cols_list].itertuples(index=False, name=None))
+
+        dfs_list = [empl_df, valid_df, orphan_df]
+        return_tup = _year_search(wf_path, dfs_list, cols_list, first_step,
+                                  ext_docs_df=ext_docs_df)
+        valid_df, orphan_df = return_tup
+        first_step = False
+        print(f"    searched year   : {year}", end="\r")
+
+        # Recording the author rows found in the employees data of the year
+        rows_set = set(orphan_df[row_cols_list].itertuples(index=False, name=None))
+        year_rows_dict[year] = [list(row) for row in sorted(init_rows_set - rows_set)]
+        rows_nb += len(init_rows_set)
+
+        if progress_callback:
+            progress_bar += progress_step
+            post_progress(progress_callback, progress_bar, rows=rows_nb)
+
+    return valid_df, orphan_df, year_rows_dict
+
+
+def set_merge_inputs(wf_root_path, wf_path, employees_dict):
+    """Sets the inputs of the merge common to the corpus years.
+
+    The join keys of the employee names are added through the 
+    `_set_employees_join_keys` internal function, the spelling 
+    corrections are read through the `read_ortho_data` function 
+    of the same module, the external PhD students data through 
+    the `_read_hal_ext_docs` internal function and the signatures 
+    of the input files are set through the `set_inputs_signatures` 
+    function imported from the `cmfuncts.merge_stage` module.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        employees_dict (dict): The employees data keyed by year.
+    Returns:
+        (tup): (The employees data keyed by year with join keys \
+        (dict), the spelling corrections (dataframe), the external PhD \
+        students data (dataframe), the signatures of the input files (dict)).
+    """
+    # Setting specific aliases
+    fullname_alias = cm_eg.EMPLOYEES_ADD_COLS['employee_full_name']       # 'Employee_full_name'
+    merge_auth_alias = cm_eg.TEMP_COLS["merge_author"]                    # "Join co-author"
+
+    keyed_employees_dict = _set_employees_join_keys(employees_dict, fullname_alias,
+                                                    merge_auth_alias)
+    ortho_df = read_ortho_data(wf_path)
+    ext_docs_df = _read_hal_ext_docs(wf_path, merge_auth_alias, fullname_alias)
+    signatures_dict = set_inputs_signatures(wf_root_path, wf_path)
+    return keyed_employees_dict, ortho_df, ext_docs_df, signatures_dict
+
+
+def merge_conf_tables(wf_path, corpus_year, conf_tables, years_to_search,
+                      inputs_tup, progress_callback=None, cancel_token=None):
+    """Merges the publications and authorships tables of contributions 
+    to conferences with the employees data without saving the results.
+
+    First, the spelling of the authors names is corrected through the 
+    `check_hal_names_spelling` function of the same module. 
+    After that, the search is done recursively on years of employees data 
+    through the `search_employees` function of the same module on the authorships 
+    table. Finally, the data with one row per author are built through 
+    the `build_conf_view` function imported from the `cmfuncts.conf_tables` 
+    module. This is the merge path shared by the full merge and the 
+    incremental update of the `cmfuncts.merge_incremental` module.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        conf_tables (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
+        years_to_search (list): The years (str) of employees data to search.
+        inputs_tup (tup): The inputs set through the `set_merge_inputs` \
+        function of the same module.
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (tup): ((The corrected conferences data (dataframe), the merged \
+        data with the employees data (dataframe), the conferences data \
+        not found in the employees data (dataframe)), the dict keyed by \
+        year and valued by the list of [publication ID, author index] \
+        of the author rows found in the employees data of the year).
+    """
+    employees_dict, ortho_df, ext_docs_df, _ = inputs_tup
+
+    # Checking author names
+    corr_pub_df, corr_auth_df = check_hal_names_spelling(wf_path, corpus_year, conf_tables,
+                                                         ortho_df=ortho_df, save_status=False,
+                                                         cancel_token=cancel_token)
+    print("\nName spelling in data of contributions to conferences checked.")
+
+    print("\nSearching for authors among employees...")
+    print(f"    years for search: from {years_to_search[0]} to {years_to_search[-1]}")
+    return_tup = search_employees(wf_path, corr_auth_df, employees_dict,
+                                  years_to_search, ext_docs_df=ext_docs_df,
+                                  progress_callback=progress_callback,
+                                  cancel_token=cancel_token)
+    valid_auth_df, orphan_auth_df, year_rows_dict = return_tup
+    check_cancel_token(cancel_token)
+
+    merged_tup = (build_conf_view(corr_pub_df, corr_auth_df),
+                  build_conf_view(corr_pub_df, valid_auth_df),
+                  build_conf_view(corr_pub_df, orphan_auth_df))
+    return merged_tup, year_rows_dict
+
+
+def save_merge_results(wf_path, corpus_year, merged_tup, deps_dict):
+    """Saves, for a corpus year, the results of the merge with 
+    their dependencies.
+
+    The corrected conferences data are saved through the 
+    `save_names_corr_data` function and the merged data through the 
+    `save_merged_data` function of the same module. The contributions 
+    store is updated through the `update_conf_store` function imported 
+    from the `cmfuncts.conf_store` module. The signatures of the files 
+    of contributions to conferences are set through the 
+    `set_year_signatures` function imported from the `cmfuncts.merge_stage` 
+    module after saving the corrected data, the signature of the file 
+    resulting from the HAL extraction being the one given in 'deps_dict' 
+    as set before reading this file. Then, the dependencies are saved 
+    through the `save_merge_deps` function imported from the same module.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        merged_tup (tup): (The corrected conferences data (dataframe), \
+        the merged data with the employees data (dataframe), \
+        the conferences data not found in the employees data (dataframe)).
+        deps_dict (dict): The dependencies of the merged data with at least \
+        the signature of the file resulting from the HAL extraction \
+        under the 'year_signatures' key.
+    """
+    corr_conf_df, valid_df, orphan_df = merged_tup
+
+    # Saving the corrected conferences data and the merged data
+    save_names_corr_data(wf_path, corpus_year, corr_conf_df)
+    save_merged_data(wf_path, corpus_year, valid_df, orphan_df=orphan_df)
+    _, valid_auth_df = split_conf_data(valid_df)
+    update_conf_store(wf_path, corpus_year, conf_tables=split_conf_data(corr_conf_df),
+                      valid_auth_df=valid_auth_df)
+
+    # Saving merge dependencies
+    year_signatures_dict = set_year_signatures(wf_path, corpus_year)
+    year_signatures_dict['conf'] = deps_dict['year_signatures']['conf']
+    deps_dict['year_signatures'] = year_signatures_dict
+    save_merge_deps(wf_path, corpus_year, deps_dict)
+
+
+@instrument_stage(stage_name="merge")
+def merge_corpus_year(wf_path, corpus_year, conf_df, years_to_search,
+                      inputs_tup, progress_callback=None, cancel_token=None):
+    """Merges, for a corpus year, the contributions to conferences 
+    with the employees data using inputs already set.
+
+    The contributions to conferences are split into the publications 
+    and authorships tables through the `split_conf_data` function imported 
+    from the `cmfuncts.conf_tables` module, then merged through the 
+    `merge_conf_tables` function of the same module. The results are 
+    saved through the `save_merge_results` function of the same module 
+    together with the dependencies of these data (spelling corrections, 
+    author rows affected by each spelling correction set through the 
+    `set_ortho_rows` function imported from the `cmfuncts.merge_stage` 
+    module, years of employees data affecting each author row and 
+    signatures of the input files) used by the `incremental_year_search` 
+    function of the `cmfuncts.merge_incremental` module. The signature 
+    of the file resulting from the HAL extraction is set before reading 
+    it. All the files are saved after the last check of the cancellation 
+    token.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        conf_df (dataframe): The list of contributions to conferences \
+        with one row per Institute-affiliated author; read if empty.
+        years_to_search (list): The years (str) of employees data to search.
+        inputs_tup (tup): (The employees data keyed by year with join keys \
+        (dict), the spelling corrections (dataframe), the external PhD \
+        students data (dataframe), the signatures of the input files (dict)).
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (dataframe): The merged data with the employees data.
+    """
+    _, ortho_df, _, signatures_dict = inputs_tup
+    conf_signature = set_year_signatures(wf_path, corpus_year)['conf']
+
+    if conf_df.empty:
+        # reading extraction data of contributions to conferences
+        print("\nReading contributions to conferences data...")
+        conf_tables = read_conf_tables(wf_path, corpus_year)
+    else:
+        conf_tables = split_conf_data(conf_df)
+
+    merged_tup, year_rows_dict = merge_conf_tables(wf_path, corpus_year, conf_tables,
+                                                   years_to_search, inputs_tup,
+                                                   progress_callback=progress_callback,
+                                                   cancel_token=cancel_token)
+
+    # Saving the results with their dependencies
+    ortho_dict = set_ortho_dict(ortho_df)
+    deps_dict = {'years_to_search': years_to_search,
+                 'signatures'     : signatures_dict,
+                 'year_signatures': {'conf': conf_signature},
+                 'ortho'          : ortho_dict,
+                 'ortho_rows'     : set_ortho_rows(conf_tables[1], ortho_dict),
+                 'year_rows'      : year_rows_dict}
+    save_merge_results(wf_path, corpus_year, merged_tup, deps_dict)
+    return merged_tup[1]
+
+
+@instrument_stage(stage_name="recursive_year_search")
 def recursive_year_search(wf_root_path, wf_path, corpus_year, conf_df=pd.DataFrame(),
-                          employees_dict={}, years_to_search=[], progress_callback=None):
+                          employees_dict={}, years_to_search=[], progress_callback=None,
+                          force=False, cancel_token=None):
     """Searches for the author affiliated to the institute in the 
     employees data.
+
+    The merge is skipped if its inputs, its outputs and the code are 
+    unchanged since the previous merge, unless 'force' is True. This is 
+    checked through the `check_stage_manifest` function imported from the 
+    `cmfuncts.stage_cache` module using the manifest of the inputs set 
+    through the `set_merge_stage` function imported from the 
+    `cmfuncts.merge_stage` module. In this case, 
+    the existing merged data are returned. The given contributions 
+    to conferences are expected to be the data of the file resulting 
+    from the HAL extraction, as handed by the extraction step, so that 
+    the fingerprint of this file is used whatever the data source. 
+    The manifest is saved after each merge. The years of employees data 
+    to search are set before this check, through the `adapt_search_depth` 
+    function imported from the `cmfuncts.build_employees` module when 
+    they are not given, so that the manifest records the years 
+    actually searched.
     
     First, the employees data are set through the `read_hal_employees_data` 
     function imported from the `cmfuncts.build_employees` module.
-    Then, the spelling of the authors names is corrected through the 
-    `_check_hal_names_spelling` internal function. 
-    After that, the search is done recursively on years of employees data 
-    through the `_year_search` internal function. 
+    Then, the join keys of the employee names, the spelling corrections 
+    and the external PhD students data are set once through the 
+    `set_merge_inputs` function of the same module.
+    After that, the merge is done through the `merge_corpus_year` 
+    function of the same module. 
     The data of contributions to conferences for which no employee is found 
     are kept in a specific dataframe. 
-    Finally, the two kinds of data are saved through the `save_merged_data` 
-    internal function. 
+    When the cancellation is requested through 'cancel_token', the 
+    `StageCancelledError` exception imported from the 
+    `cmfuncts.cancellation` module is raised before any file is saved.
 
     Args:
         wf_root_path (path): The full path to the root folder where \
@@ -340,25 +725,22 @@ def recursive_year_search(wf_root_path, wf_path, corpus_year, conf_df=pd.DataFra
         wf_path (path): The full path to the working folder.
         corpus_year (str): 4 digits year of the corpus.
         conf_df (dataframe): The list of contributions to conferences \
-        with one row per Institute-affiliated author.
-        employees_dict (dict):
-        empl_use_years (list):
+        with one row per Institute-affiliated author; read from the file \
+        resulting from the HAL extraction if empty (default=empty dataframe).
+        employees_dict (dict): The employees data keyed by year; \
+        read if empty (default={}).
+        years_to_search (list): The years (str) of employees data \
+        to search; set from the employees data if empty (default=[]).
         progress_callback (function): Function for updating ProgressBar \
         tkinter widget status (default = None).
+        force (bool): Status for merging even if the inputs are \
+        unchanged (default=False).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
     Returns:
-        (tup): (The updated merged data with the employees data (dataframe), \
-        The updated out of merge data (dataframe)).
+        (tup): (The search status (bool), False if no year of employees \
+        data is available, the merged data with the employees data (dataframe)).
     """
-    # Setting specific aliases
-    pub_id_alias = cm_cg.CONF_COLS['pub_id']                              # 'Pub_id'
-    auth_idx_alias = cm_cg.CONF_COLS['author_idx']                        # 'Idx_author'
-    co_auth_alias = cm_cg.CONF_COLS['co_author']                          # 'Co_auteur' => 'Co_author'
-    fullname_alias = cm_eg.EMPLOYEES_ADD_COLS['employee_full_name']       # 'Employee_full_name'
-    merge_auth_alias = cm_eg.TEMP_COLS["merge_author"]                    # "Join co-author"
-
-    # Setting useful columns list
-    cols_list = [pub_id_alias, auth_idx_alias, fullname_alias, merge_auth_alias]
-
     if not employees_dict:
         # Reading employees data
         print("\nReading employees data...")
@@ -366,62 +748,37 @@ def recursive_year_search(wf_root_path, wf_path, corpus_year, conf_df=pd.DataFra
 
     # Building the search time depth of Institute co-authors among the employees data
     if not years_to_search:
-        _, years_to_search = adapt_search_depth(corpus_year, hal_all_empl_dict)
+        _, years_to_search = adapt_search_depth(corpus_year, employees_dict)
     steps_nb = len(years_to_search)
 
+    # Checking if the merge can be skipped
+    stage_tup = set_merge_stage(wf_root_path, wf_path, corpus_year, years_to_search)
+    manifest_path, inputs_dict, outputs_list = stage_tup
+    if steps_nb and not force:
+        skip_status, reason, _ = check_stage_manifest(manifest_path, inputs_dict,
+                                                      outputs_list)
+        if skip_status:
+            print(f"\nMerge skipped for {corpus_year}: {reason}")
+            if progress_callback:
+                progress_callback(100)
+            return True, read_merged_data(wf_path, corpus_year)
+        print(f"\nMerge performed for {corpus_year}: {reason}")
+
     if progress_callback:
         progress_callback(15)
-    
-#    corpus_year_status = corpus_year in employees_dict.keys()
-#    year_start = int(corpus_year)
-#    if not corpus_year_status:
-#        year_start = int(corpus_year)-1
-#    year_stop = year_start - (search_depth - 1)
-#    years_to_search = [str(i) for i in range(year_start, year_stop-1,-1)]
-#    steps_nb = int(len(years_to_search))
-    if steps_nb:
-        if conf_df.empty:
-            # reading extraction data of contributions to conferences
-            print("\nReading contributions to conferences data...")
-            conf_df = read_conf_extract(wf_path, corpus_year)
-
-        # Checking author names
-        conf_df = _check_hal_names_spelling(wf_path, corpus_year, conf_df)    
-        print("\nName spelling in data of contributions to conferences checked.")
-
-        # Initializing orphan data through standardization of co-authors name
-        orphan_df = conf_df.copy()
-        orphan_df[merge_auth_alias] = conf_df[co_auth_alias].apply(lambda x:
-                                                                   standardize_name(x)\
-                                                                   .lower().replace("-"," "))
-        if progress_callback:
-            progress_bar = 20
-            final_progress_bar = 90
-            progress_callback(progress_bar)
-            progress_step = (final_progress_bar - progress_bar) / steps_nb
-
-            
-        print("\nSearching for authors among employees...")
-        print(f"    years for search: from {years_to_search[0]} to {years_to_search[-1]}")
-        valid_df = pd.DataFrame()
-        first_step = True
-        for year in years_to_search:
-            # Merging with employees data of year
-            empl_df = employees_dict[year].copy()
-
-            dfs_list = [empl_df, valid_df, orphan_df]
-            return_tup = _year_search(wf_path, dfs_list, cols_list, first_step)
-            valid_df, orphan_df = return_tup
-            first_step = False
-            print(f"    searched year   : {year}", end="\r")
-
-            if progress_callback:
-                progress_bar += progress_step
-                progress_callback(progress_bar)
 
-        # Saving merged data
-        save_merged_data(wf_path, corpus_year, valid_df, orphan_df=orphan_df)
+    valid_df = pd.DataFrame()
+    if steps_nb:
+        # Setting the inputs common to all corpus years
+        inputs_tup = set_merge_inputs(wf_root_path, wf_path,
+                                      {year: employees_dict[year] for year in years_to_search})
+        valid_df = merge_corpus_year(wf_path, corpus_year, conf_df, years_to_search,
+                                     inputs_tup, progress_callback=progress_callback,
+                                     cancel_token=cancel_token)
         search_status = True
+
+        # Saving the manifest of the merge
+        save_stage_manifest(manifest_path, inputs_dict, outputs_list)
     else:
         search_status = False
 
@@ -449,3 +806,52 @@ def read_merged_data(wf_path, corpus_year):
     valid_df = pd.read_excel(valid_file_path)
 
     return valid_df
+
+
+def read_merged_tables(wf_path, corpus_year):
+    """Reads, for a corpus year, the contributions to conferences merged 
+    with employees data as a publications table and an authorships table.
+
+    The merged data are read through the `read_merged_data` function of 
+    the same module and split through the `split_conf_data` function 
+    imported from the `cmfuncts.conf_tables` module; the employees 
+    attributes are kept in the authorships table.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
+    """
+    valid_df = read_merged_data(wf_path, corpus_year)
+    return split_conf_data(valid_df)
+
+
+def read_corr_tables(wf_path, corpus_year):
+    """Reads, for a corpus year, the conferences data after check 
+    of author-names spelling as a publications table and an authorships table.
+
+    When the corrected data are not available, the data resulting from 
+    the HAL extraction are read through the `read_conf_tables` function 
+    imported from the `cmfuncts.conf_extract` module.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (The publications table (dataframe), \
+        the authorships table (dataframe)).
+    """
+    # Setting useful aliases
+    hal_corpus_alias = cm_cg.CM_ARCHI['corpus_folder']
+    corr_file_base_alias = cm_cg.CM_ARCHI['hal_corr_file_base']
+
+    # Setting useful paths
+    corr_file_path = wf_path / Path(corpus_year) / Path(hal_corpus_alias) \
+                     / Path(corpus_year + corr_file_base_alias)
+
+    if not os.path.isfile(corr_file_path):
+        return read_conf_tables(wf_path, corpus_year)
+    corr_df = pd.read_excel(corr_file_path, usecols=cm_cg.CONF_COLS.values())
+    return split_conf_data(corr_df)
@@ -0,0 +1,301 @@
+"""Module of functions for the incremental update of the merge
+of the contributions to conferences with the employees data.
+
+Only the contributions touched by changes of the spelling corrections
+since the previous merge are merged again, using the dependencies
+recorded by the previous merge.
+
+"""
+
+__all__ = ['incremental_year_search',
+          ]
+
+
+# Standard Library imports
+import os
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.build_employees import adapt_search_depth
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.conf_extract import read_conf_tables
+from cmfuncts.conf_tables import split_conf_data
+from cmfuncts.merge_conf_employees import merge_conf_tables
+from cmfuncts.merge_conf_employees import read_merged_data
+from cmfuncts.merge_conf_employees import read_ortho_data
+from cmfuncts.merge_conf_employees import recursive_year_search
+from cmfuncts.merge_conf_employees import save_merge_results
+from cmfuncts.merge_conf_employees import set_merge_inputs
+from cmfuncts.merge_stage import read_merge_deps
+from cmfuncts.merge_stage import save_merge_deps
+from cmfuncts.merge_stage import set_inputs_signatures
+from cmfuncts.merge_stage import set_merge_paths
+from cmfuncts.merge_stage import set_merge_stage
+from cmfuncts.merge_stage import set_ortho_dict
+from cmfuncts.merge_stage import set_ortho_rows
+from cmfuncts.merge_stage import set_year_signatures
+from cmfuncts.stage_cache import save_stage_manifest
+from cmfuncts.stage_metrics import instrument_stage
+
+
+def _patch_pub_ids_data(init_df, new_df, pub_ids):
+    """Replaces the rows of the given publications in data with one row 
+    per author by the rows of new data.
+
+    Args:
+        init_df (dataframe): The data to be patched.
+        new_df (dataframe): The new data of the publications.
+        pub_ids (list): The IDs of the publications to be replaced.
+    Returns:
+        (dataframe): The patched data sorted by publication ID and author index.
+    """
+    # Setting useful aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    auth_idx_alias = cm_cg.CONF_COLS['author_idx']
+
+    kept_df = init_df[~init_df[pub_id_alias].isin(pub_ids)]
+    patched_df = pd.concat([kept_df, new_df])
+    patched_df.sort_values(by=[pub_id_alias, auth_idx_alias], inplace=True)
+    patched_df.reset_index(drop=True, inplace=True)
+    return patched_df
+
+
+def _check_merge_deps(wf_root_path, wf_path, corpus_year, deps_dict, years_to_search):
+    """Checks if the merged data of a corpus year can be updated 
+    incrementally.
+
+    A full merge is required when the contributions to conferences 
+    have been extracted again, or their corrected data modified, 
+    since the previous merge, as the rows of the merged data 
+    are only patched for the spelling-correction changes.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        deps_dict (dict): The dependencies of the previous merge.
+        years_to_search (list): The years (str) of employees data to search.
+    Returns:
+        (str): The reason why a full merge is required or None.
+    """
+    # Setting useful aliases
+    hal_corpus_alias = cm_cg.CM_ARCHI['corpus_folder']
+    corr_file_base_alias = cm_cg.CM_ARCHI['hal_corr_file_base']
+
+    # Setting useful paths
+    paths_list, _ = set_merge_paths(wf_path, corpus_year)
+    _, valid_file_path, _ = paths_list
+    corr_file_path = wf_path / Path(corpus_year) / Path(hal_corpus_alias) \
+                     / Path(corpus_year + corr_file_base_alias)
+
+    reason = None
+    if not deps_dict:
+        reason = "no dependencies recorded for the previous merge"
+    elif not os.path.isfile(valid_file_path) or not os.path.isfile(corr_file_path):
+        reason = "previous merged data not available"
+    elif deps_dict['years_to_search']!=years_to_search:
+        reason = "years of employees data to search changed"
+    elif deps_dict['signatures']!=set_inputs_signatures(wf_root_path, wf_path):
+        reason = "employees data or external PhD students data changed"
+    elif deps_dict.get('year_signatures')!=set_year_signatures(wf_path, corpus_year):
+        reason = "contributions to conferences data extracted or corrected since"
+    return reason
+
+
+def _set_touched_pub_ids(deps_dict, ortho_dict, auth_df):
+    """Sets the publications touched by the changes of the spelling 
+    corrections since the previous merge.
+
+    The author rows affected by a correction removed or changed since 
+    the previous merge are taken from the rows recorded in its 
+    dependencies, the conferences data being unchanged since. The author 
+    rows affected by the current corrections are set through the 
+    `set_ortho_rows` function imported from the `cmfuncts.merge_stage` 
+    module.
+
+    Args:
+        deps_dict (dict): The dependencies of the previous merge.
+        ortho_dict (dict): The current spelling corrections.
+        auth_df (dataframe): The authorships table of the contributions \
+        to conferences before spelling corrections.
+    Returns:
+        (tup): (The sorted list of the IDs of the touched publications, \
+        the author rows affected by each current spelling correction (dict)).
+    """
+    init_ortho_dict = deps_dict['ortho']
+    init_ortho_rows_dict = deps_dict['ortho_rows']
+    ortho_rows_dict = set_ortho_rows(auth_df, ortho_dict)
+    changed_names = [name for name in set(init_ortho_dict) | set(ortho_dict)
+                     if init_ortho_dict.get(name)!=ortho_dict.get(name)]
+    touched_pub_ids = set()
+    for name in changed_names:
+        for rows_dict in (init_ortho_rows_dict, ortho_rows_dict):
+            touched_pub_ids.update(row[0] for row in rows_dict.get(name, []))
+    return sorted(touched_pub_ids), ortho_rows_dict
+
+
+def _patch_merge_results(wf_path, corpus_year, merged_tup, pub_ids):
+    """Patches the results of the previous merge with the results 
+    of the merge of the touched publications.
+
+    The rows of these publications are replaced through the 
+    `_patch_pub_ids_data` internal function in the corrected conferences 
+    data, the merged data and the conferences data not found in the 
+    employees data. The file of the latter data is emptied here when 
+    no row remains as empty data are not saved by the `save_merged_data` 
+    function imported from the `cmfuncts.merge_conf_employees` module.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        merged_tup (tup): The results of the merge of the touched \
+        publications set through the `merge_conf_tables` function imported \
+        from the `cmfuncts.merge_conf_employees` module.
+        pub_ids (list): The IDs of the touched publications.
+    Returns:
+        (tup): The patched results in the same order.
+    """
+    # Setting useful aliases
+    hal_corpus_alias = cm_cg.CM_ARCHI['corpus_folder']
+    corr_file_base_alias = cm_cg.CM_ARCHI['hal_corr_file_base']
+
+    # Setting useful paths
+    paths_list, _ = set_merge_paths(wf_path, corpus_year)
+    _, valid_file_path, orphan_file_path = paths_list
+    corr_file_path = wf_path / Path(corpus_year) / Path(hal_corpus_alias) \
+                     / Path(corpus_year + corr_file_base_alias)
+
+    corr_conf_df, valid_df, orphan_df = merged_tup
+    corr_conf_df = _patch_pub_ids_data(pd.read_excel(corr_file_path), corr_conf_df, pub_ids)
+    valid_df = _patch_pub_ids_data(pd.read_excel(valid_file_path), valid_df, pub_ids)
+    if os.path.isfile(orphan_file_path):
+        orphan_df = _patch_pub_ids_data(pd.read_excel(orphan_file_path), orphan_df, pub_ids)
+        if orphan_df.empty:
+            orphan_df.to_excel(orphan_file_path, index=False)
+    return corr_conf_df, valid_df, orphan_df
+
+
+@instrument_stage(stage_name="incremental_year_search")
+def incremental_year_search(wf_root_path, wf_path, corpus_year, conf_df=pd.DataFrame(),
+                            employees_dict={}, years_to_search=[], progress_callback=None,
+                            cancel_token=None):
+    """Updates the merged data of a corpus year for the only author rows 
+    touched by changes of the spelling corrections since the previous merge.
+
+    The publications with at least one author affected by a new, changed 
+    or removed spelling correction are set through the `_set_touched_pub_ids` 
+    internal function. Whole publications are processed as the correction 
+    of a first author modifies all the rows of the publication. They are 
+    merged through the `merge_conf_tables` function imported from the 
+    `cmfuncts.merge_conf_employees` module, with the inputs set through 
+    the `set_merge_inputs` function imported from the same module, and 
+    their rows are replaced in the previous results through the 
+    `_patch_merge_results` internal function. The results are saved with 
+    the updated dependencies through the `save_merge_results` function 
+    imported from the same module. When no publication is touched, 
+    only the dependencies are saved. In both cases, the manifest 
+    of the merge set through the `set_merge_stage` function imported 
+    from the `cmfuncts.merge_stage` module is saved, the given 
+    contributions to conferences being expected to be the data 
+    of the file resulting from the HAL extraction.
+    A full merge is performed through the `recursive_year_search` function 
+    imported from the same module when the dependencies are not available 
+    or when the employees data, the external PhD students data or the files 
+    of contributions to conferences changed.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        conf_df (dataframe): The list of contributions to conferences \
+        with one row per Institute-affiliated author (default=empty dataframe).
+        employees_dict (dict): The employees data keyed by year (default={}).
+        years_to_search (list): The years (str) of employees data \
+        to search (default=[]).
+        progress_callback (function): Function for updating ProgressBar \
+        tkinter widget status (default = None).
+        cancel_token (CancelToken): Optional cancellation token \
+        (default=None).
+    Returns:
+        (tup): (The search status (bool), the updated merged data \
+        with the employees data (dataframe)).
+    """
+    # Setting specific aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+
+    if not employees_dict:
+        # Reading employees data
+        print("\nReading employees data...")
+        employees_dict = read_hal_employees_data(wf_root_path)
+    if not years_to_search:
+        _, years_to_search = adapt_search_depth(corpus_year, employees_dict)
+
+    # Checking the dependencies of the previous merge
+    deps_dict = read_merge_deps(wf_path, corpus_year)
+    reason = None
+    if years_to_search:
+        reason = _check_merge_deps(wf_root_path, wf_path, corpus_year,
+                                   deps_dict, years_to_search)
+    if reason or not years_to_search:
+        if reason:
+            print(f"\nFull merge performed: {reason}.")
+        return recursive_year_search(wf_root_path, wf_path, corpus_year, conf_df=conf_df,
+                                     employees_dict=employees_dict,
+                                     years_to_search=years_to_search,
+                                     progress_callback=progress_callback,
+                                     cancel_token=cancel_token)
+    if progress_callback:
+        progress_callback(15)
+
+    # Setting the manifest of the merge before reading the conferences data
+    # so that it certifies the data actually read
+    manifest_path, inputs_dict, outputs_list = set_merge_stage(wf_root_path, wf_path,
+                                                               corpus_year, years_to_search)
+    if conf_df.empty:
+        print("\nReading contributions to conferences data...")
+        pub_df, auth_df = read_conf_tables(wf_path, corpus_year)
+    else:
+        pub_df, auth_df = split_conf_data(conf_df)
+
+    # Identifying the publications touched by the spelling-correction changes
+    ortho_dict = set_ortho_dict(read_ortho_data(wf_path))
+    touched_pub_ids, ortho_rows_dict = _set_touched_pub_ids(deps_dict, ortho_dict, auth_df)
+    deps_dict['ortho'] = ortho_dict
+    deps_dict['ortho_rows'] = ortho_rows_dict
+
+    if touched_pub_ids:
+        print(f"\nUpdating merge for {len(touched_pub_ids)} contributions "
+              "touched by spelling-correction changes...")
+        inputs_tup = set_merge_inputs(wf_root_path, wf_path,
+                                      {year: employees_dict[year] for year in years_to_search})
+        touched_tables = (pub_df[pub_df[pub_id_alias].isin(touched_pub_ids)],
+                          auth_df[auth_df[pub_id_alias].isin(touched_pub_ids)])
+        merged_tup, touched_year_rows_dict = merge_conf_tables(wf_path, corpus_year,
+                                                               touched_tables,
+                                                               years_to_search, inputs_tup,
+                                                               progress_callback=progress_callback,
+                                                               cancel_token=cancel_token)
+        merged_tup = _patch_merge_results(wf_path, corpus_year, merged_tup, touched_pub_ids)
+        deps_dict['year_rows'] = {year: sorted([row for row in rows_list
+                                                if row[0] not in touched_pub_ids]
+                                               + touched_year_rows_dict[year])
+                                  for year, rows_list in deps_dict['year_rows'].items()}
+        save_merge_results(wf_path, corpus_year, merged_tup, deps_dict)
+        valid_df = merged_tup[1]
+    else:
+        print("\nNo change of spelling corrections affecting the merged data.")
+        save_merge_deps(wf_path, corpus_year, deps_dict)
+        valid_df = read_merged_data(wf_path, corpus_year)
+
+    # Updating the manifest of the merge
+    save_stage_manifest(manifest_path, inputs_dict, outputs_list)
+
+    if progress_callback:
+        progress_callback(100)
+    return True, valid_df
@@ -0,0 +1,283 @@
+"""Module of functions setting the files and the dependencies of the merge
+of the contributions to conferences with the employees data.
+
+The dependencies are used for skipping the merge when its inputs are
+unchanged, through the manifest of the merge stage, and for updating
+the merged data incrementally when the spelling corrections change.
+
+"""
+
+__all__ = ['read_merge_deps',
+           'save_merge_deps',
+           'set_inputs_signatures',
+           'set_merge_paths',
+           'set_merge_stage',
+           'set_norm_co_authors',
+           'set_ortho_dict',
+           'set_ortho_rows',
+           'set_year_signatures',
+          ]
+
+
+# Standard Library imports
+import json
+import os
+from pathlib import Path
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.build_employees import set_empl_paths
+from cmfuncts.conf_extract import set_extract_paths
+from cmfuncts.stage_cache import set_file_fingerprint
+from cmfuncts.stage_cache import set_params_fingerprint
+from cmfuncts.useful_functs import standardize_name
+
+
+def set_merge_paths(wf_path, corpus_year):
+    """Sets the parameters of the files resulting from merge of data of 
+    the contributions to conferences with the data of employees.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (tup): (The list composed of the full path (path) to the folder  \
+        where are located the two files generated by the merge \
+        and of the full paths (path) to these two files, \
+        the list of the names (str) of these two files).
+    """
+    # Setting useful aliases
+    conf_empl_folder_alias = cm_cg.CM_ARCHI['conf_empl_folder']
+    valid_file_alias = cm_cg.CM_ARCHI['valid_authors']
+    orphan_file_alias = cm_cg.CM_ARCHI['orphan_authors']
+
+    # Setting specific paths
+    year_cmf_path = wf_path / Path(corpus_year)
+    conf_empl_folder_path = year_cmf_path / Path(conf_empl_folder_alias)
+    valid_file_path = conf_empl_folder_path / Path(valid_file_alias)
+    orphan_file_path = conf_empl_folder_path / Path(orphan_file_alias)
+
+    # Setting the return lists
+    filenames_list = [valid_file_alias, orphan_file_alias]
+    paths_list = [conf_empl_folder_path, valid_file_path, orphan_file_path]
+
+    return paths_list, filenames_list
+
+
+def _set_file_signature(file_path):
+    """Sets the signature of a file given by its modification time and its size.
+
+    Args:
+        file_path (path): The full path to the file.
+    Returns:
+        (list): [modification time (float), size (int)] of the file \
+        or None if the file does not exist.
+    """
+    if not os.path.isfile(file_path):
+        return None
+    file_stat = os.stat(file_path)
+    return [file_stat.st_mtime, file_stat.st_size]
+
+
+def _set_merge_deps_path(wf_path, corpus_year):
+    """Sets the full path to the file of the merge dependencies.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (path): The full path to the file.
+    """
+    paths_list, _ = set_merge_paths(wf_path, corpus_year)
+    conf_empl_folder_path = paths_list[0]
+    deps_file_path = conf_empl_folder_path / Path(cm_cg.CM_ARCHI['merge_deps_file'])
+    return deps_file_path
+
+
+def set_ortho_dict(ortho_df):
+    """Sets the spelling corrections as a dict keyed by the lowered 
+    author name found in the publications and valued by the employee name.
+
+    Args:
+        ortho_df (dataframe): The spelling corrections.
+    Returns:
+        (dict): The spelling corrections.
+    """
+    # Setting useful aliases
+    ortho_pub_name_alias = cm_cg.ORTHO_COLS['pub_fullname']
+    ortho_empl_name_alias = cm_cg.ORTHO_COLS['empl_fullname']
+
+    ortho_dict = dict(zip(ortho_df[ortho_pub_name_alias].str.lower(),
+                          ortho_df[ortho_empl_name_alias].astype(str)))
+    return ortho_dict
+
+
+def set_norm_co_authors(auth_df):
+    """Sets the normalized co-author names used for the search 
+    of spelling corrections.
+
+    Args:
+        auth_df (dataframe): The authorships table of the contributions \
+        to conferences.
+    Returns:
+        (series): The lowered co-author names without accentuated characters.
+    """
+    co_auth_alias = cm_cg.CONF_COLS['co_author']
+    norm_names = auth_df[co_auth_alias].apply(standardize_name).str.lower()
+    return norm_names
+
+
+def set_ortho_rows(auth_df, ortho_dict):
+    """Sets the author rows of the contributions to conferences 
+    affected by each entry of the spelling corrections.
+
+    Args:
+        auth_df (dataframe): The authorships table of the contributions \
+        to conferences before spelling corrections.
+        ortho_dict (dict): The spelling corrections built through \
+        the `set_ortho_dict` function of the same module.
+    Returns:
+        (dict): Data keyed by the lowered author name and valued \
+        by the list of [publication ID, author index] of the affected rows.
+    """
+    # Setting useful aliases
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    auth_idx_alias = cm_cg.CONF_COLS['author_idx']
+
+    norm_names = set_norm_co_authors(auth_df)
+    hit_status = norm_names.isin(ortho_dict.keys())
+    hit_df = auth_df.loc[hit_status, [pub_id_alias, auth_idx_alias]]
+    ortho_rows_dict = {}
+    for name, name_df in hit_df.groupby(norm_names[hit_status]):
+        ortho_rows_dict[name] = name_df.values.tolist()
+    return ortho_rows_dict
+
+
+def save_merge_deps(wf_path, corpus_year, deps_dict):
+    """Saves, for a corpus year, the dependencies of the merged data 
+    as a json file.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        deps_dict (dict): The dependencies to save.
+    """
+    deps_file_path = _set_merge_deps_path(wf_path, corpus_year)
+    with open(deps_file_path, 'w', encoding='utf-8') as deps_file:
+        json.dump(deps_dict, deps_file, ensure_ascii=False)
+
+
+def read_merge_deps(wf_path, corpus_year):
+    """Reads, for a corpus year, the dependencies of the merged data.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (dict): The dependencies or None if they are not available.
+    """
+    deps_file_path = _set_merge_deps_path(wf_path, corpus_year)
+    if not os.path.isfile(deps_file_path):
+        return None
+    with open(deps_file_path, encoding='utf-8') as deps_file:
+        deps_dict = json.load(deps_file)
+    return deps_dict
+
+
+def set_inputs_signatures(wf_root_path, wf_path):
+    """Sets the signatures of the employees data and of the external 
+    PhD students data files used by the merge.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+    Returns:
+        (dict): The signatures keyed by the data name.
+    """
+    # Setting useful aliases
+    orphan_treat_root_alias = cm_cg.ORPHAN_ARCHI["root"]
+    adds_file_name_alias = cm_cg.ORPHAN_ARCHI["employees adds file"]
+
+    # Setting useful paths
+    empl_paths_list, _ = set_empl_paths(wf_root_path)
+    hal_all_empl_path = empl_paths_list[-1]
+    ext_docs_path = wf_path / Path(orphan_treat_root_alias) / Path(adds_file_name_alias)
+
+    signatures_dict = {'employees': _set_file_signature(hal_all_empl_path),
+                       'ext_docs' : _set_file_signature(ext_docs_path)}
+    return signatures_dict
+
+
+def set_year_signatures(wf_path, corpus_year):
+    """Sets the signatures of the files of contributions to conferences 
+    of a corpus year used by the merge, that are the file resulting from 
+    the HAL extraction and the file after check of author-names spelling.
+
+    The signatures are the fingerprints of the files content set through 
+    the `set_file_fingerprint` function imported from the 
+    `cmfuncts.stage_cache` module, so that an extraction giving 
+    the same data does not require a full merge.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (dict): The signatures keyed by the data name.
+    """
+    # Setting useful aliases
+    corr_file_base_alias = cm_cg.CM_ARCHI['hal_corr_file_base']
+
+    # Setting useful paths
+    extract_paths_list, _ = set_extract_paths(wf_path, corpus_year)
+    hal_corpus_path, _, conf_file_path = extract_paths_list
+    corr_file_path = hal_corpus_path / Path(corpus_year + corr_file_base_alias)
+
+    signatures_dict = {'conf': set_file_fingerprint(conf_file_path),
+                       'corr': set_file_fingerprint(corr_file_path)}
+    return signatures_dict
+
+
+def set_merge_stage(wf_root_path, wf_path, corpus_year, years_to_search):
+    """Sets the parameters of the merge stage used for skipping the merge 
+    when its inputs are unchanged.
+
+    The inputs are the extracted data of contributions to conferences, 
+    the employees data, the spelling corrections, the external PhD 
+    students data and the years of employees data to search.
+
+    Args:
+        wf_root_path (path): The full path to the root folder where \
+        the folder of Institute parameters is located.
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        years_to_search (list): The years (str) of employees data to search.
+    Returns:
+        (tup): (full path (path) to the manifest file, fingerprints (dict) \
+        of the inputs keyed by input name, full paths (list) to the output files).
+    """
+    # Setting useful aliases
+    orphan_treat_root_alias = cm_cg.ORPHAN_ARCHI["root"]
+    orthograph_file_name_alias = cm_cg.ORPHAN_ARCHI["orthograph file"]
+    adds_file_name_alias = cm_cg.ORPHAN_ARCHI["employees adds file"]
+    corr_file_base_alias = cm_cg.CM_ARCHI['hal_corr_file_base']
+
+    # Setting useful paths
+    extract_paths_list, _ = set_extract_paths(wf_path, corpus_year)
+    hal_corpus_path, _, conf_file_path = extract_paths_list
+    empl_paths_list, _ = set_empl_paths(wf_root_path)
+    orphan_treat_root_path = wf_path / Path(orphan_treat_root_alias)
+    merge_paths_list, _ = set_merge_paths(wf_path, corpus_year)
+    conf_empl_folder_path, valid_file_path, orphan_file_path = merge_paths_list
+    corr_file_path = hal_corpus_path / Path(corpus_year + corr_file_base_alias)
+    manifest_path = conf_empl_folder_path / Path(cm_cg.CM_ARCHI['merge_manifest_file'])
+
+    inputs_dict = {'conf'     : set_file_fingerprint(conf_file_path),
+                   'employees': set_file_fingerprint(empl_paths_list[-1]),
+                   'ortho'    : set_file_fingerprint(orphan_treat_root_path
+                                                     / Path(orthograph_file_name_alias)),
+                   'ext_docs' : set_file_fingerprint(orphan_treat_root_path
+                                                     / Path(adds_file_name_alias)),
+                   'params'   : set_params_fingerprint({'years_to_search': years_to_search})}
+    outputs_list = [valid_file_path, orphan_file_path, corr_file_path]
+    return manifest_path, inputs_dict, outputs_list
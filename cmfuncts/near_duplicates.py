@@ -0,0 +1,207 @@
+"""Module of functions for detecting near-duplicate contributions
+to conferences that are not caught by the hash IDs.
+
+The detection uses MinHash signatures of the character shingles
+of a normalized text built with the title, the first author and
+the conference of each contribution. Candidate pairs are got through
+locality-sensitive hashing (LSH) of the signatures by bands
+and then scored by the Jaccard similarity of their shingles.
+
+"""
+
+__all__ = ['find_near_duplicates',
+           'save_near_duplicates',
+          ]
+
+
+# Standard Library imports
+import re
+import zlib
+from pathlib import Path
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.stage_metrics import instrument_stage
+from cmfuncts.useful_functs import standardize_name
+
+
+def _normalize_text(text):
+    """Normalizes a text by removing accentuated characters,
+    punctuation and case.
+
+    Args:
+        text (str): The text to normalize.
+    Returns:
+        (str): The normalized text.
+    """
+    if not isinstance(text, str):
+        return ""
+    text = standardize_name(text).lower()
+    text = re.sub(r"[^a-z0-9]+", " ", text).strip()
+    return text
+
+
+def _set_shingles(text, shingle_size):
+    """Sets the character shingles of a text.
+
+    Args:
+        text (str): The normalized text.
+        shingle_size (int): The number of characters of a shingle.
+    Returns:
+        (set): The shingles hashed as 32 bits integers.
+    """
+    if len(text)<=shingle_size:
+        return {zlib.crc32(text.encode())}
+    shingles_set = {zlib.crc32(text[idx: idx + shingle_size].encode())
+                    for idx in range(len(text) - shingle_size + 1)}
+    return shingles_set
+
+
+def _set_minhash_signatures(shingles_list, perm_nb, seed=0):
+    """Sets the MinHash signatures of sets of shingles.
+
+    The permutations are simulated by universal hash functions
+    (a * x + b) mod p with p a prime number greater than 2**32.
+
+    Args:
+        shingles_list (list): The sets of shingles.
+        perm_nb (int): The number of permutations.
+        seed (int): The seed of the hash functions (default=0).
+    Returns:
+        (array): The signatures with one row per set of shingles.
+    """
+    prime = np.uint64(4294967311)
+    rng = np.random.default_rng(seed)
+    coef_a = rng.integers(1, 2**32 - 1, size=perm_nb, dtype=np.uint64)
+    coef_b = rng.integers(0, 2**32 - 1, size=perm_nb, dtype=np.uint64)
+
+    signatures = np.empty((len(shingles_list), perm_nb), dtype=np.uint64)
+    for idx, shingles_set in enumerate(shingles_list):
+        shingles = np.fromiter(shingles_set, dtype=np.uint64)
+        hashes = (np.outer(shingles, coef_a) + coef_b) % prime
+        signatures[idx] = hashes.min(axis=0)
+    return signatures
+
+
+def _set_candidate_pairs(signatures, bands_nb):
+    """Sets the candidate pairs of near duplicates through
+    locality-sensitive hashing of the signatures by bands.
+
+    Args:
+        signatures (array): The MinHash signatures.
+        bands_nb (int): The number of bands.
+    Returns:
+        (set): The candidate pairs as tuples of row indexes.
+    """
+    rows_nb = signatures.shape[1] // bands_nb
+    pairs_set = set()
+    for band_idx in range(bands_nb):
+        band = signatures[:, band_idx * rows_nb: (band_idx + 1) * rows_nb]
+        buckets_dict = {}
+        for idx, band_row in enumerate(band):
+            buckets_dict.setdefault(band_row.tobytes(), []).append(idx)
+        for bucket_list in buckets_dict.values():
+            for pos, idx_1 in enumerate(bucket_list):
+                for idx_2 in bucket_list[pos + 1:]:
+                    pairs_set.add((idx_1, idx_2))
+    return pairs_set
+
+
+@instrument_stage(stage_name="near_duplicates")
+def find_near_duplicates(conf_df, params_dict=None):
+    """Finds the pairs of near-duplicate contributions to conferences.
+
+    The text of each contribution is built by joining the title,
+    the first author and the conference normalized through
+    the `_normalize_text` internal function. Only one row per
+    hash ID is used and the pairs with the same hash ID are thus
+    not reported.
+
+    Args:
+        conf_df (dataframe): The list of contributions to conferences \
+        with the columns of hash ID, pub ID, title, first author, \
+        conference, conference year and document type.
+        params_dict (dict): Optional parameters of the detection; \
+        if None, the 'NEAR_DUP_PARAMS' global is used (default=None).
+    Returns:
+        (dataframe): The pairs of suspected duplicates with their \
+        similarity score, sorted by decreasing score.
+    """
+    # Setting useful aliases
+    hash_id_alias = cm_cg.HASH_COL['hash_id']
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    title_alias = cm_cg.CONF_COLS['title']
+    first_auth_alias = cm_cg.CONF_COLS['first_author']
+    conf_name_alias = cm_cg.CONF_COLS['conf_name']
+    conf_year_alias = cm_cg.CONF_COLS['conf_year']
+    doctype_alias = cm_cg.CONF_COLS['doctype']
+    score_alias = cm_cg.NEAR_DUP_COLS['score']
+
+    if params_dict is None:
+        params_dict = cm_cg.NEAR_DUP_PARAMS
+
+    # Setting useful columns list
+    useful_cols = [hash_id_alias, pub_id_alias, title_alias, first_auth_alias,
+                   conf_name_alias, conf_year_alias, doctype_alias]
+    pairs_cols = [f"{col} {num}" for num in (1, 2) for col in useful_cols] + [score_alias]
+
+    pubs_df = conf_df[useful_cols].drop_duplicates(subset=[hash_id_alias])
+    pubs_df = pubs_df.reset_index(drop=True)
+    if len(pubs_df)<2:
+        return pd.DataFrame(columns=pairs_cols)
+
+    # Building the shingles of the normalized texts
+    texts = (pubs_df[title_alias].map(_normalize_text) + " "
+             + pubs_df[first_auth_alias].map(_normalize_text) + " "
+             + pubs_df[conf_name_alias].map(_normalize_text))
+    shingles_list = [_set_shingles(text, params_dict['shingle_size']) for text in texts]
+
+    # Finding candidate pairs and scoring them
+    signatures = _set_minhash_signatures(shingles_list, params_dict['perm_nb'])
+    pairs_set = _set_candidate_pairs(signatures, params_dict['bands_nb'])
+    data = []
+    for idx_1, idx_2 in sorted(pairs_set):
+        shingles_1, shingles_2 = shingles_list[idx_1], shingles_list[idx_2]
+        score = len(shingles_1 & shingles_2) / len(shingles_1 | shingles_2)
+        if score>=params_dict['threshold']:
+            data.append(list(pubs_df.loc[idx_1, useful_cols])
+                        + list(pubs_df.loc[idx_2, useful_cols])
+                        + [round(score, 3)])
+    pairs_df = pd.DataFrame(data, columns=pairs_cols)
+    pairs_df = pairs_df.sort_values(by=score_alias, ascending=False,
+                                    kind="stable").reset_index(drop=True)
+    return pairs_df
+
+
+def save_near_duplicates(wf_path, corpus_year, pairs_df):
+    """Saves, for a corpus year, the review sheet of suspected
+    duplicates of contributions to conferences.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        pairs_df (dataframe): The pairs of suspected duplicates \
+        got through the `find_near_duplicates` function.
+    Returns:
+        (str): End message.
+    """
+    # Setting useful aliases
+    results_folder_alias = cm_cg.CM_ARCHI['final_results_folder']
+    near_dup_file_alias = cm_cg.CM_ARCHI['near_dup_file_name']
+
+    # Setting specific paths
+    year_cmf_path = wf_path / Path(corpus_year)
+    results_folder_path = year_cmf_path / Path(results_folder_alias)
+    near_dup_file_path = results_folder_path / Path(near_dup_file_alias)
+
+    # Saving the data
+    pairs_df.to_excel(near_dup_file_path, index=False,
+                      sheet_name=cm_cg.CM_ARCHI['near_dup_sheet_name'])
+
+    message = (f"\n{len(pairs_df)} pairs of suspected duplicates of contributions "
+               f"to conferences saved in file: \n  {near_dup_file_path}")
+    return message
@@ -0,0 +1,197 @@
+"""Module of the progress channel between the treatment workers
+and the user interfaces.
+
+The workers post progress events, rate limited, on a thread-safe queue.
+The GUI drains the queue from its main loop and the command-line
+interface prints the events as a compact status line.
+
+"""
+
+__all__ = ['ProgressChannel',
+           'format_progress_status',
+           'post_progress',
+           'print_progress_status',
+          ]
+
+
+# Standard Library imports
+import queue
+import sys
+import time
+
+
+class ProgressChannel:
+    """Thread-safe channel of progress events.
+
+    An instance is callable with the progress value (0 to 100) so that
+    it can be passed as 'progress_callback' argument to the treatment
+    functions. The events are posted only if the minimum interval
+    since the previous event is elapsed, except for the first event,
+    the final event (value of 100) and the events of a new stage.
+
+    Each event is a dict with the following keys:
+
+    - 'stage': the name (str) of the stage;
+    - 'value': the progress value (float) from 0 to 100;
+    - 'fraction': the progress fraction (float) from 0 to 1;
+    - 'rows_per_s': the processing rate (float) of rows per second \
+    or None if the number of processed rows is not given;
+    - 'status': None for a progress event or the end status (str) \
+    of the stage posted through the `post_end` method;
+    - 'message': the message (str) of the end status.
+
+    Args:
+        stage (str): Optional name of the initial stage (default="").
+        min_interval (float): Optional minimum interval in seconds \
+        between two events (default=0.1).
+        listener (function): Optional function called with each posted \
+        event in the posting thread instead of queueing it (default=None).
+    """
+
+    def __init__(self, stage="", min_interval=0.1, listener=None):
+        self.stage = stage
+        self.min_interval = min_interval
+        self.listener = listener
+        self.events = queue.Queue()
+        self._last_time = None
+        self._stage_start = None
+
+    def set_stage(self, stage):
+        """Sets the name of the current stage.
+
+        Args:
+            stage (str): The name of the stage.
+        """
+        self.stage = stage
+        self._last_time = None
+        self._stage_start = None
+
+    def post(self, value, rows=None):
+        """Posts a progress event if the rate limit allows it.
+
+        Args:
+            value (float): The progress value from 0 to 100.
+            rows (int): Optional number of rows processed since \
+            the start of the stage (default=None).
+        Returns:
+            (bool): True if the event has been posted.
+        """
+        now = time.monotonic()
+        if self._stage_start is None:
+            self._stage_start = now
+        elif value<100 and now - self._last_time<self.min_interval:
+            return False
+
+        rows_per_s = None
+        if rows is not None and now>self._stage_start:
+            rows_per_s = round(rows / (now - self._stage_start), 1)
+        event = {'stage'     : self.stage,
+                 'value'     : float(value),
+                 'fraction'  : min(max(float(value) / 100, 0.), 1.),
+                 'rows_per_s': rows_per_s,
+                 'status'    : None,
+                 'message'   : "",
+                }
+        self._put_event(event, now)
+        return True
+
+    def post_end(self, status, message=""):
+        """Posts the final event of a stage ended with a given status, 
+        such as "cancelled" or "failed", bypassing the rate limit.
+
+        Args:
+            status (str): The end status of the stage.
+            message (str): Optional message of the end status (default="").
+        """
+        event = {'stage'     : self.stage,
+                 'value'     : 100.,
+                 'fraction'  : 1.,
+                 'rows_per_s': None,
+                 'status'    : status,
+                 'message'   : message,
+                }
+        self._put_event(event, time.monotonic())
+
+    def _put_event(self, event, now):
+        """Gives an event to the listener or puts it in the queue.
+
+        Args:
+            event (dict): The event.
+            now (float): The monotonic time of the event.
+        """
+        self._last_time = now
+        if self.listener:
+            self.listener(event)
+        else:
+            self.events.put(event)
+
+    def __call__(self, value):
+        """Posts a progress event through the `post` method.
+
+        Args:
+            value (float): The progress value from 0 to 100.
+        """
+        self.post(value)
+
+    def drain(self):
+        """Gets all the events posted since the previous drain.
+
+        Returns:
+            (list): The events (dict) in posting order.
+        """
+        events_list = []
+        while True:
+            try:
+                events_list.append(self.events.get_nowait())
+            except queue.Empty:
+                return events_list
+
+
+def post_progress(progress_callback, value, rows=None):
+    """Updates the progress through a progress callback.
+
+    The number of processed rows is given only when the callback 
+    is a progress channel, the other callbacks being called with 
+    the progress value only.
+
+    Args:
+        progress_callback (function): Function for updating \
+        the progress status.
+        value (float): The progress value from 0 to 100.
+        rows (int): Optional number of rows processed since \
+        the start of the stage (default=None).
+    """
+    if isinstance(progress_callback, ProgressChannel):
+        progress_callback.post(value, rows=rows)
+    else:
+        progress_callback(value)
+
+
+def format_progress_status(event, bar_length=20):
+    """Formats a progress event as a compact status line.
+
+    Args:
+        event (dict): The progress event.
+        bar_length (int): The number of characters of the bar (default=20).
+    Returns:
+        (str): The status line.
+    """
+    done_length = int(event['fraction'] * bar_length)
+    status_line = (f"{event['stage'][:24]:<24} "
+                   f"[{'#' * done_length}{'.' * (bar_length - done_length)}] "
+                   f"{event['value']:5.1f} %")
+    if event['rows_per_s'] is not None:
+        status_line += f" {event['rows_per_s']:.0f} rows/s"
+    return status_line
+
+
+def print_progress_status(event):
+    """Prints a progress event as a status line overwritten
+    by the next one.
+
+    Args:
+        event (dict): The progress event.
+    """
+    end = "\n" if event['value']>=100 else ""
+    sys.stdout.write("\r" + format_progress_status(event) + end)
+    sys.stdout.flush()
@@ -0,0 +1,142 @@
+"""Module of functions for keeping in memory the data handed
+between the treatment steps of a session of the application.
+
+The data are keyed by a tuple such as (institute, working folder,
+corpus year, step name) and are associated with the files they
+are saved in. An entry is invalidated when one of these files
+changes on disk. The least recently used entries are evicted
+when the size of the cached data exceeds the value given by
+the 'SESSION_CACHE_MAX_MB' global.
+
+"""
+
+__all__ = ['clear_session_cache',
+           'get_session_data',
+           'set_session_data',
+          ]
+
+
+# Standard Library imports
+import os
+import threading
+from collections import OrderedDict
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+
+
+_SESSION_CACHE = OrderedDict()
+_SESSION_LOCK = threading.Lock()
+
+
+def _set_data_size(data):
+    """Sets the memory size of data.
+
+    Args:
+        data (dataframe or dict): The data as a dataframe or as a dict \
+        valued by dataframes.
+    Returns:
+        (int): The memory size in bytes.
+    """
+    if isinstance(data, pd.DataFrame):
+        return int(data.memory_usage(deep=True).sum())
+    return sum(_set_data_size(value) for value in data.values())
+
+
+def _copy_data(data):
+    """Copies data so that the cached data are not modified by the users.
+
+    Args:
+        data (dataframe or dict): The data as a dataframe or as a dict \
+        valued by dataframes.
+    Returns:
+        (dataframe or dict): The copied data.
+    """
+    if isinstance(data, pd.DataFrame):
+        return data.copy()
+    return {key: value.copy() for key, value in data.items()}
+
+
+def _set_files_signatures(files_list):
+    """Sets the signatures of files given by their modification time and size.
+
+    Args:
+        files_list (list): The full paths (path) to the files.
+    Returns:
+        (list): The signatures as [modification time (float), size (int)] \
+        or None for the missing files.
+    """
+    signatures_list = []
+    for file_path in files_list:
+        signature = None
+        if os.path.isfile(file_path):
+            file_stat = os.stat(file_path)
+            signature = [file_stat.st_mtime, file_stat.st_size]
+        signatures_list.append(signature)
+    return signatures_list
+
+
+def set_session_data(key_tup, data, files_list):
+    """Stores data in the session cache.
+
+    Args:
+        key_tup (tup): The key of the data.
+        data (dataframe or dict): The data as a dataframe or as a dict \
+        valued by dataframes.
+        files_list (list): The full paths (path) to the files \
+        where the data are saved.
+    """
+    max_size = cm_cg.SESSION_CACHE_MAX_MB * 2**20
+    data_size = _set_data_size(data)
+    with _SESSION_LOCK:
+        _SESSION_CACHE.pop(key_tup, None)
+        if data_size>max_size:
+            return
+        _SESSION_CACHE[key_tup] = {'data'      : _copy_data(data),
+                                   'size'      : data_size,
+                                   'files'     : list(files_list),
+                                   'signatures': _set_files_signatures(files_list)}
+
+        # Evicting the least recently used entries
+        cache_size = sum(entry['size'] for entry in _SESSION_CACHE.values())
+        while cache_size>max_size:
+            _, entry = _SESSION_CACHE.popitem(last=False)
+            cache_size -= entry['size']
+
+
+def get_session_data(key_tup, pop=False):
+    """Gets data from the session cache.
+
+    The entry is invalidated if one of the files of the data
+    changed on disk since the data were stored.
+
+    Args:
+        key_tup (tup): The key of the data.
+        pop (bool): Status for removing the entry from the cache \
+        (default=False).
+    Returns:
+        (dataframe or dict): A copy of the data or None if the data \
+        are not available.
+    """
+    with _SESSION_LOCK:
+        entry = _SESSION_CACHE.get(key_tup)
+        if entry is None:
+            return None
+        if _set_files_signatures(entry['files'])!=entry['signatures']:
+            del _SESSION_CACHE[key_tup]
+            return None
+        if pop:
+            del _SESSION_CACHE[key_tup]
+            return entry['data']
+        _SESSION_CACHE.move_to_end(key_tup)
+        return _copy_data(entry['data'])
+
+
+def clear_session_cache():
+    """Removes all the entries of the session cache.
+    """
+    with _SESSION_LOCK:
+        _SESSION_CACHE.clear()
@@ -0,0 +1,142 @@
+"""Module of functions for skipping the treatment stages
+which inputs are unchanged since their last run.
+
+Each stage records, next to its outputs, a manifest of the fingerprints
+of its inputs and outputs together with the code version.
+A stage is skipped when the manifest matches the current inputs,
+the current outputs and the current code version.
+
+"""
+
+__all__ = ['check_stage_manifest',
+           'save_stage_manifest',
+           'set_code_version',
+           'set_file_fingerprint',
+           'set_params_fingerprint',
+          ]
+
+
+# Standard Library imports
+import hashlib
+import json
+import os
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+# Local imports
+from cmfuncts import __version__
+
+
+def set_file_fingerprint(file_path):
+    """Sets the fingerprint of a file as the hash of its content.
+
+    Args:
+        file_path (path): The full path to the file.
+    Returns:
+        (str): The sha256 hex digest of the file content or None \
+        if the file does not exist.
+    """
+    if not os.path.isfile(file_path):
+        return None
+    file_hash = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def set_params_fingerprint(params):
+    """Sets the fingerprint of parameters.
+
+    Args:
+        params (any): The parameters serializable as json; \
+        the other objects are converted to strings.
+    Returns:
+        (str): The sha256 hex digest of the parameters.
+    """
+    params_str = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(params_str.encode('utf-8')).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def set_code_version():
+    """Sets the code version of the `cmfuncts` package.
+
+    The code version combines the package version with the hash
+    of the source files of the package when they are available.
+
+    Returns:
+        (str): The code version.
+    """
+    sources_hash = hashlib.sha256()
+    for source_path in sorted(Path(__file__).parent.glob("*.py")):
+        sources_hash.update(source_path.read_bytes())
+    code_version = __version__ + ":" + sources_hash.hexdigest()[:16]
+    return code_version
+
+
+def _set_outputs_fingerprints(outputs_list):
+    """Sets the fingerprints of the output files of a stage.
+
+    Args:
+        outputs_list (list): The full paths (path) to the output files.
+    Returns:
+        (dict): The fingerprints keyed by the file names.
+    """
+    outputs_dict = {Path(output_path).name: set_file_fingerprint(output_path)
+                    for output_path in outputs_list}
+    return outputs_dict
+
+
+def save_stage_manifest(manifest_path, inputs_dict, outputs_list, results_dict=None):
+    """Saves the manifest of a stage as a json file.
+
+    Args:
+        manifest_path (path): The full path to the manifest file.
+        inputs_dict (dict): The fingerprints (str) of the inputs \
+        keyed by input name.
+        outputs_list (list): The full paths (path) to the output files.
+        results_dict (dict): Optional results of the stage to be \
+        returned when the stage is skipped (default=None).
+    """
+    manifest_dict = {'date'        : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                     'code_version': set_code_version(),
+                     'inputs'      : inputs_dict,
+                     'outputs'     : _set_outputs_fingerprints(outputs_list),
+                     'results'     : results_dict if results_dict else {}}
+    with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest_dict, manifest_file, ensure_ascii=False, indent=1)
+
+
+def check_stage_manifest(manifest_path, inputs_dict, outputs_list):
+    """Checks if a stage can be skipped using its manifest.
+
+    Args:
+        manifest_path (path): The full path to the manifest file.
+        inputs_dict (dict): The current fingerprints (str) of the inputs \
+        keyed by input name.
+        outputs_list (list): The full paths (path) to the output files.
+    Returns:
+        (tup): (The skip status (bool), the reason (str) of the status, \
+        the results (dict) recorded in the manifest).
+    """
+    if not os.path.isfile(manifest_path):
+        return False, "no manifest of a previous run", {}
+    with open(manifest_path, 'r', encoding='utf-8') as manifest_file:
+        manifest_dict = json.load(manifest_file)
+
+    if manifest_dict.get('code_version')!=set_code_version():
+        return False, "code version changed", {}
+    prev_inputs_dict = manifest_dict.get('inputs', {})
+    for input_name in sorted(set(inputs_dict) | set(prev_inputs_dict)):
+        if inputs_dict.get(input_name)!=prev_inputs_dict.get(input_name):
+            return False, f"input '{input_name}' changed", {}
+    outputs_dict = _set_outputs_fingerprints(outputs_list)
+    prev_outputs_dict = manifest_dict.get('outputs', {})
+    for output_name, fingerprint in outputs_dict.items():
+        if fingerprint!=prev_outputs_dict.get(output_name):
+            return False, f"output '{output_name}' missing or modified", {}
+
+    reason = f"inputs, outputs and code unchanged since {manifest_dict['date']}"
+    return True, reason, manifest_dict.get('results', {})
@@ -0,0 +1,601 @@
+"""Module of functions for recording the metrics of the treatment stages.
+
+For each stage are recorded the wall time, the CPU time and the numbers
+of rows in and out. The bytes written in the corpus-year folder are
+recorded for the outermost stages only, so that the folder is scanned
+once before and once after each top-level stage.
+The records are buffered and appended to the json run log saved
+in the corpus-year folder once per outermost stage. The records of
+the stages run without corpus year are kept until the next records
+of a corpus year are saved.
+
+Optionally, the cProfile stats of each outermost stage are dumped
+in a dedicated folder of the corpus-year folder.
+
+Optionally, in memory mode, the tracemalloc peak, the RSS high-water
+mark and the memory footprints of the main dataframes and of their
+copies are recorded for each stage. The memory report of a run is
+built from the run log through the `build_memory_report` function.
+
+The switches of the recording are given by the 'INSTRUMENT_PARAMS'
+global and may be changed through the `set_instrument_params` function.
+
+"""
+
+__all__ = ['build_memory_report',
+           'instrument_stage',
+           'read_run_log',
+           'record_frame',
+           'save_memory_report',
+           'set_instrument_params',
+           'stage_record',
+          ]
+
+
+# Standard Library imports
+import cProfile
+import functools
+import inspect
+import json
+import os
+import tempfile
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.cancellation import StageCancelledError
+
+try:
+    import resource
+    RESOURCE_STATUS = True
+except ImportError:
+    RESOURCE_STATUS = False
+
+try:
+    import psutil
+    PSUTIL_STATUS = True
+except ImportError:
+    PSUTIL_STATUS = False
+
+
+_RUN_ID = datetime.now().strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}"
+_PENDING_RECORDS = []
+_LOG_LOCK = threading.Lock()
+_STAGES_STACK = threading.local()
+_MEMORY_THREADS = {}
+
+
+def set_instrument_params(run_log=None, profile=None, memory=None):
+    """Sets the switches of the recording of the stages metrics.
+
+    The switches are also set as environment variables so that
+    they apply to the worker processes.
+
+    Args:
+        run_log (bool): Optional status for saving the run log \
+        (default=None, unchanged).
+        profile (bool): Optional status for dumping the cProfile \
+        stats of the stages (default=None, unchanged).
+        memory (bool): Optional status for recording the memory \
+        metrics of the stages (default=None, unchanged).
+    """
+    for key, status in (('run_log', run_log), ('profile', profile), ('memory', memory)):
+        if status is not None:
+            cm_cg.INSTRUMENT_PARAMS[key] = status
+            os.environ["CONFMETER_" + key.upper()] = "1" if status else "0"
+
+
+def _get_instrument_param(key):
+    """Gets a switch of the recording of the stages metrics.
+
+    Args:
+        key (str): The key of the switch in the 'INSTRUMENT_PARAMS' global.
+    Returns:
+        (bool): The switch status.
+    """
+    env_status = os.environ.get("CONFMETER_" + key.upper())
+    if env_status is not None:
+        return env_status=="1"
+    return cm_cg.INSTRUMENT_PARAMS[key]
+
+
+def _set_run_log_path(wf_path, corpus_year):
+    """Sets the full path to the run log of a corpus year.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (path): The full path to the run log.
+    """
+    year_folder_path = Path(wf_path) / Path(corpus_year)
+    return year_folder_path / Path(cm_cg.CM_ARCHI['run_log_file'])
+
+
+def read_run_log(wf_path, corpus_year):
+    """Reads the run log of a corpus year.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+    Returns:
+        (list): The stages records (dict), empty if the run log \
+        is not available.
+    """
+    run_log_path = _set_run_log_path(wf_path, corpus_year)
+    if not os.path.isfile(run_log_path):
+        return []
+    try:
+        with open(run_log_path, 'r', encoding='utf-8') as run_log_file:
+            records_list = json.load(run_log_file)
+    except ValueError:
+        records_list = []
+    return records_list
+
+
+def _save_records(wf_path, corpus_year, records_list):
+    """Appends records to the run log of a corpus year.
+
+    Only the last records, in the limit given by the 'max_records' key
+    of the 'INSTRUMENT_PARAMS' global, are kept.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        records_list (list): The stages records (dict) to append.
+    """
+    run_log_path = _set_run_log_path(wf_path, corpus_year)
+    if not run_log_path.parent.is_dir():
+        return
+    with _LOG_LOCK:
+        all_records_list = read_run_log(wf_path, corpus_year) + records_list
+        all_records_list = all_records_list[-cm_cg.INSTRUMENT_PARAMS['max_records']:]
+        tmp_path = run_log_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as run_log_file:
+            json.dump(all_records_list, run_log_file, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, run_log_path)
+
+
+def _flush_records(record, parent_record):
+    """Buffers the record of a stage and, at the end of an outermost
+    stage with corpus year, saves the buffered records through
+    the `_save_records` internal function.
+
+    The records are saved grouped by working folder and corpus year,
+    the records without corpus year being saved with the record
+    of the outermost stage.
+
+    Args:
+        record (dict): The record of the stage.
+        parent_record (dict): The record of the enclosing stage or None.
+    """
+    wf_path, corpus_year = record['_wf_path'], record['corpus_year']
+    with _LOG_LOCK:
+        _PENDING_RECORDS.append(record)
+        del _PENDING_RECORDS[:-cm_cg.INSTRUMENT_PARAMS['max_records']]
+        if parent_record or wf_path is None or corpus_year is None:
+            return
+        records_dict = {}
+        for pending_record in _PENDING_RECORDS:
+            key = (pending_record.pop('_wf_path'), pending_record['corpus_year'])
+            if None in key:
+                key = (wf_path, corpus_year)
+            records_dict.setdefault(key, []).append(pending_record)
+        _PENDING_RECORDS.clear()
+    for (records_wf_path, records_year), records_list in records_dict.items():
+        _save_records(records_wf_path, records_year, records_list)
+
+
+def _set_files_states(folders_list):
+    """Sets the modification time and size of the files of folders.
+
+    The run log and the cProfile dumps are not considered.
+
+    Args:
+        folders_list (list): The full paths (path) to the folders.
+    Returns:
+        (dict): The states as (modification time, size) keyed by file path.
+    """
+    excluded_names = (cm_cg.CM_ARCHI['run_log_file'], cm_cg.CM_ARCHI['profiles_folder'])
+    states_dict = {}
+    for folder_path in folders_list:
+        for dir_path, dir_names, file_names in os.walk(folder_path):
+            dir_names[:] = [name for name in dir_names if name not in excluded_names]
+            for file_name in file_names:
+                if file_name in excluded_names:
+                    continue
+                file_path = os.path.join(dir_path, file_name)
+                try:
+                    file_stat = os.stat(file_path)
+                except OSError:
+                    continue
+                states_dict[file_path] = (file_stat.st_mtime, file_stat.st_size)
+    return states_dict
+
+
+def _count_rows(data):
+    """Counts the rows of the dataframes of data.
+
+    Args:
+        data (any): A dataframe, or a tuple, list or dict of dataframes; \
+        the other objects are ignored.
+    Returns:
+        (int): The number of rows.
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+    if isinstance(data, (tuple, list)):
+        return sum(_count_rows(item) for item in data)
+    if isinstance(data, dict):
+        return sum(len(value) for value in data.values()
+                   if isinstance(value, pd.DataFrame))
+    return 0
+
+
+def _get_rss_peak_mb():
+    """Gets the RSS high-water mark of the process.
+
+    The mark is got through the `resource` module when available
+    and otherwise through the `psutil` package when installed.
+
+    Returns:
+        (float): The RSS high-water mark in MB or None if not available.
+    """
+    if RESOURCE_STATUS:
+        rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform!="darwin":
+            rss_peak *= 1024
+    elif PSUTIL_STATUS:
+        memory_info = psutil.Process().memory_info()
+        rss_peak = getattr(memory_info, 'peak_wset', memory_info.rss)
+    else:
+        return None
+    return round(rss_peak / 2**20, 1)
+
+
+def _get_current_record():
+    """Gets the record of the innermost stage run in the current thread.
+
+    Returns:
+        (dict): The stage record or None if no stage is run.
+    """
+    stack = getattr(_STAGES_STACK, 'stages', None)
+    if not stack:
+        return None
+    return stack[-1]
+
+
+def record_frame(frame_name, df, copy_status=False):
+    """Records the memory footprint of a dataframe in the record
+    of the current stage when the memory mode is on.
+
+    Args:
+        frame_name (str): The name of the dataframe.
+        df (dataframe): The dataframe.
+        copy_status (bool): Status of the dataframe as a copy \
+        of another one (default=False).
+    """
+    if not _get_instrument_param('memory'):
+        return
+    record = _get_current_record()
+    if record is None or 'memory' not in record:
+        return
+    frame_dict = {'name': frame_name,
+                  'rows': len(df),
+                  'mb'  : round(df.memory_usage(index=True, deep=True).sum() / 2**20, 3),
+                  'copy': copy_status,
+                 }
+    record['memory']['frames'].append(frame_dict)
+
+
+def _set_frames_items(name, data):
+    """Sets the dataframes of data with their names.
+
+    Args:
+        name (str): The name of the data.
+        data (any): A dataframe, or a tuple, list or dict of dataframes; \
+        the other objects are ignored.
+    Returns:
+        (list): The tuples (name (str), dataframe).
+    """
+    if isinstance(data, pd.DataFrame):
+        return [(name, data)]
+    if isinstance(data, (tuple, list)):
+        return sum([_set_frames_items(f"{name}[{idx}]", item)
+                    for idx, item in enumerate(data)], [])
+    if isinstance(data, dict):
+        return [(f"{name}[{key}]", value) for key, value in data.items()
+                if isinstance(value, pd.DataFrame)]
+    return []
+
+
+def _start_memory_tracking(record, parent_record):
+    """Starts the memory tracking of a stage.
+
+    The tracemalloc peak is reset for the stage after being kept
+    for the enclosing stage. The peak is not reset while stages
+    are tracked in other threads; the peak of the stages run
+    concurrently is then an upper bound.
+
+    Args:
+        record (dict): The record of the stage.
+        parent_record (dict): The record of the enclosing stage or None.
+    Returns:
+        (bool): Status of the start of the tracemalloc tracing by the stage.
+    """
+    thread_id = threading.get_ident()
+    with _LOG_LOCK:
+        start_status = not tracemalloc.is_tracing()
+        if start_status:
+            tracemalloc.start()
+        if parent_record and 'memory' in parent_record:
+            parent_peak = tracemalloc.get_traced_memory()[1]
+            parent_record['_traced_peak'] = max(parent_record['_traced_peak'], parent_peak)
+        if not [key for key, value in _MEMORY_THREADS.items() if value and key!=thread_id]:
+            tracemalloc.reset_peak()
+        _MEMORY_THREADS[thread_id] = _MEMORY_THREADS.get(thread_id, 0) + 1
+    record['memory'] = {'traced_peak_mb': None,
+                        'rss_peak_mb'   : None,
+                        'frames'        : []}
+    record['_traced_peak'] = 0
+    return start_status
+
+
+def _stop_memory_tracking(record, parent_record, start_status):
+    """Stops the memory tracking of a stage.
+
+    Args:
+        record (dict): The record of the stage.
+        parent_record (dict): The record of the enclosing stage or None.
+        start_status (bool): Status of the start of the tracemalloc \
+        tracing by the stage.
+    """
+    thread_id = threading.get_ident()
+    with _LOG_LOCK:
+        traced_peak = max(record.pop('_traced_peak'), tracemalloc.get_traced_memory()[1])
+        record['memory']['traced_peak_mb'] = round(traced_peak / 2**20, 3)
+        record['memory']['rss_peak_mb'] = _get_rss_peak_mb()
+        if parent_record and 'memory' in parent_record:
+            parent_record['_traced_peak'] = max(parent_record['_traced_peak'], traced_peak)
+        _MEMORY_THREADS[thread_id] -= 1
+        if not [key for key, value in _MEMORY_THREADS.items() if value and key!=thread_id]:
+            tracemalloc.reset_peak()
+        if start_status:
+            tracemalloc.stop()
+
+
+def _set_profile_path(wf_path, corpus_year, stage_name):
+    """Sets the full path to the cProfile dump of a stage.
+
+    Args:
+        wf_path (path): The full path to the working folder or None.
+        corpus_year (str): 4 digits year of the corpus or None.
+        stage_name (str): The name of the stage.
+    Returns:
+        (path): The full path to the cProfile dump.
+    """
+    if wf_path is not None and corpus_year is not None:
+        profiles_path = Path(wf_path) / Path(corpus_year) / Path(cm_cg.CM_ARCHI['profiles_folder'])
+    else:
+        profiles_path = Path(tempfile.gettempdir()) / Path(cm_cg.CM_ARCHI['profiles_folder'])
+    os.makedirs(profiles_path, exist_ok=True)
+    dump_name = f"{stage_name}_{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.prof"
+    return profiles_path / Path(dump_name)
+
+
+@contextmanager
+def stage_record(stage_name, wf_path=None, corpus_year=None, rows_in=None,
+                 out_folders=None):
+    """Records the metrics of a stage run in the context.
+
+    The stage record is yielded so that the number of rows out may be
+    set by the context through its 'rows_out' key. The working folder
+    and the corpus year are got from the enclosing stage when not given.
+
+    The files states of the output folders are only set for the
+    outermost stage; the 'bytes_written' key of the nested stages
+    is None. The records of the nested stages are buffered and saved
+    with the record of the outermost stage, grouped by corpus year.
+
+    Args:
+        stage_name (str): The name of the stage.
+        wf_path (path): Optional full path to the working folder (default=None).
+        corpus_year (str): Optional 4 digits year of the corpus (default=None).
+        rows_in (int): Optional number of rows in (default=None).
+        out_folders (list): Optional full paths (path) to the folders \
+        where the stage writes; if None, the corpus-year folder is used \
+        (default=None).
+    Yields:
+        (dict): The stage record.
+    """
+    stack = getattr(_STAGES_STACK, 'stages', None)
+    if stack is None:
+        stack = _STAGES_STACK.stages = []
+    parent_record, parent_stage = None, None
+    if stack:
+        # Getting the working folder and the corpus year of the enclosing stage
+        parent_record = stack[-1]
+        parent_stage = parent_record['stage']
+        if corpus_year is None:
+            wf_path, corpus_year = parent_record['_wf_path'], parent_record['corpus_year']
+    if out_folders is None:
+        out_folders = []
+        if wf_path is not None and corpus_year is not None:
+            out_folders = [Path(wf_path) / Path(corpus_year)]
+
+    record = {'run_id'       : _RUN_ID,
+              'stage'        : stage_name,
+              'parent'       : parent_stage,
+              'corpus_year'  : corpus_year,
+              'start'        : datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+              'wall_s'       : None,
+              'cpu_s'        : None,
+              'rows_in'      : rows_in,
+              'rows_out'     : None,
+              'bytes_written': None,
+              'status'       : "ok",
+              'profile'      : None,
+              '_wf_path'     : wf_path,
+             }
+    stack.append(record)
+
+    memory_status = _get_instrument_param('memory')
+    if memory_status:
+        tracing_status = _start_memory_tracking(record, parent_record)
+
+    profiler = None
+    if not parent_record and _get_instrument_param('profile'):
+        profiler = cProfile.Profile()
+    if not parent_record:
+        init_states_dict = _set_files_states(out_folders)
+    start_wall = time.perf_counter()
+    start_cpu = time.thread_time()
+    if profiler:
+        profiler.enable()
+    try:
+        yield record
+    except StageCancelledError:
+        record['status'] = "cancelled"
+        raise
+    except BaseException as err:
+        record['status'] = f"error: {type(err).__name__}"
+        raise
+    finally:
+        if profiler:
+            profiler.disable()
+        record['wall_s'] = round(time.perf_counter() - start_wall, 4)
+        record['cpu_s'] = round(time.thread_time() - start_cpu, 4)
+        if not parent_record:
+            end_states_dict = _set_files_states(out_folders)
+            record['bytes_written'] = sum(state[1] for file_path, state
+                                          in end_states_dict.items()
+                                          if init_states_dict.get(file_path)!=state)
+        if profiler:
+            profile_path = _set_profile_path(wf_path, corpus_year, stage_name)
+            profiler.dump_stats(profile_path)
+            record['profile'] = str(profile_path)
+        if memory_status:
+            _stop_memory_tracking(record, parent_record, tracing_status)
+        stack.pop()
+        if _get_instrument_param('run_log'):
+            _flush_records(record, parent_record)
+        else:
+            _ = record.pop('_wf_path')
+
+
+def instrument_stage(stage_name=None, out_folders=None):
+    """Decorates a stage function for recording its metrics
+    through the `stage_record` context manager.
+
+    The working folder and the corpus year are got from the arguments
+    named 'wf_path' or 'cm_files_path' and 'corpus_year' of the function.
+    The rows in are counted in the dataframes passed as arguments
+    and the rows out in the dataframes returned by the function.
+
+    Args:
+        stage_name (str): Optional name of the stage; if None, \
+        the function name is used (default=None).
+        out_folders (function): Optional function returning the full paths \
+        (path) to the folders where the stage writes from the dict \
+        of the arguments of the stage function (default=None).
+    Returns:
+        (function): The decorator.
+    """
+    def decorator(funct):
+        funct_signature = inspect.signature(funct)
+        name = stage_name if stage_name else funct.__name__.strip("_")
+
+        @functools.wraps(funct)
+        def wrapper(*args, **kwargs):
+            args_dict = funct_signature.bind_partial(*args, **kwargs).arguments
+            wf_path = args_dict.get('wf_path', args_dict.get('cm_files_path'))
+            corpus_year = args_dict.get('corpus_year')
+            if corpus_year is not None:
+                corpus_year = str(corpus_year)
+            folders_list = out_folders(args_dict) if out_folders else None
+            rows_in = sum(_count_rows(value) for value in args_dict.values()
+                          if not isinstance(value, dict))
+            with stage_record(name, wf_path=wf_path, corpus_year=corpus_year,
+                              rows_in=rows_in, out_folders=folders_list) as record:
+                if 'memory' in record:
+                    for arg_name, value in args_dict.items():
+                        for frame_name, df in _set_frames_items(arg_name, value):
+                            record_frame(frame_name + " (in)", df)
+                result = funct(*args, **kwargs)
+                record['rows_out'] = _count_rows(result)
+                if 'memory' in record:
+                    for frame_name, df in _set_frames_items("result", result):
+                        record_frame(frame_name + " (out)", df)
+            return result
+        return wrapper
+    return decorator
+
+
+def build_memory_report(wf_path, corpus_year, run_id=None):
+    """Builds the memory report of a run from the run log of a corpus year.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        run_id (str): Optional ID of the run; if None, the last run \
+        with memory metrics is used (default=None).
+    Returns:
+        (tup): (The stages (dataframe) sorted by decreasing tracemalloc peak, \
+        the dataframes (dataframe) sorted by decreasing memory footprint).
+    """
+    records_list = [record for record in read_run_log(wf_path, corpus_year)
+                    if record.get('memory')]
+    if records_list and run_id is None:
+        run_id = records_list[-1]['run_id']
+    records_list = [record for record in records_list if record['run_id']==run_id]
+
+    stages_data = [[record['stage'], record['parent'], record['wall_s'],
+                    record['memory']['traced_peak_mb'], record['memory']['rss_peak_mb']]
+                   for record in records_list]
+    stages_df = pd.DataFrame(stages_data, columns=["Stage", "Parent", "Wall (s)",
+                                                   "Traced peak (MB)", "RSS peak (MB)"])
+    stages_df = stages_df.sort_values(by="Traced peak (MB)", ascending=False,
+                                      kind="stable").reset_index(drop=True)
+
+    frames_data = [[record['stage'], frame['name'], frame['rows'], frame['mb'], frame['copy']]
+                   for record in records_list for frame in record['memory']['frames']]
+    frames_df = pd.DataFrame(frames_data, columns=["Stage", "Frame", "Rows",
+                                                   "Size (MB)", "Copy"])
+    frames_df = frames_df.sort_values(by="Size (MB)", ascending=False,
+                                      kind="stable").reset_index(drop=True)
+    return stages_df, frames_df
+
+
+def save_memory_report(wf_path, corpus_year, run_id=None):
+    """Saves the memory report of a run, built through
+    the `build_memory_report` function, in the corpus-year folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_year (str): 4 digits year of the corpus.
+        run_id (str): Optional ID of the run; if None, the last run \
+        with memory metrics is used (default=None).
+    Returns:
+        (str): End message.
+    """
+    stages_df, frames_df = build_memory_report(wf_path, corpus_year, run_id=run_id)
+    report_path = Path(wf_path) / Path(corpus_year) / Path(cm_cg.CM_ARCHI['memory_report_file'])
+    with pd.ExcelWriter(report_path,  # https://github.com/PyCQA/pylint/issues/3060 pylint: disable=abstract-class-instantiated
+                        ) as writer:
+        stages_df.to_excel(writer, sheet_name="Etapes", index=False)
+        frames_df.to_excel(writer, sheet_name="Dataframes", index=False)
+    copies_mb = frames_df.loc[frames_df["Copy"], "Size (MB)"].sum()
+    message = (f"\nMemory report of {len(stages_df)} stages saved in file: "
+               f"\n  {report_path}"
+               f"\n  largest tracemalloc peak: {stages_df['Traced peak (MB)'].max()} MB"
+               f"\n  memory of the copies    : {round(copies_mb, 3)} MB")
+    return message
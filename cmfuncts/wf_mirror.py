@@ -0,0 +1,332 @@
+"""Module of functions for running the treatments on a local mirror
+of the working folder located on a network share.
+
+The inputs of the corpus years are copied from the network working
+folder into a local cache folder, the treatments read and write the
+local copies and the changed outputs are synchronized back in bulk
+at the end. The mirrored items are, relatively to the root folder
+of the working folder:
+
+- the folder of the configuration files of the Institutes;
+- the folder of the employees data;
+- the folder of the orphan treatment (spelling corrections and \
+external PhD students);
+- the registry of the hash IDs;
+- the store of the contributions;
+- the folders of the corpus years.
+
+The state of each mirrored file at the last synchronization, that is
+the modification time and size of both copies and the hash of the
+content, is kept in a json file of the local cache folder. A file
+changed on the network share since the last synchronization and with
+a content different from the local copy is a conflict: it is neither
+overwritten by the pull nor by the push, unless forced.
+The files deleted from the local mirror are not deleted from the share.
+
+"""
+
+__all__ = ['pull_mirror',
+           'push_mirror',
+           'set_mirror_root',
+          ]
+
+
+# Standard Library imports
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+import cmfuncts.institute_globals as cm_ig
+from cmfuncts.stage_cache import set_file_fingerprint
+
+
+def set_mirror_root(wf_path, cache_root=None):
+    """Sets the full path to the local root folder mirroring
+    the root folder of a working folder.
+
+    The name of the local root folder combines the name of the mirrored
+    root folder and a hash of its full path so that the mirrors of
+    several working folders do not mix.
+
+    Args:
+        wf_path (path): The full path to the network working folder.
+        cache_root (path): Optional full path to the local cache folder; \
+        if None, the folder named by the 'cache_folder' key of the \
+        'MIRROR_PARAMS' global in the home folder is used (default=None).
+    Returns:
+        (path): The full path to the local root folder.
+    """
+    wf_root_path = Path(wf_path).parent
+    if cache_root is None:
+        cache_root = Path.home() / Path(cm_cg.MIRROR_PARAMS['cache_folder'])
+    path_hash = hashlib.sha256(str(wf_root_path.resolve()).encode('utf-8')).hexdigest()
+    return Path(cache_root) / Path(f"{wf_root_path.name}-{path_hash[:8]}")
+
+
+def _set_mirror_items(wf_path, corpus_years):
+    """Sets the items to mirror relatively to the root folder
+    of the working folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+    Returns:
+        (list): The relative paths (path) of the items.
+    """
+    wf_name = Path(wf_path).name
+    items_list = [Path(cm_ig.CONFIG_FOLDER),
+                  Path(cm_eg.EMPLOYEES_ARCHI["root"])
+                  / Path(cm_eg.EMPLOYEES_ARCHI["all_years_employees"]),
+                  Path(wf_name) / Path(cm_cg.ORPHAN_ARCHI["root"]),
+                  Path(wf_name) / Path(cm_cg.CM_ARCHI['hash_registry_file']),
+                  Path(wf_name) / Path(cm_cg.CM_ARCHI['conf_store_file'])]
+    items_list += [Path(wf_name) / Path(corpus_year) for corpus_year in corpus_years]
+    return items_list
+
+
+def _list_items_files(root_path, items_list):
+    """Lists the files of the items under a root folder.
+
+    Args:
+        root_path (path): The full path to the root folder.
+        items_list (list): The relative paths (path) of the items.
+    Returns:
+        (dict): The full paths (path) to the files keyed by their path \
+        (str) relative to the root folder in posix format.
+    """
+    tmp_suffix = cm_cg.MIRROR_PARAMS['tmp_suffix']
+    files_dict = {}
+    for item in items_list:
+        item_path = root_path / item
+        if item_path.is_file():
+            files_dict[item.as_posix()] = item_path
+        elif item_path.is_dir():
+            for file_path in item_path.rglob("*"):
+                if file_path.is_file() and not file_path.name.endswith(tmp_suffix):
+                    files_dict[file_path.relative_to(root_path).as_posix()] = file_path
+    return files_dict
+
+
+def _copy_folders(source_root, target_root, items_list):
+    """Creates under a target root folder the missing folders
+    of the items under a source root folder, including the empty ones.
+
+    Args:
+        source_root (path): The full path to the source root folder.
+        target_root (path): The full path to the target root folder.
+        items_list (list): The relative paths (path) of the items.
+    """
+    for item in items_list:
+        item_path = source_root / item
+        if item_path.is_dir():
+            (target_root / item).mkdir(parents=True, exist_ok=True)
+            for folder_path in item_path.rglob("*"):
+                if folder_path.is_dir():
+                    (target_root / folder_path.relative_to(source_root)).mkdir(parents=True,
+                                                                               exist_ok=True)
+
+
+def _set_file_state(file_path):
+    """Sets the state of a file as its modification time and size.
+
+    Args:
+        file_path (path): The full path to the file.
+    Returns:
+        (list): [modification time in ns (int), size in bytes (int)] \
+        or None if the file does not exist.
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+    return [file_stat.st_mtime_ns, file_stat.st_size]
+
+
+def _read_mirror_state(local_root):
+    """Reads the states of the mirrored files at the last synchronization.
+
+    Args:
+        local_root (path): The full path to the local root folder.
+    Returns:
+        (dict): The states (dict) keyed by relative file path (str).
+    """
+    state_path = local_root / Path(cm_cg.CM_ARCHI['mirror_state_file'])
+    if not state_path.is_file():
+        return {}
+    with open(state_path, encoding='utf-8') as state_file:
+        return json.load(state_file)
+
+
+def _save_mirror_state(local_root, state_dict):
+    """Saves the states of the mirrored files.
+
+    Args:
+        local_root (path): The full path to the local root folder.
+        state_dict (dict): The states (dict) keyed by relative file path (str).
+    """
+    state_path = local_root / Path(cm_cg.CM_ARCHI['mirror_state_file'])
+    tmp_path = state_path.with_name(state_path.name + cm_cg.MIRROR_PARAMS['tmp_suffix'])
+    with open(tmp_path, 'w', encoding='utf-8') as state_file:
+        json.dump(state_dict, state_file, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, state_path)
+
+
+def _copy_file(source_path, target_path):
+    """Copies a file with its modification time through a temporary
+    file renamed at the end so that no partial copy is left.
+
+    Args:
+        source_path (path): The full path to the copied file.
+        target_path (path): The full path to the copy.
+    """
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = target_path.with_name(target_path.name + cm_cg.MIRROR_PARAMS['tmp_suffix'])
+    shutil.copy2(source_path, tmp_path)
+    os.replace(tmp_path, target_path)
+
+
+def _set_synced_state(remote_path, local_path):
+    """Sets the state of a file just synchronized.
+
+    Args:
+        remote_path (path): The full path to the network copy.
+        local_path (path): The full path to the local copy.
+    Returns:
+        (dict): The state with the 'remote' and 'local' file states \
+        and the 'hash' of the content.
+    """
+    return {'remote': _set_file_state(remote_path),
+            'local' : _set_file_state(local_path),
+            'hash'  : set_file_fingerprint(local_path)}
+
+
+def pull_mirror(wf_path, corpus_years, cache_root=None, force=False):
+    """Copies the mirrored items of the network working folder
+    into the local mirror.
+
+    Only the files changed on the network share since the last
+    synchronization are copied. The local files changed since the
+    last synchronization, and not yet pushed, are kept; they are
+    reported as conflicts if their network copy also changed with
+    a different content, unless 'force' is True. The local files
+    deleted from the network share are deleted if unchanged.
+
+    Args:
+        wf_path (path): The full path to the network working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        cache_root (path): Optional full path to the local cache folder \
+        (default=None).
+        force (bool): Optional status for overwriting the local changes \
+        (default=False).
+    Returns:
+        (tup): (The full path (path) to the local working folder, \
+        the relative paths (list) of the conflicting files).
+    """
+    wf_path = Path(wf_path)
+    remote_root = wf_path.parent
+    local_root = set_mirror_root(wf_path, cache_root)
+    local_root.mkdir(parents=True, exist_ok=True)
+    items_list = _set_mirror_items(wf_path, corpus_years)
+    state_dict = _read_mirror_state(local_root)
+
+    _copy_folders(remote_root, local_root, items_list)
+    remote_files_dict = _list_items_files(remote_root, items_list)
+    local_files_dict = _list_items_files(local_root, items_list)
+    copied_nb, conflicts_list = 0, []
+    for rel_path, remote_path in remote_files_dict.items():
+        local_path = local_root / Path(rel_path)
+        base_dict = state_dict.get(rel_path)
+        local_state = _set_file_state(local_path)
+        if local_state:
+            remote_status, local_status = True, True
+            if base_dict:
+                remote_status = _set_file_state(remote_path)!=base_dict['remote']
+                local_status = local_state!=base_dict['local'] \
+                               and set_file_fingerprint(local_path)!=base_dict['hash']
+            if not remote_status:
+                continue
+            if local_status and not force:
+                if set_file_fingerprint(local_path)!=set_file_fingerprint(remote_path):
+                    conflicts_list.append(rel_path)
+                else:
+                    state_dict[rel_path] = _set_synced_state(remote_path, local_path)
+                continue
+        _copy_file(remote_path, local_path)
+        state_dict[rel_path] = _set_synced_state(remote_path, local_path)
+        copied_nb += 1
+
+    for rel_path, local_path in local_files_dict.items():
+        base_dict = state_dict.get(rel_path)
+        if rel_path not in remote_files_dict and base_dict \
+           and _set_file_state(local_path)==base_dict['local']:
+            os.remove(local_path)
+            del state_dict[rel_path]
+
+    _save_mirror_state(local_root, state_dict)
+    print(f"\nMirror pulled: {copied_nb} files copied into {local_root}")
+    return local_root / Path(wf_path.name), conflicts_list
+
+
+def push_mirror(wf_path, corpus_years, cache_root=None, force=False):
+    """Copies back the changed files of the local mirror
+    to the network working folder.
+
+    A local file is pushed if its content changed since the last
+    synchronization. It is reported as conflict and not pushed if the
+    network copy changed since the last synchronization with a content
+    different from the local one, unless 'force' is True.
+
+    Args:
+        wf_path (path): The full path to the network working folder.
+        corpus_years (list): The 4 digits years (str) of the corpuses.
+        cache_root (path): Optional full path to the local cache folder \
+        (default=None).
+        force (bool): Optional status for overwriting the network changes \
+        (default=False).
+    Returns:
+        (tup): (The relative paths (list) of the pushed files, \
+        the relative paths (list) of the conflicting files).
+    """
+    wf_path = Path(wf_path)
+    remote_root = wf_path.parent
+    local_root = set_mirror_root(wf_path, cache_root)
+    items_list = _set_mirror_items(wf_path, corpus_years)
+    state_dict = _read_mirror_state(local_root)
+
+    _copy_folders(local_root, remote_root, items_list)
+    pushed_list, conflicts_list = [], []
+    for rel_path, local_path in _list_items_files(local_root, items_list).items():
+        remote_path = remote_root / Path(rel_path)
+        base_dict = state_dict.get(rel_path)
+        local_state = _set_file_state(local_path)
+        if base_dict and local_state==base_dict['local']:
+            continue
+        local_hash = set_file_fingerprint(local_path)
+        if base_dict and local_hash==base_dict['hash']:
+            base_dict['local'] = local_state
+            continue
+
+        remote_state = _set_file_state(remote_path)
+        remote_status = remote_state is not None
+        if base_dict:
+            remote_status = remote_state!=base_dict['remote']
+        if remote_status and not force:
+            if set_file_fingerprint(remote_path)!=local_hash:
+                conflicts_list.append(rel_path)
+                continue
+        else:
+            _copy_file(local_path, remote_path)
+            pushed_list.append(rel_path)
+        state_dict[rel_path] = _set_synced_state(remote_path, local_path)
+
+    _save_mirror_state(local_root, state_dict)
+    print(f"\nMirror pushed: {len(pushed_list)} files copied back into {remote_root}")
+    if conflicts_list:
+        print(f"    {len(conflicts_list)} files in conflict not copied back: "
+              f"{', '.join(conflicts_list)}")
+    return pushed_list, conflicts_list
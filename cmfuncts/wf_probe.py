@@ -0,0 +1,164 @@
+"""Module of functions for probing the access to the working folders
+and discovering their corpus years without blocking the caller.
+
+The probe of a working folder is run in a daemon thread, so that a slow
+or unreachable network share never blocks the GUI main loop, and its
+result is cached for the session keyed by the working-folder path.
+A probe not answered within the timeout is reported as such while its
+thread keeps running; its result is cached when the share answers.
+
+"""
+
+__all__ = ['get_wf_probe',
+           'start_wf_probe',
+           'wait_wf_probe',
+          ]
+
+
+# Standard Library imports
+import os
+import threading
+import time
+
+# Local imports
+import cmfuncts.institute_globals as cm_ig
+
+
+_WF_PROBES = {}
+_PROBES_LOCK = threading.Lock()
+
+
+def _run_wf_probe(wf_path, record, years_funct):
+    """Checks the access to a working folder and, if authorized,
+    gets its corpus years.
+
+    The access errors, including the permission ones, are recorded
+    in the probe record; any other error is raised in the probe thread
+    once the probe is recorded as done.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        record (dict): The probe record to update.
+        years_funct (function): Function returning the list of the corpus \
+        years (str) for the working folder or None.
+    """
+    access_status, years_list, error = None, None, None
+    try:
+        access_status = os.access(wf_path, os.F_OK | os.R_OK | os.W_OK)
+        with _PROBES_LOCK:
+            record['access'] = access_status
+        if access_status and years_funct:
+            years_list = years_funct(wf_path)
+    except OSError as err:
+        error = str(err)
+    finally:
+        with _PROBES_LOCK:
+            record['access'] = access_status
+            record['years'] = years_list
+            record['error'] = error
+            record['done'] = True
+            record['end'] = time.monotonic()
+
+
+def start_wf_probe(wf_path, years_funct=None, refresh=False):
+    """Starts the probe of a working folder in a daemon thread
+    unless its result is cached.
+
+    A new probe is not started while the previous probe of the
+    same path is running, even if 'refresh' is True. A cached probe
+    is run again if it failed or if the corpus years are required
+    but have not been got.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        years_funct (function): Optional function returning the list \
+        of the corpus years (str) for the working folder (default=None).
+        refresh (bool): Optional status for probing again a working \
+        folder with a cached result (default=False).
+    """
+    key = str(wf_path)
+    with _PROBES_LOCK:
+        record = _WF_PROBES.get(key)
+        if record:
+            years_status = not years_funct or not record['access'] \
+                           or record['years'] is not None
+            if not record['done'] or (years_status and not refresh
+                                      and not record['error']):
+                return
+        record = {'access': None,
+                  'years' : None,
+                  'error' : None,
+                  'done'  : False,
+                  'start' : time.monotonic(),
+                  'end'   : None,
+                 }
+        _WF_PROBES[key] = record
+    probe_thread = threading.Thread(target=_run_wf_probe,
+                                    args=(wf_path, record, years_funct),
+                                    daemon=True)
+    probe_thread.start()
+
+
+def get_wf_probe(wf_path, timeout=None):
+    """Gets the current state of the probe of a working folder.
+
+    The 'status' key of the returned dict is valued as follows:
+
+    - 'pending': the probe is running within the timeout;
+    - 'timeout': the probe is running beyond the timeout;
+    - 'ok': the access to the working folder is authorized;
+    - 'denied': the working folder is missing or its access is not authorized;
+    - 'error': the probe failed;
+    - 'unknown': no probe has been started for the working folder.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        timeout (float): Optional timeout in seconds; if None, \
+        the 'WF_PROBE_TIMEOUT_S' global is used (default=None).
+    Returns:
+        (dict): Copy of the probe record with the access status (bool), \
+        the corpus years (list) and the probe status (str).
+    """
+    if timeout is None:
+        timeout = cm_ig.WF_PROBE_TIMEOUT_S
+    with _PROBES_LOCK:
+        record = _WF_PROBES.get(str(wf_path))
+        if record is None:
+            return {'access': None, 'years': None, 'error': None, 'status': "unknown"}
+        probe_dict = dict(record)
+
+    if probe_dict['error']:
+        status = "error"
+    elif probe_dict['access'] is False:
+        status = "denied"
+    elif probe_dict['done']:
+        status = "ok"
+    elif time.monotonic() - probe_dict['start']>timeout:
+        status = "timeout"
+    else:
+        status = "pending"
+    probe_dict['status'] = status
+    return probe_dict
+
+
+def wait_wf_probe(wf_path, years_funct=None, timeout=None, poll_interval=0.05):
+    """Probes a working folder and waits for the result
+    within the timeout.
+
+    Args:
+        wf_path (path): The full path to the working folder.
+        years_funct (function): Optional function returning the list \
+        of the corpus years (str) for the working folder (default=None).
+        timeout (float): Optional timeout in seconds; if None, \
+        the 'WF_PROBE_TIMEOUT_S' global is used (default=None).
+        poll_interval (float): Optional interval in seconds between \
+        two checks of the probe state (default=0.05).
+    Returns:
+        (dict): The probe state got through the `get_wf_probe` function.
+    """
+    start_wf_probe(wf_path, years_funct=years_funct)
+    while True:
+        probe_dict = get_wf_probe(wf_path, timeout=timeout)
+        if probe_dict['status']!="pending":
+            return probe_dict
+        time.sleep(poll_interval)
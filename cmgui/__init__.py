@@ -1,7 +1,53 @@
+""" `__init__` module of `cmgui` package.
+
+The public names of the submodules are loaded lazily (PEP 562) so that
+the main window is displayed before the treatment modules are imported.
+"""
+
 __version__ = '0.0.0'
 __author__  = 'BiblioMeter team'
 __license__ = 'MIT'
 
-from cmgui.cm_gui_globals import *
-from cmgui.main_page import *
-from cmgui.build_conf_page import *
+
+# Standard Library imports
+import importlib
+
+# Submodules in order of the search of the public names
+SUBMODULES_LIST = ['cm_gui_globals',
+                   'main_page',
+                   'build_conf_page',
+                  ]
+
+
+def __getattr__(name):
+    """Gets a public name from the first submodule of the 'SUBMODULES_LIST'
+    global that exports it and caches it in the package namespace.
+
+    Args:
+        name (str): The public name or "__all__" for the list \
+        of the public names of all the submodules.
+    Returns:
+        The object bound to the name.
+    """
+    if name=="__all__":
+        all_list = []
+        for submodule in SUBMODULES_LIST:
+            all_list += list(importlib.import_module(f"{__name__}.{submodule}").__all__)
+        globals()["__all__"] = all_list
+        return all_list
+    if name.startswith("__"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    for submodule in SUBMODULES_LIST:
+        module = importlib.import_module(f"{__name__}.{submodule}")
+        if name in module.__all__:
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """Lists the names of the package namespace and the public names
+    of the submodules.
+    """
+    return sorted(set(globals()) | set(__getattr__("__all__")))
@@ -9,6 +9,7 @@ __all__ = ['build_conf_list']
 import os
 import threading
 import tkinter as tk
+import traceback
 from functools import partial
 from pathlib import Path
 from tkinter import font as tkFont
@@ -34,16 +35,38 @@ from cmfuncts.build_employees import adapt_search_depth
 from cmfuncts.build_employees import read_hal_employees_data
 from cmfuncts.build_employees import set_empl_paths
 from cmfuncts.build_employees import update_hal_employees_data
-from cmfuncts.conf_extract import read_conf_extract
+from cmfuncts.cancellation import CancelToken
+from cmfuncts.cancellation import StageCancelledError
 from cmfuncts.conf_extract import set_extract_paths
 from cmfuncts.conf_extract import set_hal_to_conf
 from cmfuncts.consolidate_conf_list import build_final_conf_list
 from cmfuncts.consolidate_conf_list import set_results_paths
 from cmfuncts.merge_conf_employees import recursive_year_search
-from cmfuncts.merge_conf_employees import set_merge_paths
+from cmfuncts.merge_incremental import incremental_year_search
+from cmfuncts.merge_stage import set_merge_paths
+from cmfuncts.progress_channel import ProgressChannel
+from cmfuncts.session_cache import get_session_data
+from cmfuncts.session_cache import set_session_data
 
 
-def _launch_update_hal_employees_try(wf_root_path, progress_callback):
+def _set_session_key(institute, wf_path, corpus_year, step):
+    """Sets the key of the data handed between the steps 
+    through the session cache.
+
+    Args:
+        institute (str): Institute name.
+        wf_path (path): Full path to working folder.
+        corpus_year (str): Corpus year defined by 4 digits \
+        or None for the data common to the corpus years.
+        step (str): The name of the step that produced the data.
+    Returns:
+        (tup): The key of the data.
+    """
+    return institute, str(wf_path), corpus_year, step
+
+
+def _launch_update_hal_employees_try(institute, wf_root_path, wf_path,
+                                     progress_callback, cancel_token=None):
     """Launches adaptation of Intitute employees data to HAL extractions.
 
     This is done through the `update_hal_employees_data` function imported from 
@@ -51,12 +74,22 @@ def _launch_update_hal_employees_try(wf_root_path, progress_callback):
     file of Institute's employees data. 
     The useful file names and paths are built through the `set_empl_paths` 
     function imported from `cmfuncts.build_employees` module.
+    The updated employees data are kept in the session cache through 
+    the `set_session_data` function imported from `cmfuncts.session_cache` 
+    module for the merge step.
 
     Args:
+        institute (str): Institute name.
         wf_root_path (path): The full path to the root folder where \
         the folder of Institute parameters is located.
+        wf_path (path): Full path to working folder.
         progress_callback (function): Function for updating \
         ProgressBar tkinter widget status.
+        cancel_token (CancelToken): Optional token set by the 'Annuler' \
+        button (default=None).
+    Returns:
+        (tup): (The update status (bool), the updated employees data \
+        keyed by year (dict)).
     """    
     # Setting files parameters of employees data
     paths_list, filenames_list = set_empl_paths(wf_root_path)
@@ -81,9 +114,12 @@ def _launch_update_hal_employees_try(wf_root_path, progress_callback):
                     "confirmez-vous la mise en conformité ?")
         answer_1 = messagebox.askokcancel(ask_title, ask_text)
         if answer_1:
-            return_tup = update_hal_employees_data(wf_root_path, progress_callback)
+            return_tup = update_hal_employees_data(wf_root_path, progress_callback,
+                                                   cancel_token=cancel_token)
             empl_update_status, hal_all_empl_dict = return_tup
             if empl_update_status:
+                set_session_data(_set_session_key(institute, wf_path, None, 'employees'),
+                                 hal_all_empl_dict, [hal_all_empl_path])
                 info_title = "- Information -"
                 info_text = ("La mise en conformité des effectifs a été effectuée."
                              f"\nLe fichier créé se nomme :\n\n   {hal_empl_file_name} "
@@ -133,11 +169,13 @@ def _launch_update_hal_employees_try(wf_root_path, progress_callback):
 
 
 def _launch_set_hal_to_conf_try(institute, wf_path,
-                                year_select, progress_callback):
+                                year_select, progress_callback, cancel_token=None):
     """Launches extraction of contributions to conferences from the HAL database.
 
     This is done through the `set_hal_to_conf` function imported from 
-    `cmfuncts.conf_extract` module.
+    `cmfuncts.conf_extract` module. The extracted data are kept in the 
+    session cache through the `set_session_data` function imported from 
+    `cmfuncts.session_cache` module for the merge step.
 
     Args:
         institute (str): Institute name.
@@ -145,6 +183,8 @@ def _launch_set_hal_to_conf_try(institute, wf_path,
         year_select (str): Corpus year defined by 4 digits.
         progress_callback (function): Function for updating ProgressBar tkinter \
         widget status. 
+        cancel_token (CancelToken): Optional token set by the 'Annuler' \
+        button (default=None).
     """
     # Setting files parameters of extracted data
     paths_list, filenames_list = set_extract_paths(wf_path, year_select)
@@ -159,7 +199,10 @@ def _launch_set_hal_to_conf_try(institute, wf_path,
                 "\n\nConfirmez-vous l'extraction ?")
     answer_1 = messagebox.askokcancel(ask_title, ask_text)
     if answer_1:
-        _ = set_hal_to_conf(institute, wf_path, year_select, progress_callback)
+        conf_df = set_hal_to_conf(institute, wf_path, year_select, progress_callback,
+                                  cancel_token=cancel_token)
+        set_session_data(_set_session_key(institute, wf_path, year_select, 'extract'),
+                         conf_df, [conf_file_path])
         end_message = f"\nExtraction of contributions to conferences performed for {year_select}"
         print('\n',end_message)
         info_title = "- Information -"
@@ -200,19 +243,29 @@ def _launch_recursive_year_search_try(institute,
                                       year_select,
                                       empl_update_status,
                                       hal_all_empl_dict,
-                                      progress_callback):
+                                      progress_callback,
+                                      cancel_token=None):
     """Launches merge of the list of contributions to conferences with 
     Institute employees for the selected year.
 
     This is done through the `recursive_year_search` function imported from 
     `cmfuncts.merge_conf_employees` module after:
 
-    - setting the extracted contributions to conferences through the \
-    `read_conf_extract` function imported from `cmfuncts.conf_extract` \
-    module.
-    - setting employees data if the existing dict is empty through the \
-    `read_hal_employees_data` function imported from the \
-    `cmfuncts.build_employees` module.
+    - getting the extracted contributions to conferences handed by the \
+    extraction step through the session cache; they are read from file \
+    by the merge when not available.
+    - setting employees data if the existing dict is empty, from the \
+    session cache or through the `read_hal_employees_data` function \
+    imported from the `cmfuncts.build_employees` module.
+
+    When an existing merge is rebuilt without update of the employees data, 
+    only the author rows touched by changes of the spelling corrections are 
+    recomputed through the `incremental_year_search` function imported from 
+    `cmfuncts.merge_incremental` module.
+
+    The employees data and the merged data are kept in the session cache 
+    through the `set_session_data` function imported from 
+    `cmfuncts.session_cache` module for the next steps.
 
     Args:
         institute (str): Institute name.
@@ -220,15 +273,25 @@ def _launch_recursive_year_search_try(institute,
         year_select (str): Corpus year defined by 4 digits.
         progress_callback (function): Function for updating ProgressBar \
         tkinter widget status. 
+        cancel_token (CancelToken): Optional token set by the 'Annuler' \
+        button (default=None).
     """
     # Internal function
-    def _recursive_year_search_try(progress_callback):
+    def _recursive_year_search_try(progress_callback, search_funct=recursive_year_search):
         _, empl_use_years = adapt_search_depth(year_select, hal_all_empl_dict)
         if empl_use_years:
-            _, _ = recursive_year_search(wf_root_path, wf_path, year_select,
-                                         employees_dict=hal_all_empl_dict,
-                                         years_to_search=empl_use_years,
-                                         progress_callback=progress_callback)
+            conf_df = get_session_data(_set_session_key(institute, wf_path,
+                                                        year_select, 'extract'))
+            if conf_df is None:
+                conf_df = pd.DataFrame()
+            _, valid_df = search_funct(wf_root_path, wf_path, year_select, conf_df=conf_df,
+                                       employees_dict=hal_all_empl_dict,
+                                       years_to_search=empl_use_years,
+                                       progress_callback=progress_callback,
+                                       cancel_token=cancel_token)
+            if not valid_df.empty:
+                set_session_data(_set_session_key(institute, wf_path, year_select, 'merged'),
+                                 valid_df, [valid_file_path])
             print("Merge of contributions to conferences with employees "
                   f"data performed for {year_select}")
             info_title = '- Information -'
@@ -263,9 +326,14 @@ def _launch_recursive_year_search_try(institute,
     # Setting dialogs and checking answers for ad-hoc use
     # of '_recursive_year_search_try' internal function
 
+    empl_key_tup = _set_session_key(institute, wf_path, None, 'employees')
+    if not hal_all_empl_dict:
+        hal_all_empl_dict = get_session_data(empl_key_tup)
     if not hal_all_empl_dict:
         print("\nReading employees data...")
         hal_all_empl_dict = read_hal_employees_data(wf_root_path)
+        empl_paths_list, _ = set_empl_paths(wf_root_path)
+        set_session_data(empl_key_tup, hal_all_empl_dict, [empl_paths_list[-1]])
     else:
         print("\nEmployees data already available as dict...")
     progress_callback(10)
@@ -293,7 +361,10 @@ def _launch_recursive_year_search_try(institute,
                         "\n\nReconstruire le croisement ?")
             answer_4 = messagebox.askokcancel(ask_title, ask_text)
             if answer_4:
-                _recursive_year_search_try(progress_callback)
+                search_funct = incremental_year_search
+                if empl_update_status:
+                    search_funct = recursive_year_search
+                _recursive_year_search_try(progress_callback, search_funct)
             else:
                 progress_callback(100)
                 info_title = "- Information -"
@@ -309,7 +380,7 @@ def _launch_recursive_year_search_try(institute,
 
 
 def _launch_conf_list_conso_try(institute, org_tup, wf_path,
-                                year_select, progress_callback):
+                                year_select, progress_callback, cancel_token=None):
     """Launches merge of publications list with Institute employees.
 
     This is done through the `recursive_year_search` function imported from 
@@ -319,6 +390,10 @@ def _launch_conf_list_conso_try(institute, org_tup, wf_path,
     - check of status of parsing step through `check_dedup_parsing_available` \
     function imported from `bmfuncts.useful_functs` module.
 
+    The merged data handed by the merge step through the session cache 
+    are got through the `get_session_data` function imported from 
+    `cmfuncts.session_cache` module, which avoids reading them back from file.
+
     Args:
         institute (str): Institute name.
         org_tup (tup): Contains Institute parameters.
@@ -326,10 +401,19 @@ def _launch_conf_list_conso_try(institute, org_tup, wf_path,
         year_select (str): Corpus year defined by 4 digits.
         progress_callback (function): Function for updating ProgressBar tkinter \
         widget status. 
+        cancel_token (CancelToken): Optional token set by the 'Annuler' \
+        button (default=None).
     """
     def _consolidate_conf_list(progress_callback):
+        merged_df = get_session_data(_set_session_key(institute, wf_path,
+                                                      year_select, 'merged'),
+                                     pop=True)
+        if merged_df is None:
+            merged_df = pd.DataFrame()
         return_tup = build_final_conf_list(wf_path, org_tup, year_select,
-                                           progress_callback=progress_callback)
+                                           merged_df=merged_df,
+                                           progress_callback=progress_callback,
+                                           cancel_token=cancel_token)
         _, split_ratio, conf_nb = return_tup
     
         end_message = ("Consolidation of contributions to conferences "
@@ -451,12 +535,80 @@ def build_conf_list(self, master, page_name, institute, wf_path):
                      dy=step_button_dy / 2)
         return step_launch_button
 
-    def _update_progress(value):
-        progress_var.set(value)
-        progress_bar.update_idletasks()
-        if value>=100:
+    def _show_end_status(step_num, event):
+        """Informs the user, from the main loop, of the end of a step 
+        cancelled or failed in the worker thread.
+        """
+        step_label = cm_gg.STEP_LABELS_LIST[step_num]
+        if event['status']=="cancelled":
+            info_title = "- Information -"
+            info_text = (f"Le traitement '{step_label}' a été annulé."
+                         "\n\nAucun fichier n'a été modifié par ce traitement.")
+            messagebox.showinfo(info_title, info_text)
+        elif event['status']=="failed":
+            error_title = "- Erreur -"
+            error_text = (f"Le traitement '{step_label}' a échoué."
+                          f"\n\n{event['message']}")
+            messagebox.showerror(error_title, error_text)
+
+    def _poll_progress(step_num, channel, worker):
+        """Updates the progress bar with the events of the progress channel 
+        from the main loop until the end of the worker thread and informs 
+        the user of the end status of the step posted by the worker thread.
+        """
+        for event in channel.drain():
+            progress_var.set(event['value'])
+            if event['value']>=100:
+                enable_buttons(build_conf_buttons_list)
+            if event['status']:
+                _show_end_status(step_num, event)
+        if worker.is_alive() or not channel.events.empty():
+            self.after(cm_gg.PROGRESS_POLL_MS, _poll_progress, step_num, channel, worker)
+        else:
+            progress_bar.place_forget()
+            cancel_button.place_forget()
             enable_buttons(build_conf_buttons_list)
 
+    def _cancel_step():
+        """Command of the 'cancel_button' button.
+        """
+        cancel_token.cancel()
+        cancel_button.config(state=tk.DISABLED)
+
+    def _run_worker(step_num, worker_funct, channel):
+        """Runs a step in the worker thread and posts on the progress 
+        channel the end status of the step when it has been cancelled, 
+        no file having been written, or when it has failed, the user 
+        being informed from the main loop through the `_poll_progress` 
+        internal function.
+        """
+        step_label = cm_gg.STEP_LABELS_LIST[step_num].split(' - ')[0]
+        try:
+            worker_funct(channel, cancel_token)
+        except StageCancelledError:
+            print(f"\n{step_label} cancelled")
+            channel.post_end("cancelled")
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Any error ending the worker thread is reported to the user
+            error_text = traceback.format_exc()
+            print(f"\n{step_label} failed\n{error_text}")
+            channel.post_end("failed", error_text)
+
+    def _start_worker(step_num, worker_funct):
+        """Starts a step in a worker thread that reports its progress 
+        through a progress channel and that can be cancelled through 
+        the 'cancel_button' button placed after the progress bar.
+        """
+        cancel_token.reset()
+        cancel_button.config(state=tk.NORMAL)
+        self.update_idletasks()
+        place_after(progress_bar, cancel_button, dx=cancel_button_dx, dy=0)
+        channel = ProgressChannel(stage=cm_gg.STEP_LABELS_LIST[step_num])
+        worker = threading.Thread(target=_run_worker,
+                                  args=(step_num, worker_funct, channel))
+        worker.start()
+        _poll_progress(step_num, channel, worker)
+
     # ********************* Function start
 
     # Setting useful local variables for positions modification
@@ -468,6 +620,7 @@ def build_conf_list(self, master, page_name, institute, wf_path):
     eff_help_font_size = font_size(bm_gg.REF_ETAPE_FONT_SIZE-2, master.width_sf_min)
     progress_bar_length_px = mm_to_px(100 * master.width_sf_mm, bm_gg.PPI)
     progress_bar_dx = 40
+    cancel_button_dx = 10
     step_label_pos_x = mm_to_px(bm_gg.REF_ETAPE_POS_X_MM * master.width_sf_mm,
                                 bm_gg.PPI)
     step_label_pos_y_list = [mm_to_px( y * master.height_sf_mm, bm_gg.PPI)
@@ -507,6 +660,16 @@ def build_conf_list(self, master, page_name, institute, wf_path):
                                    mode="determinate",
                                    variable=progress_var)
 
+    # Initializing cancel button widget placed after the progress bar
+    # when a step is running
+    cancel_token = CancelToken()
+    cancel_font = tkFont.Font(family=bm_gg.FONT_NAME,
+                              size=eff_help_font_size)
+    cancel_button = tk.Button(self,
+                              text=cm_gg.CANCEL_BUTTON,
+                              font=cancel_font,
+                              command=_cancel_step)
+
     # Setting step-label widgets parameters
     step_label_font = tkFont.Font(family=bm_gg.FONT_NAME,
                                    size=eff_step_font_size,
@@ -518,21 +681,24 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
 
     # *********************** STEP 0 : Mise en conformité des données des effectifs
-    def _launch_update_hal_employees_data(progress_callback):
+    def _launch_update_hal_employees_data(progress_callback, cancel_token):
         """Command of the 'empl_button' button.
         
         """
+        nonlocal empl_update_status, hal_all_empl_dict
+
         # Updating employees file
-        return_tup = _launch_update_hal_employees_try(wf_root_path, progress_callback)
+        return_tup = _launch_update_hal_employees_try(institute, wf_root_path, wf_path,
+                                                      progress_callback,
+                                                      cancel_token=cancel_token)
         empl_update_status, hal_all_empl_dict = return_tup
-        progress_bar.place_forget()
     
     def _start_launch_update_hal_employees_data():
         disable_buttons(build_conf_buttons_list)
         place_after(empl_button,
                     progress_bar, dx=progress_bar_dx, dy=0)
         progress_var.set(0)
-        threading.Thread(target=_launch_update_hal_employees_data, args=(_update_progress,)).start()
+        _start_worker(0, _launch_update_hal_employees_data)
 
     # Définition du bouton 'empl_button' et du bouton 'description'
     step_num = 0
@@ -568,7 +734,7 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
 
     # *********************** step 1 : Extraction des contributions à conférence de l'Institut
-    def _launch_set_hal_to_conf(progress_callback):
+    def _launch_set_hal_to_conf(progress_callback, cancel_token):
         """Command of the 'merge_button' button.        
         """
         # Getting year selection
@@ -576,15 +742,15 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
         # Trying launch of recursive search for authors in employees file
         _launch_set_hal_to_conf_try(institute, wf_path,
-                                    year_select, progress_callback)
-        progress_bar.place_forget()
+                                    year_select, progress_callback,
+                                    cancel_token=cancel_token)
 
     def _start_launch_set_hal_to_conf():
         disable_buttons(build_conf_buttons_list)
         place_after(extract_button,
                     progress_bar, dx=progress_bar_dx, dy=0)
         progress_var.set(0)
-        threading.Thread(target=_launch_set_hal_to_conf, args=(_update_progress,)).start()
+        _start_worker(1, _launch_set_hal_to_conf)
 
     ### Définition du bouton 'extract_button'
     step_num = 1
@@ -593,7 +759,7 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
 
     # *********************** step 3 : Croisement auteurs-effectifs
-    def _launch_recursive_year_search(progress_callback):
+    def _launch_recursive_year_search(progress_callback, cancel_token):
         """Command of the 'merge_button' button.
         """
         # Getting year selection
@@ -604,15 +770,15 @@ def build_conf_list(self, master, page_name, institute, wf_path):
                                           year_select,
                                           empl_update_status,
                                           hal_all_empl_dict,
-                                          progress_callback)
-        progress_bar.place_forget()
+                                          progress_callback,
+                                          cancel_token=cancel_token)
 
     def _start_launch_recursive_year_search():
         disable_buttons(build_conf_buttons_list)
         place_after(merge_button,
                     progress_bar, dx=progress_bar_dx, dy=0)
         progress_var.set(0)
-        threading.Thread(target=_launch_recursive_year_search, args=(_update_progress,)).start()
+        _start_worker(2, _launch_recursive_year_search)
 
     ### Définition du bouton 'merge_button'
     step_num = 2
@@ -621,7 +787,7 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
 
     # ****************** step 4 : Liste consolidée des contributions à conférence
-    def _launch_conf_list_conso(progress_callback):
+    def _launch_conf_list_conso(progress_callback, cancel_token):
         """Command of the 'conso_button' button.
         """
         # Renewing year selection and years
@@ -629,8 +795,8 @@ def build_conf_list(self, master, page_name, institute, wf_path):
 
         # Trying launch creation of consolidated publications lists
         _launch_conf_list_conso_try(institute, org_tup, wf_path,
-                                    year_select, progress_callback)
-        progress_bar.place_forget()
+                                    year_select, progress_callback,
+                                    cancel_token=cancel_token)
 
 
     def _start_launch_conf_list_conso():
@@ -638,7 +804,7 @@ def build_conf_list(self, master, page_name, institute, wf_path):
         place_after(conso_button,
                     progress_bar, dx=progress_bar_dx, dy=0)
         progress_var.set(0)
-        threading.Thread(target=_launch_conf_list_conso, args=(_update_progress,)).start()
+        _start_worker(3, _launch_conf_list_conso)
 
     ### Définition du bouton 'conso_button'
     step_num = 3
@@ -2,10 +2,14 @@
 
 __all__ = ['APP_COPYRIGHT',
            'APP_VERSION',
+           'CANCEL_BUTTON',
+           'CORPI_SEARCH_TXT',
            'HAL_DATATYPE',
            'HELP_BUTTON',
            'MAIN_PAGE_TITLE',
            'PAGES_LABELS',
+           'PRELOAD_MODULES_LIST',
+           'PROGRESS_POLL_MS',
            'REF_HELP_BUT_POS_X_MM',
            'REF_HELP_BUT_POS_Y_MM',
            'STEP_POS_Y_MM_REF_LIST',
@@ -15,6 +19,7 @@ __all__ = ['APP_COPYRIGHT',
            'STEP_LABELS_LIST',
            'STEP_LAUNCHS_LIST',
            'STEPS_NB',
+           'WF_PROBE_POLL_MS',
            ]
 
 
@@ -37,6 +42,12 @@ PAGES_LABELS = {'BuildConfPage' : "Consolidation annuelle des corpus",
 # Titre de la page
 MAIN_PAGE_TITLE = "- ConfMeter -\nInitialisation de l'analyse"
 
+# Text of the corpuses list while the working folder is probed
+CORPI_SEARCH_TXT = "Recherche en cours..."
+
+# Setting the period in ms of the check of the working-folder probe
+WF_PROBE_POLL_MS = 200
+
 # Copyright and contacts
 APP_COPYRIGHT  =   "Contributeurs et contacts :"
 APP_COPYRIGHT +=  "\n- Amal Chabli : amal.chabli@orange.fr"
@@ -48,6 +59,18 @@ APP_VERSION = f"\nVersion {VERSION}"
 # Setting label of help button
 HELP_BUTTON = "Description"
 
+# Setting label of the button for cancelling a running step
+CANCEL_BUTTON = "Annuler"
+
+# Setting the modules imported in background after the main-window display
+PRELOAD_MODULES_LIST = ['pandas',
+                        'cmfuncts.useful_functs',
+                        'cmgui.build_conf_page',
+                       ]
+
+# Setting the period in ms of the progress-bar update
+PROGRESS_POLL_MS = 100
+
 # Setting reference positions in mm for help buttons
 REF_HELP_BUT_POS_X_MM = 180
 REF_HELP_BUT_POS_Y_MM = 0
@@ -4,9 +4,10 @@
 __all__ = ['AppMain']
 
 # Standard library imports
-import os
+import importlib
 import threading
 import tkinter as tk
+import traceback
 from tkinter import filedialog
 from tkinter import messagebox
 from tkinter import font as tkFont
@@ -14,7 +15,6 @@ from functools import partial
 from pathlib import Path
 
 # 3rd party imports
-import bmfuncts.pub_globals as bm_pg
 import bmgui.gui_globals as bm_gg
 from bmgui.gui_utils import enable_buttons
 from bmgui.gui_utils import font_size
@@ -26,12 +26,29 @@ from bmgui.gui_utils import show_frame
 from bmgui.gui_utils import str_size_mm
 from screeninfo import get_monitors
 
-# Local imports# Local imports
-import cmfuncts.conf_globals as cm_cg
+# Local imports
+# The BiblioMeter functions and the treatment modules, such as the globals
+# of the conferences data, are imported when first used or preloaded
+# through the `_preload_modules` function after the window display
 import cmgui.cm_gui_globals as cm_gg
 import cmfuncts.institute_globals as cm_ig
-from cmfuncts.useful_functs import create_cm_archi
-from cmgui.build_conf_page import build_conf_list
+from cmfuncts.wf_probe import get_wf_probe
+from cmfuncts.wf_probe import start_wf_probe
+
+
+def _preload_modules():
+    """Imports the treatment modules listed in the 'PRELOAD_MODULES_LIST' 
+    global so that they are available when the first step runs.
+
+    This function is run in a background thread after the display 
+    of the main window. A failing import is only printed as it is 
+    raised again when the module is used.
+    """
+    for module_name in cm_gg.PRELOAD_MODULES_LIST:
+        try:
+            _ = importlib.import_module(module_name)
+        except ImportError as err:
+            print(f"\nPreload of module '{module_name}' failed: {err}")
 
 
 class AppMain(tk.Tk):
@@ -104,52 +121,99 @@ class AppMain(tk.Tk):
             wf_val2.set((_display_path(inst_wf)))
 
 
-        def _try_wf_access(wf_path):
-            """Returns status of the default working folder as boolean: True, if exists 
-            and access is authorized to the user; False, otherwise."""
+        def _warn_wf_access(wf_path, probe_status):
+            """Warns the user that the working folder is not accessible 
+            accordingly to the status of its probe."""
 
-            wf_access_status = False
-            if os.access(wf_path, os.F_OK | os.R_OK | os.W_OK):
-                wf_access_status = True
+            warning_title = "!!! ATTENTION : Accés au dossier impossible !!!"
+            if probe_status=="timeout":
+                warning_text = (f"Le dossier \n   {wf_path}\n\nne répond pas "
+                                f"après {cm_ig.WF_PROBE_TIMEOUT_S} secondes."
+                                "\n\nChoisissez un autre dossier de travail "
+                                "ou réessayez plus tard.")
             else:
-                warning_title = "!!! ATTENTION : Accés au dossier impossible !!!"
                 warning_text = (f"Accès non autorisé ou absence du dossier \n   {wf_path}."
                                 "\n\nChoisissez un autre dossier de travail.")
-                messagebox.showwarning(warning_title, warning_text)
-            return wf_access_status
+            messagebox.showwarning(warning_title, warning_text)
+
+        def _probe_wf(wf_path, probe_funct, refresh=False):
+            """Probes the working folder access and discovers its corpus years 
+            in background through the `start_wf_probe` function imported from 
+            `cmfuncts.wf_probe` module. Then, calls 'probe_funct' with the probe 
+            state from the main loop when the probe is answered or timed out. 
+            The probe result is ignored if another working folder has been 
+            probed in the meantime."""
+
+            self.probed_wf = str(wf_path)
+            start_wf_probe(wf_path,
+                           years_funct=lambda path: last_available_years(path,
+                                                                         corpuses_nb_alias),
+                           refresh=refresh)
+
+            def _poll_wf_probe():
+                if self.probed_wf!=str(wf_path):
+                    return
+                probe_dict = get_wf_probe(wf_path)
+                if probe_dict['status']=="pending":
+                    self.after(cm_gg.WF_PROBE_POLL_MS, _poll_wf_probe)
+                else:
+                    probe_funct(probe_dict)
+            _poll_wf_probe()
+
+        def _fill_corpi(corpi_val, wf_path, refresh=False, info_status=False):
+            """Sets 'corpi' widget value with the corpus years discovered 
+            in background through the `_probe_wf` internal function."""
+
+            corpi_val.set(cm_gg.CORPI_SEARCH_TXT)
+
+            def _set_corpi_val(probe_dict):
+                corpi_val_to_set = ""
+                if probe_dict['status']=="ok":
+                    if info_status:
+                        info_title = "- Information -"
+                        info_text = ("L'accès au dossier de travail défini "
+                                     "par défaut est autorisé mais vous pouvez "
+                                     "en choisir un autre.")
+                        messagebox.showinfo(info_title, info_text)
+                    corpi_val_to_set = str(probe_dict['years'])
+                else:
+                    _warn_wf_access(wf_path, probe_dict['status'])
+                corpi_val.set(corpi_val_to_set)
+            _probe_wf(wf_path, _set_corpi_val, refresh=refresh)
 
         def _create_corpus(inst_wf):
             """Creates a new corpus folder in the working folder through `create_cm_archi`
-            function imported from `cmfuncts.useful_functs` module.             
+            function imported from `cmfuncts.useful_functs` module once the working-folder 
+            access is checked in background.             
             Then, updates 'corpi' widget value with new list of available corpuses."""
+            useful_functs = importlib.import_module("cmfuncts.useful_functs")
 
             corpi_val = _set_corpi_widgets_param(inst_wf)
             wf_path = Path(inst_wf)
-            wf_access_status = _try_wf_access(wf_path)
-            if wf_access_status:
-                # Setting new corpus year folder name
-                corpuses_list = last_available_years(wf_path, corpuses_nb_alias)
-                last_corpus_year = corpuses_list[-1]
-                new_corpus_year_folder = str(int(last_corpus_year) + 1)
-
-                # Creating required folders for new corpus year
-                message = create_cm_archi(wf_path, new_corpus_year_folder, verbose=False)
-                print("\n",message)
-
-                # Getting updated corpuses list
-                corpuses_list = last_available_years(wf_path, corpuses_nb_alias)
-
-                # Setting corpi_val value to corpuses list
-                corpi_val_to_set = str(corpuses_list)
-                corpi_val.set(corpi_val_to_set)
 
-                # Dispaying info
-                info_title = "- Information -"
-                info_text = (f"L'architecture du dossier pour l'année {new_corpus_year_folder} "
-                             "a été créée dans le dossier de travail.")
-                messagebox.showinfo(info_title, info_text)
-            else:
-                corpi_val.set("")
+            def _create_corpus_year(probe_dict):
+                if probe_dict['status']=="ok":
+                    # Setting new corpus year folder name
+                    last_corpus_year = probe_dict['years'][-1]
+                    new_corpus_year_folder = str(int(last_corpus_year) + 1)
+
+                    # Creating required folders for new corpus year
+                    message = useful_functs.create_cm_archi(wf_path, new_corpus_year_folder,
+                                                            verbose=False)
+                    print("\n",message)
+
+                    # Dispaying info
+                    info_title = "- Information -"
+                    info_text = (f"L'architecture du dossier pour l'année {new_corpus_year_folder} "
+                                 "a été créée dans le dossier de travail.")
+                    messagebox.showinfo(info_title, info_text)
+
+                    # Getting updated corpuses list
+                    _fill_corpi(corpi_val, wf_path, refresh=True)
+                else:
+                    _warn_wf_access(wf_path, probe_dict['status'])
+                    corpi_val.set("")
+            _probe_wf(wf_path, _create_corpus_year)
 
         def _set_corpi_widgets_param(inst_wf):
             """Sets 'corpi' widgets parameters and values accordingly 
@@ -187,19 +251,10 @@ class AppMain(tk.Tk):
 
         def _update_corpi(inst_wf):
             """Updates tkinter 'corpi' parameter with the available corpuses list 
-            accordingly to working folder."""
+            accordingly to working folder, discovered in background."""
 
             corpi_val = _set_corpi_widgets_param(inst_wf)
-            corpi_val_to_set = ""
-            wf_path = Path(inst_wf)
-            wf_access_status = _try_wf_access(wf_path)
-            if wf_access_status:
-                # Getting updated corpuses list
-                corpuses_list = last_available_years(wf_path, corpuses_nb_alias)
-
-                # Setting corpi_val value to corpuses list
-                corpi_val_to_set = str(corpuses_list)
-            corpi_val.set(corpi_val_to_set)
+            _fill_corpi(corpi_val, Path(inst_wf))
         
         def _update_cm_page(*args, institute_widget=None):
             """Gets the selected Institute widgets parameters."""
@@ -211,27 +266,10 @@ class AppMain(tk.Tk):
             inst_default_wf = cm_ig.WORKING_FOLDERS_DICT[institute_select] + "-" + cm_gg.VERSION
             _set_wf_widget_param(institute_select, inst_default_wf)
 
-            # Managing corpus list
+            # Managing corpus list without waiting for the working-folder answer
             corpi_val = _set_corpi_widgets_param(inst_default_wf)
-
-            # Setting and displaying corpuses list initial values
-            corpi_val_to_set = ""
             default_wf_path = Path(inst_default_wf)
-            info_title = "- Information -"
-            info_text = ("Le test de l'accès au dossier de travail défini "
-                         "par défaut peut prendre un peu de temps."
-                         "\n\nMerci de patienter.")
-            messagebox.showinfo(info_title, info_text)
-            wf_access_status = _try_wf_access(default_wf_path)
-            if wf_access_status:
-                info_title = "- Information -"
-                info_text = ("L'accès au dossier de travail défini "
-                             "par défaut est autorisé mais vous pouvez "
-                             "en choisir un autre.")
-                messagebox.showinfo(info_title, info_text)
-                init_corpuses_list = last_available_years(default_wf_path, corpuses_nb_alias)
-                corpi_val_to_set = str(init_corpuses_list)
-            corpi_val.set(corpi_val_to_set)
+            _fill_corpi(corpi_val, default_wf_path, info_status=True)
 
             # Managing analysis launch button
             SetLaunchButton(self, institute_select, default_wf_path, datatype_alias)
@@ -251,10 +289,13 @@ class AppMain(tk.Tk):
         _ = get_monitors() # Mandatory
         self.attributes("-topmost", True)
         self.after_idle(self.attributes,'-topmost', False)
-        icon_path = Path(__file__).parent.parent / Path('cmfuncts') / Path(cm_cg.CONFIG_FOLDER)
+        icon_path = Path(__file__).parent.parent / Path('cmfuncts') / Path(cm_ig.CONFIG_FOLDER)
         icon_path = icon_path / Path('CM-logo.ico')
         self.iconbitmap(icon_path)
 
+        # Initializing the working folder of the last started probe
+        self.probed_wf = None
+
         # Initializing AppMain attributes set after working folder definition
         AppMain.years_list = []
         AppMain.list_corpus_year = []
@@ -333,6 +374,10 @@ class AppMain(tk.Tk):
         # Handling exception
         threading.excepthook = _except_hook       
 
+        # Preloading the treatment modules once the window is displayed
+        preload_thread = threading.Thread(target=_preload_modules, daemon=True)
+        self.after_idle(preload_thread.start)
+
 
 class SetMasterTitle():
     """Displays title in main window."""
@@ -431,12 +476,17 @@ class SetLaunchButton(tk.Tk):
             messagebox.showwarning(warning_title, warning_text)
 
         else:
-            # Setting years list
-            master.years_list = last_available_years(wf_path,
-                                                     bm_gg.CORPUSES_NUMBER)
+            # Setting years list from the cached probe of the working folder
+            probe_dict = get_wf_probe(wf_path)
+            if probe_dict['status']=="ok":
+                master.years_list = probe_dict['years']
+            else:
+                master.years_list = last_available_years(wf_path,
+                                                         bm_gg.CORPUSES_NUMBER)
 
             if datatype:
                 # Setting rawdata for datatype
+                bm_pg = importlib.import_module("bmfuncts.pub_globals")
                 for database in bm_pg.BDD_LIST:
                     _ = set_rawdata(wf_path, datatype,
                                     master.years_list, database)
@@ -515,4 +565,5 @@ class BuildConfPage(tk.Frame):
         PageButton(master, page_name, pagebutton_frame)
 
         # Creating and setting widgets for page frame
-        build_conf_list(self, master, page_name, institute, wf_path)
+        build_conf_page = importlib.import_module("cmgui.build_conf_page")
+        build_conf_page.build_conf_list(self, master, page_name, institute, wf_path)
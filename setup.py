@@ -47,4 +47,9 @@ setup(name='ConfMeter',
                    + 'ludovic.desmeuzes@yahoo.com',
       url='https://github.com/TickyWill/ConfMeter',
       packages=find_packages(),
+      entry_points={
+        'console_scripts': [
+          'confmeter-batch = cmfuncts.cm_batch:main',
+          ],
+        },
       )
@@ -0,0 +1,28 @@
+"""Configuration of the tests.
+
+The test modules running the treatment steps require the BiblioMeter,
+BiblioParsing and HalApyJson packages; they are not collected when
+these packages are not installed.
+
+"""
+
+# Standard Library imports
+import importlib.util
+
+
+BM_PACKAGES_LIST = ['bmfuncts', 'BiblioParsing', 'HalApyJson']
+
+BM_TESTS_LIST = ['test_conf_store.py',
+                 'test_conf_tables.py',
+                 'test_consolidate_conf_list.py',
+                 'test_format_files.py',
+                 'test_hal_hash_id.py',
+                 'test_merge_conf_employees.py',
+                 'test_merge_incremental.py',
+                 'test_near_duplicates.py',
+                 'test_session_flow.py',
+                ]
+
+BM_STATUS = all(importlib.util.find_spec(package) is not None for package in BM_PACKAGES_LIST)
+
+collect_ignore = [] if BM_STATUS else BM_TESTS_LIST
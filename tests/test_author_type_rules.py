@@ -0,0 +1,110 @@
+"""Tests of the `cmfuncts.author_type_rules` module against the previous
+row-wise setting of the author job types.
+
+"""
+
+# Standard Library imports
+import random
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+from cmfuncts.author_type_rules import compile_author_type_rules
+from cmfuncts.author_type_rules import set_author_types
+
+
+# Rules with substrings overlapping within a column and across columns
+AUTHOR_TYPES_DIC = {'Catégorie': {'Cadre'    : ["Cadre", "CDI"],
+                                  'Non cadre': ["Non cadre", "Technicien"],
+                                  'Doctorant': ["Doc"],
+                                 },
+                    'Statut'   : {'Doctorant': ["Doctorant", "Thèse"],
+                                  'Post-doc' : ["Post-doc", "Postdoc"],
+                                  'Stagiaire': ["Stage"],
+                                 },
+                    'Qualif'   : {'Alternant': ["Alternant", "Apprenti"],
+                                  'Empty'    : [],
+                                 },
+                   }
+
+COLS_VALUES_DICT = {'Catégorie': ["Cadre", "Non cadre", "Cadre CDI", "Technicien cadre",
+                                  "Doc", "Doctorant", "cadre", "Autre", ""],
+                    'Statut'   : ["Doctorant", "Post-doc", "Postdoc Thèse", "Stage Doc",
+                                  "Stagiaire", "CDD", "", "Thèse Post-doc"],
+                    'Qualif'   : ["Alternant", "Apprenti Stage", "Ingénieur", "", "alternant"],
+                   }
+
+
+def _get_author_type(row):
+    """Sets the job type of an author row as done row-wise
+    before the rules engine.
+    """
+    author_type = '-'
+    for col_name, dic in AUTHOR_TYPES_DIC.items():
+        for key, values_list in dic.items():
+            values_status = [True for value in values_list if value in row[col_name]]
+            if any(values_status):
+                author_type = key
+    return author_type
+
+
+def _build_rows(rows_nb, seed, nan_ratio=0):
+    """Builds random rows of employees information."""
+    rng = random.Random(seed)
+    data_dict = {}
+    for col_name, values_list in COLS_VALUES_DICT.items():
+        data_dict[col_name] = [np.nan if rng.random()<nan_ratio else rng.choice(values_list)
+                               for _ in range(rows_nb)]
+    return pd.DataFrame(data_dict, index=rng.sample(range(10 * rows_nb), rows_nb))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_set_author_types_equals_row_wise(seed):
+    """Checks that the vectorized author types equal the row-wise ones."""
+    df = _build_rows(500, seed)
+    rules_list = compile_author_type_rules(AUTHOR_TYPES_DIC)
+
+    types_series = set_author_types(df, rules_list)
+
+    expected_series = df.apply(_get_author_type, axis=1)
+    pd.testing.assert_series_equal(types_series, expected_series, check_names=False)
+
+
+def test_set_author_types_with_nan_values():
+    """Checks that the missing values are handled as empty values."""
+    df = _build_rows(500, 3, nan_ratio=0.2)
+    rules_list = compile_author_type_rules(AUTHOR_TYPES_DIC)
+
+    types_series = set_author_types(df, rules_list)
+
+    # A missing value matches no substring as an empty value
+    # while the row-wise setting fails on it
+    with pytest.raises(TypeError):
+        df.apply(_get_author_type, axis=1)
+    expected_series = df.fillna("").apply(_get_author_type, axis=1)
+    pd.testing.assert_series_equal(types_series, expected_series, check_names=False)
+
+
+def test_set_author_types_last_matching_rule_wins():
+    """Checks that the last matching rule sets the author type."""
+    df = pd.DataFrame({'Catégorie': ["Cadre", "Doc", "Cadre"],
+                       'Statut'   : ["Stage", "", "Thèse Post-doc"],
+                       'Qualif'   : ["", "Apprenti", ""]})
+    rules_list = compile_author_type_rules(AUTHOR_TYPES_DIC)
+
+    types_series = set_author_types(df, rules_list)
+
+    assert types_series.tolist()==["Stagiaire", "Alternant", "Post-doc"]
+
+
+def test_set_author_types_without_rules():
+    """Checks that the author type is '-' for all rows without rules."""
+    df = _build_rows(10, 4)
+
+    types_series = set_author_types(df, compile_author_type_rules({}))
+
+    assert (types_series=='-').all()
+    assert types_series.index.equals(df.index)
@@ -0,0 +1,118 @@
+"""Tests of the updates and queries of the SQLite store
+of the `cmfuncts.conf_store` module.
+
+"""
+
+# Standard Library imports
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+from cmfuncts.conf_store import query_conf_store
+from cmfuncts.conf_store import read_store_cube
+from cmfuncts.conf_store import read_store_years
+from cmfuncts.conf_store import update_conf_store
+
+
+def _build_year_data(corpus_year, conf_name):
+    """Builds the publications and authorships tables, the employee
+    matches, the hash IDs and the cube of metrics of a corpus year
+    with two contributions."""
+    cols_dict = cm_cg.CONF_COLS
+    empl_cols_dict = cm_eg.EMPLOYEES_USEFUL_COLS
+    pub_df = pd.DataFrame({cols_dict['pub_id']   : [0, 1],
+                           cols_dict['conf_name']: [conf_name, "Other Conf"],
+                           cols_dict['conf_year']: [corpus_year, corpus_year],
+                           cols_dict['title']    : [f"Title {corpus_year} A",
+                                                    f"Title {corpus_year} B"]})
+    auth_df = pd.DataFrame({cols_dict['pub_id']    : [0, 0, 1],
+                            cols_dict['author_idx']: [0, 1, 0],
+                            cols_dict['co_author'] : ["Jean Martin", "Anne Durand",
+                                                      "Paul Simon"]})
+    valid_auth_df = pd.DataFrame({cols_dict['pub_id']       : [0, 1],
+                                  cols_dict['author_idx']   : [0, 0],
+                                  empl_cols_dict['matricule']: ["M001", "M002"],
+                                  empl_cols_dict['dpt']      : ["D1", "D2"]})
+    hash_id_df = pd.DataFrame({cols_dict['pub_id']      : [f"{corpus_year[2:]}_500",
+                                                           f"{corpus_year[2:]}_501"],
+                               cm_cg.HASH_COL['hash_id']: [f"H{corpus_year}A",
+                                                           f"H{corpus_year}B"]})
+    cube_cols_dict = cm_cg.CONF_CUBE_COLS
+    cube_df = pd.DataFrame({cube_cols_dict['dpt']        : ["D1", "D2"],
+                            cube_cols_dict['doc_type']   : ["COMM", "COMM"],
+                            cube_cols_dict['country']    : ["France", "Japan"],
+                            cube_cols_dict['author_type']: ["Permanent", "Permanent"],
+                            cube_cols_dict['conf_nb']    : [1, 1],
+                            cube_cols_dict['auth_nb']    : [1, 1]})
+    return (pub_df, auth_df), valid_auth_df, hash_id_df, cube_df
+
+
+def _fill_store(wf_path, corpus_years):
+    """Fills the store with the data of the corpus years."""
+    for corpus_year in corpus_years:
+        conf_tables, valid_auth_df, hash_id_df, cube_df = _build_year_data(corpus_year,
+                                                                           f"Conf {corpus_year}")
+        assert update_conf_store(wf_path, corpus_year, conf_tables=conf_tables,
+                                 valid_auth_df=valid_auth_df, hash_id_df=hash_id_df,
+                                 cube_df=cube_df)
+
+
+def test_store_update_and_query_round_trip(tmp_path):
+    """Checks that the contributions written for several corpus years are
+    queried back across the years by matricule, department, corpus year,
+    conference name and hash ID."""
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    corpus_year_alias = cm_cg.CONF_STORE_COLS['corpus_year']
+    _fill_store(tmp_path, ["2022", "2023"])
+
+    assert read_store_years(tmp_path)==["2022", "2023"]
+    matricule_df = query_conf_store(tmp_path, matricule="M001")
+    assert list(zip(matricule_df[corpus_year_alias], matricule_df[pub_id_alias])) \
+           ==[("2022", 0), ("2023", 0)]
+    assert list(matricule_df[cm_cg.HASH_COL['hash_id']])==["H2022A", "H2023A"]
+    assert list(matricule_df[cm_cg.CONF_COLS['title']])==["Title 2022 A", "Title 2023 A"]
+
+    dpt_df = query_conf_store(tmp_path, dpt_labels=["D2"], corpus_years=["2023"])
+    assert list(zip(dpt_df[corpus_year_alias], dpt_df[pub_id_alias]))==[("2023", 1)]
+    assert len(query_conf_store(tmp_path, conf_name="Conf 2022"))==1
+    assert list(query_conf_store(tmp_path, hash_id="H2023B")[pub_id_alias])==[1]
+    assert query_conf_store(tmp_path, matricule="M999").empty
+    assert len(read_store_cube(tmp_path, corpus_years=["2023"]))==2
+
+
+def test_store_update_replaces_rows_of_corpus_year(tmp_path):
+    """Checks that an update replaces only the rows of its corpus year
+    in the updated tables."""
+    _fill_store(tmp_path, ["2022", "2023"])
+    (pub_df, auth_df), _, _, _ = _build_year_data("2023", "New Conf")
+    assert update_conf_store(tmp_path, "2023", conf_tables=(pub_df.iloc[:1], auth_df))
+
+    store_df = query_conf_store(tmp_path, corpus_years=["2023"])
+    assert list(store_df[cm_cg.CONF_COLS['conf_name']])==["New Conf"]
+    assert len(query_conf_store(tmp_path, corpus_years=["2022"]))==2
+    assert list(query_conf_store(tmp_path, matricule="M001")[cm_cg.CONF_COLS['pub_id']])==[0, 0]
+
+
+def test_store_rebuilt_on_schema_version_change(tmp_path, monkeypatch):
+    """Checks that the tables are created again and emptied
+    when the schema version of the store changes."""
+    _fill_store(tmp_path, ["2023"])
+    new_version = cm_cg.CONF_STORE_PARAMS['version'] + 1
+    monkeypatch.setitem(cm_cg.CONF_STORE_PARAMS, 'version', new_version)
+
+    assert not read_store_years(tmp_path)
+    store_path = tmp_path / Path(cm_cg.CM_ARCHI['conf_store_file'])
+    with closing(sqlite3.connect(store_path)) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0]==new_version
+        index_names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master "
+                                                      "WHERE type = 'index'")}
+    assert {"idx_matches_matricule", "idx_hash_ids_hash_id"}<=index_names
+
+    _fill_store(tmp_path, ["2023"])
+    assert read_store_years(tmp_path)==["2023"]
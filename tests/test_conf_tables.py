@@ -0,0 +1,95 @@
+"""Tests of the equivalence of the data of contributions to conferences
+built from the publications and authorships tables of the
+`cmfuncts.conf_tables` module with the data built row by row.
+
+"""
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.conf_extract import _set_country_iso_dict
+from cmfuncts.conf_extract import build_hal_conf_tables
+from cmfuncts.conf_extract import clean_hal_conf_data
+from cmfuncts.conf_tables import build_conf_view
+from cmfuncts.conf_tables import split_conf_data
+from tests.wf_factory import build_working_folder
+
+
+def _build_hal_full_df():
+    """Builds the data of a HAL extraction with contributions to conferences,
+    another document type and unavailable values."""
+    hal_cols = cm_cg.HAL_USE_COLS
+    pubs_list = [("Jean Martin,Anne Durand,Eve Simon", "COMM", "fr", "Grenoble"),
+                 ("Paul Moreau", "POSTER", "jp", "Kyoto"),
+                 ("Luc Petit,Jean Martin", "ART", "fr", "Lyon"),
+                 ("Zoe Girard,Hugo Roux,Max Laurent,Anne Durand", "COMM", "us", "Boston")]
+    data = []
+    for pub_num, (authors, doctype, country, town) in enumerate(pubs_list):
+        row_dict = dict.fromkeys(hal_cols.values(), "NA")
+        row_dict.update({hal_cols['authors']  : authors,
+                         hal_cols['title']    : f"Title {pub_num}",
+                         hal_cols['pub_date'] : f"2023-0{pub_num + 1}-28",
+                         hal_cols['conf_name']: f"Conf {pub_num}",
+                         hal_cols['conf_date']: f"2022-1{pub_num}-02",
+                         hal_cols['doctype']  : doctype,
+                         hal_cols['doi']      : f"10.1/{pub_num}" if pub_num % 2 else "NA",
+                         hal_cols['country']  : country,
+                         hal_cols['full_ref'] : (f"{authors}. Title {pub_num}. Conf {pub_num}, "
+                                                 f"{town} ({country.upper()}), 2022")})
+        data.append(row_dict)
+    return pd.DataFrame(data, columns=list(hal_cols.values()))
+
+
+def _row_wise_conf_data(hal_full_df):
+    """Builds the data with one row per author by concatenating the rows
+    of each author as done before the publications and authorships tables."""
+    cols_dict = cm_cg.CONF_COLS
+    hal_cols = cm_cg.HAL_USE_COLS
+    clean_hal_conf_df = hal_full_df[hal_full_df[cols_dict['doctype']].isin(cm_cg.CONF_TYPES)]\
+                        .replace(to_replace="NA", value=cm_cg.INDISPONIBLE)
+    code_country_dict = _set_country_iso_dict()
+    row_frames_list = []
+    for pub_id, (_, row) in enumerate(clean_hal_conf_df.iterrows()):
+        row = row.copy()
+        row[cols_dict['pub_id']] = pub_id
+        row[cols_dict['town']] = row[hal_cols['full_ref']].split(", ")[-2].split("(")[0]
+        row[cols_dict['country']] = code_country_dict[str(row[cols_dict['country']]).upper()]
+        authors_list = row[hal_cols['authors']].split(",")
+        for auth_idx, author in enumerate(authors_list):
+            row[cols_dict['author_idx']] = auth_idx
+            row[cols_dict['co_author']] = author
+            row[cols_dict['first_author']] = authors_list[0]
+            row[cols_dict['conf_year']] = row[hal_cols['conf_date']][0:4]
+            row[cols_dict['pub_year']] = row[hal_cols['pub_date']][0:4]
+            row_frames_list.append(row.copy().to_frame().T)
+    conf_df = pd.concat(row_frames_list)[list(cols_dict.values())]
+    return conf_df.reset_index(drop=True)
+
+
+def test_conf_tables_view_gives_row_wise_data():
+    """Checks that the view of the publications and authorships tables built
+    from a HAL extraction gives the data built row by row."""
+    hal_full_df = _build_hal_full_df()
+    pub_df, auth_df = build_hal_conf_tables(hal_full_df)
+
+    assert list(pub_df.columns)==cm_cg.CONF_PUB_COLS_LIST
+    assert list(auth_df.columns)==cm_cg.CONF_AUTH_COLS_LIST
+    assert len(pub_df)==3 and len(auth_df)==8
+    pd.testing.assert_frame_equal(clean_hal_conf_data(hal_full_df),
+                                  _row_wise_conf_data(hal_full_df), check_dtype=False)
+
+
+def test_split_and_view_round_trip(tmp_path):
+    """Checks that the view of the split data gives back the data with
+    one row per author, with their rows order and author-specific columns."""
+    _, _, conf_df = build_working_folder(tmp_path)
+    conf_df = conf_df.sample(frac=1, random_state=0).reset_index(drop=True)
+    conf_df["Join key"] = conf_df[cm_cg.CONF_COLS['co_author']].str.lower()
+
+    pub_df, auth_df = split_conf_data(conf_df)
+
+    assert pub_df[cm_cg.CONF_COLS['pub_id']].is_unique
+    assert list(auth_df.columns)==cm_cg.CONF_AUTH_COLS_LIST + ["Join key"]
+    pd.testing.assert_frame_equal(build_conf_view(pub_df, auth_df), conf_df)
@@ -0,0 +1,240 @@
+"""Tests of the equivalence of the vectorized steps of the consolidation
+of the `cmfuncts.consolidate_conf_list` module with the former steps
+run publication by publication.
+
+"""
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+import pytest
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+from cmfuncts import consolidate_conf_list
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.consolidate_conf_list import _add_conf_full_ref
+from cmfuncts.consolidate_conf_list import _add_hal_author_job_type
+from cmfuncts.consolidate_conf_list import _add_hal_authors_name_list
+from cmfuncts.consolidate_conf_list import _split_conf_list_by_doc_type
+from cmfuncts.merge_conf_employees import recursive_year_search
+from cmfuncts.stage_metrics import read_run_log
+from cmfuncts.stage_metrics import stage_record
+from tests.wf_factory import ORG_TUP
+from tests.wf_factory import build_working_folder
+
+
+CORPUS_YEAR = "2023"
+
+
+@pytest.fixture(name="merged_df", scope="module")
+def fixture_merged_df(tmp_path_factory):
+    """Builds the merged data of a working folder with the job type
+    of the authors, with the rows not ordered by publication."""
+    root_path, wf_path, _ = build_working_folder(tmp_path_factory.mktemp("conso"),
+                                                 corpus_year=CORPUS_YEAR, pubs_nb=60)
+    _, valid_df = recursive_year_search(root_path, wf_path, CORPUS_YEAR,
+                                        employees_dict=read_hal_employees_data(root_path))
+    merged_df = _add_hal_author_job_type(valid_df)
+    return merged_df.sample(frac=1, random_state=0)
+
+
+def _groupwise_full_ref(merged_df):
+    """Adds the full reference of the contributions publication
+    by publication as done before the vectorized build."""
+    cols_dict = cm_cg.CONF_COLS
+    out_df = pd.DataFrame()
+    for _, pub_id_df in merged_df.groupby(cols_dict['pub_id']):
+        pub_id_df = pub_id_df.copy()
+        row = pub_id_df.iloc[0]
+        doi = ""
+        if row[cols_dict['doi']]!=cm_cg.INDISPONIBLE:
+            doi = ", " + str(row[cols_dict['doi']])
+        pub_id_df[cm_cg.CONF_ADD_COLS['full_ref']] = (f"{row[cols_dict['title']]}, "
+                                                      f"{row[cols_dict['first_author']]}. et al., "
+                                                      f"{row[cols_dict['conf_name']]}, "
+                                                      f"{row[cols_dict['country']]}-"
+                                                      f"{row[cols_dict['conf_year']]}, "
+                                                      f"{row[cols_dict['pub_year']]}{doi}")
+        out_df = pd.concat([out_df, pub_id_df])
+    return out_df
+
+
+def test_full_ref_gives_groupwise_full_ref(merged_df):
+    """Checks that the full references built at once give the values
+    and the rows order of the references built publication by publication."""
+    cols_dict = cm_cg.CONF_COLS
+    test_df = merged_df.copy()
+    test_df.loc[test_df.index[:3], cols_dict['title']] = None
+    test_df[cols_dict['conf_year']] = test_df[cols_dict['conf_year']].astype(int)
+
+    full_ref_df = _add_conf_full_ref(test_df.copy())
+
+    assert (full_ref_df[cols_dict['doi']]==cm_cg.INDISPONIBLE).any()
+    assert full_ref_df[cm_cg.CONF_ADD_COLS['full_ref']].str.startswith("None, ").any()
+    pd.testing.assert_frame_equal(full_ref_df, _groupwise_full_ref(test_df))
+
+
+def _groupwise_authors_name_list(org_tup, merged_df):
+    """Adds the departments columns and the ordered list of the Institute
+    authors publication by publication as done before the crosstab."""
+    dpt_label_dict = org_tup[1]
+    empl_cols_dict = cm_eg.EMPLOYEES_USEFUL_COLS
+    names_temp_col = "Nom, Prénom"
+
+    def _get_dpt_key(dpt_raw):
+        return_key = None
+        for key, values in dpt_label_dict.items():
+            if dpt_raw in values:
+                return_key = key
+        return return_key
+
+    init_df = merged_df.copy()
+    init_df[empl_cols_dict['first_name']] = init_df[empl_cols_dict['first_name']]\
+                                            .apply(lambda x: x.capitalize())
+    init_df[names_temp_col] = init_df[empl_cols_dict['name']] + ', ' \
+                              + init_df[empl_cols_dict['first_name']]
+    out_df = pd.DataFrame()
+    for _, pub_id_df in init_df.groupby(cm_cg.CONF_COLS['pub_id']):
+        pub_id_df = pub_id_df.copy()
+        depts_list = [_get_dpt_key(x) for x in pub_id_df[empl_cols_dict['dpt']]]
+        for dept in dpt_label_dict:
+            pub_id_df[dept] = int(dept in depts_list)
+        authors_tup_list = sorted(set(zip(pub_id_df[cm_cg.CONF_COLS['author_idx']],
+                                          pub_id_df[names_temp_col],
+                                          pub_id_df[empl_cols_dict['matricule']],
+                                          pub_id_df[cm_cg.CONF_ADD_COLS['author_type']],
+                                          pub_id_df[empl_cols_dict['dpt']],
+                                          pub_id_df[empl_cols_dict['serv']],
+                                          pub_id_df[empl_cols_dict['lab']])))
+        pub_id_df[cm_cg.CONF_ADD_COLS['inst_authors']] = "; ".join(
+            f"{x[1]} ({x[2]},{x[3]},{_get_dpt_key(x[4])},{x[5]},{x[6]})"
+            for x in authors_tup_list)
+        out_df = pd.concat([out_df, pub_id_df])
+    return out_df
+
+
+def _add_homonym_rows(merged_df):
+    """Adds to the first publications a second employee matched
+    with the same author, with another matricule and department."""
+    empl_cols_dict = cm_eg.EMPLOYEES_USEFUL_COLS
+    pub_ids_list = list(merged_df[cm_cg.CONF_COLS['pub_id']].unique()[:4])
+    homonyms_df = merged_df[merged_df[cm_cg.CONF_COLS['pub_id']].isin(pub_ids_list)]\
+                  .drop_duplicates(subset=[cm_cg.CONF_COLS['pub_id']]).copy()
+    homonyms_df[empl_cols_dict['matricule']] = "M000"
+    homonyms_df[empl_cols_dict['dpt']] = "D3"
+    return pd.concat([merged_df, homonyms_df], ignore_index=True)
+
+
+def test_authors_name_list_gives_groupwise_lists(merged_df):
+    """Checks that the departments columns and the ordered authors lists
+    built through the crosstab and a single aggregation give the data built
+    publication by publication, with ties on the author index."""
+    test_df = _add_homonym_rows(merged_df)
+
+    authors_df = _add_hal_authors_name_list(ORG_TUP, test_df.copy())
+
+    assert authors_df[cm_cg.CONF_ADD_COLS['inst_authors']].str.contains("(M000,", regex=False)\
+                                                          .any()
+    pd.testing.assert_frame_equal(authors_df, _groupwise_authors_name_list(ORG_TUP, test_df))
+
+
+def test_authors_name_list_orders_missing_and_mixed_type_values():
+    """Checks the order of the authors with the same author index when
+    their names are missing or their matricules of different types, for which
+    the former sort of the authors tuples failed: the missing names come
+    last and the integer matricules before the string ones."""
+    cols_dict = cm_cg.CONF_COLS
+    empl_cols_dict = cm_eg.EMPLOYEES_USEFUL_COLS
+    merged_df = pd.DataFrame({cols_dict['pub_id']               : [1, 1, 1, 2, 2],
+                              cols_dict['author_idx']           : [0, 0, 1, 0, 0],
+                              empl_cols_dict['name']            : [np.nan, "MARTIN", "DURAND",
+                                                                   "SIMON", "SIMON"],
+                              empl_cols_dict['first_name']      : ["jean", "jean", "anne",
+                                                                   "eve", "eve"],
+                              empl_cols_dict['matricule']       : ["M001", "M002", "M003",
+                                                                   "M004", 12345],
+                              cm_cg.CONF_ADD_COLS['author_type']: ["Permanent"] * 5,
+                              empl_cols_dict['dpt']             : ["D1", "D2", "D1", "D3", "DX"],
+                              empl_cols_dict['serv']            : ["S"] * 5,
+                              empl_cols_dict['lab']             : ["L"] * 5})
+    for pub_id in [1, 2]:
+        pub_df = merged_df[merged_df[cols_dict['pub_id']]==pub_id]
+        with pytest.raises(TypeError):
+            _groupwise_authors_name_list(ORG_TUP, pub_df)
+
+    authors_df = _add_hal_authors_name_list(ORG_TUP, merged_df)
+
+    assert list(authors_df[cm_cg.CONF_ADD_COLS['inst_authors']].unique()) \
+           ==["MARTIN, Jean (M002,Permanent,DEPT2,S,L); nan (M001,Permanent,DEPT1,S,L); "
+              "DURAND, Anne (M003,Permanent,DEPT1,S,L)",
+              "SIMON, Eve (12345,Permanent,None,S,L); SIMON, Eve (M004,Permanent,DEPT3,S,L)"]
+    assert authors_df[list(ORG_TUP[1])].drop_duplicates().values.tolist()==[[1, 1, 0], [0, 0, 1]]
+
+
+def _groupwise_doc_type_split(conf_list_df, pub_id_col, doc_type_col):
+    """Splits the final list of contributions by document type, group
+    by group as done before the single-pass assignment of the rows."""
+    others_dg = conf_list_df.copy()
+    keys_dict = {}
+    for key, doctype_list in cm_cg.CONF_TYPES_DIC.items():
+        doctype_list = [x.upper() for x in doctype_list]
+        key_dg = pd.DataFrame(columns=conf_list_df.columns)
+        for doc_type, dg in conf_list_df.groupby(doc_type_col):
+            if doc_type.upper() in doctype_list:
+                key_dg = pd.concat([key_dg, dg])
+                others_dg = others_dg.drop(dg.index)
+        keys_dict[key] = key_dg.sort_values(by=[pub_id_col])
+    keys_dict['others'] = others_dg.sort_values(by=[pub_id_col])
+    return keys_dict
+
+
+def _build_conf_list_df():
+    """Builds a final list of contributions of document types
+    of different cases, with a rename dict keeping the column names."""
+    cols_dict = cm_cg.CONF_COLS
+    doctypes_list = ["COMM", "poster", "Comm", "OTHER", "POSTER", "COMM", "Art", "comm"]
+    conf_list_df = pd.DataFrame({cols_dict['pub_id'] : [f"23_{500 + num}" for num in
+                                                        [5, 3, 7, 1, 6, 0, 2, 4]],
+                                 cols_dict['title']  : [f"Title {num}" for num in range(8)],
+                                 cols_dict['doctype']: doctypes_list})
+    cols_list = (list(cols_dict.values()) + list(cm_cg.CONF_ADD_COLS.values())
+                 + list(cm_cg.HASH_COL.values()))
+    return conf_list_df, dict(zip(cols_list, cols_list))
+
+
+def test_doc_type_split_gives_groupwise_split(tmp_path, monkeypatch):
+    """Checks that the single-pass split gives the sub-lists and the split
+    ratio of the group-wise split."""
+    cols_dict = cm_cg.CONF_COLS
+    conf_list_df, cols_rename_dict = _build_conf_list_df()
+    saved_dict = {}
+    monkeypatch.setattr(consolidate_conf_list, "_save_final_df",
+                        lambda wf_path, corpus_year, key, key_df, cols_rename_dict:
+                        saved_dict.update({key: key_df}))
+
+    split_ratio, conf_nb = _split_conf_list_by_doc_type(tmp_path, CORPUS_YEAR, conf_list_df,
+                                                        cols_rename_dict)
+
+    groupwise_dict = _groupwise_doc_type_split(conf_list_df, cols_dict['pub_id'],
+                                               cols_dict['doctype'])
+    assert list(saved_dict)==list(groupwise_dict)
+    for key, key_df in saved_dict.items():
+        pd.testing.assert_frame_equal(key_df, groupwise_dict[key], check_dtype=False)
+    assert (split_ratio, conf_nb)==(75, 8)
+
+
+def test_doc_type_split_records_exports_in_enclosing_stage(tmp_path):
+    """Checks that the exports of the sub-lists are recorded
+    as nested stages of the enclosing stage."""
+    _, wf_path, _ = build_working_folder(tmp_path, corpus_year=CORPUS_YEAR, pubs_nb=2)
+    conf_list_df, cols_rename_dict = _build_conf_list_df()
+
+    with stage_record("consolidation", wf_path=wf_path, corpus_year=CORPUS_YEAR):
+        _split_conf_list_by_doc_type(wf_path, CORPUS_YEAR, conf_list_df, cols_rename_dict)
+
+    export_records_list = [record for record in read_run_log(wf_path, CORPUS_YEAR)
+                           if record['stage']=="export_formatting"]
+    assert len(export_records_list)==len(cm_cg.CONF_TYPES_DIC) + 1
+    assert all(record['parent']=="consolidation" for record in export_records_list)
@@ -0,0 +1,88 @@
+"""Tests of the equivalence of the export engines of the
+`cmfuncts.format_files` module.
+
+"""
+
+# Standard Library imports
+from copy import copy
+from datetime import datetime
+from io import BytesIO
+
+# 3rd party imports
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.format_files import format_hal_page
+
+
+STYLE_ATTRS_LIST = ['font', 'fill', 'border', 'alignment', 'number_format']
+
+
+def _set_cols_rename_dict():
+    """Sets a rename dict keeping the column names of the data."""
+    cols_list = (list(cm_cg.CONF_COLS.values()) + list(cm_cg.CONF_ADD_COLS.values())
+                 + list(cm_cg.HASH_COL.values()))
+    return dict(zip(cols_list, cols_list))
+
+
+def _build_df(rows_nb):
+    """Builds data with columns of specific and default attributes
+    and values of different types."""
+    cols_dict = cm_cg.CONF_COLS
+    return pd.DataFrame({cols_dict['pub_id']   : np.arange(rows_nb),
+                         cols_dict['title']    : [f"Title {num}" for num in range(rows_nb)],
+                         cols_dict['conf_date']: [datetime(2023, 1 + num % 12, 1)
+                                                  for num in range(rows_nb)],
+                         "Score"               : np.linspace(0, 1, rows_nb),
+                         "Note"                : [None if num % 3 else "x"
+                                                  for num in range(rows_nb)]})
+
+
+def _export_sheet(df, engine):
+    """Exports data through an export engine and reads back the saved sheet."""
+    wb, ws = format_hal_page(df, _set_cols_rename_dict(), engine=engine)
+    ws.title = "Sheet"
+    file = BytesIO()
+    wb.save(file)
+    file.seek(0)
+    return openpyxl.load_workbook(file)["Sheet"]
+
+
+@pytest.mark.parametrize("rows_nb", [3, 7, 8, 25])
+def test_stream_engine_gives_cells_engine_sheet(rows_nb):
+    """Checks that both export engines give the same values, styles,
+    columns widths, first-row height and freeze panes."""
+    df = _build_df(rows_nb)
+    cells_ws = _export_sheet(df, 'cells')
+    stream_ws = _export_sheet(df, 'stream')
+
+    assert stream_ws.max_row==cells_ws.max_row==rows_nb + 1
+    for cells_row, stream_row in zip(cells_ws.iter_rows(), stream_ws.iter_rows()):
+        for cells_cell, stream_cell in zip(cells_row, stream_row):
+            assert stream_cell.value==cells_cell.value
+            for attr in STYLE_ATTRS_LIST:
+                assert copy(getattr(stream_cell, attr))==copy(getattr(cells_cell, attr)), \
+                       (stream_cell.coordinate, attr)
+    cells_widths_dict = {letter: dim.width for letter, dim in cells_ws.column_dimensions.items()}
+    stream_widths_dict = {letter: dim.width for letter, dim
+                          in stream_ws.column_dimensions.items()}
+    assert stream_widths_dict==cells_widths_dict
+    assert stream_ws.row_dimensions[1].height==cells_ws.row_dimensions[1].height
+    assert stream_ws.freeze_panes==cells_ws.freeze_panes
+
+
+def test_stream_engine_keeps_row_stripes():
+    """Checks that the inner data rows written by the stream engine
+    alternate between two fills as those of the cells engine."""
+    df = _build_df(12)
+    for engine in ['cells', 'stream']:
+        ws = _export_sheet(df, engine)
+        fills_list = [copy(ws.cell(row=row_num, column=1).fill)
+                      for row_num in range(3, ws.max_row)]
+        assert fills_list[0]!=fills_list[1]
+        assert fills_list[::2]==[fills_list[0]] * len(fills_list[::2])
+        assert fills_list[1::2]==[fills_list[1]] * len(fills_list[1::2])
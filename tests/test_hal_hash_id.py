@@ -0,0 +1,56 @@
+"""Tests of the equivalence of the hash IDs of the contributions
+to conferences built once per publication by the `cmfuncts.hal_hash_id`
+module with the hash IDs built row by row.
+
+"""
+
+# 3rd party imports
+import numpy as np
+import pandas as pd
+from bmfuncts.create_hash_id import _my_hash
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.hal_hash_id import create_hal_hash_id
+from cmfuncts.hal_hash_id import read_hash_data
+from cmfuncts.merge_conf_employees import recursive_year_search
+from tests.wf_factory import build_working_folder
+
+
+CORPUS_YEAR = "2023"
+
+
+def _row_wise_hash_data(valid_df):
+    """Builds the hash ID of each author row as done before
+    the hash of the deduplicated publications."""
+    cols_dict = cm_cg.CONF_COLS
+    text_cols_list = [cols_dict['conf_year'], cols_dict['conf_name'], cols_dict['country'],
+                      cols_dict['doctype'], cols_dict['title'], cm_cg.HAL_USE_COLS['authors']]
+    data = [[_my_hash("".join(str(row[col]) for col in text_cols_list)),
+             row[cols_dict['pub_id']]]
+            for _, row in valid_df.iterrows()]
+    hash_id_df = pd.DataFrame(data, columns=[cm_cg.HASH_COL['hash_id'], cols_dict['pub_id']])
+    return hash_id_df.drop_duplicates().reset_index(drop=True)
+
+
+def test_hash_ids_give_row_wise_hash_ids(tmp_path):
+    """Checks that the hash IDs built once per publication give the saved
+    data and the hashed author rows of the hash IDs built row by row."""
+    cols_dict = cm_cg.CONF_COLS
+    hash_id_alias = cm_cg.HASH_COL['hash_id']
+    root_path, wf_path, _ = build_working_folder(tmp_path, corpus_year=CORPUS_YEAR)
+    _, valid_df = recursive_year_search(root_path, wf_path, CORPUS_YEAR,
+                                        employees_dict=read_hal_employees_data(root_path))
+    valid_df[cols_dict['conf_year']] = valid_df[cols_dict['conf_year']].astype(int)
+    valid_df.loc[valid_df.index[:2], cols_dict['title']] = np.nan
+
+    hashed_df = create_hal_hash_id(wf_path, CORPUS_YEAR, valid_df.copy())
+
+    row_wise_hash_id_df = _row_wise_hash_data(valid_df)
+    saved_hash_id_df = read_hash_data(wf_path, CORPUS_YEAR)
+    pd.testing.assert_frame_equal(saved_hash_id_df[[hash_id_alias, cols_dict['pub_id']]],
+                                  row_wise_hash_id_df.astype(str))
+    row_wise_df = valid_df.merge(row_wise_hash_id_df, how="inner", on=cols_dict['pub_id'])
+    pd.testing.assert_frame_equal(hashed_df.drop(columns=[cm_cg.HASH_COL['other_years']]),
+                                  row_wise_df[[hash_id_alias] + list(valid_df.columns)])
@@ -0,0 +1,87 @@
+"""Tests of the equivalence of the spelling corrections of the
+`cmfuncts.merge_conf_employees` module with the row-wise corrections
+of the data with one row per author.
+
+"""
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.conf_tables import build_conf_view
+from cmfuncts.conf_tables import split_conf_data
+from cmfuncts.merge_conf_employees import check_hal_names_spelling
+from cmfuncts.useful_functs import capitalize_name
+from cmfuncts.useful_functs import standardize_name
+from tests.wf_factory import build_working_folder
+
+
+CORPUS_YEAR = "2023"
+
+
+def _row_wise_authors_list(authors):
+    """Formats an authors list with initials of first names as done
+    row by row before the formatting per publication."""
+    authors_list = []
+    for author in authors.split(","):
+        names_list = author.split(" ")
+        first_name, last_name = names_list[0], " ".join(names_list[1:])
+        if "." in first_name:
+            first_name_list = [x + "." for x in first_name.split(".")[:-1]]
+            first_name_initials = "-".join(first_name_list)
+        else:
+            first_name_initials = first_name[0] + "."
+        authors_list.append(" ".join([first_name_initials, last_name]))
+    return ", ".join(authors_list)
+
+
+def _row_wise_names_spelling(conf_df, ortho_df):
+    """Corrects the author names row by row of the data with one row
+    per author as done before the publications and authorships tables."""
+    cols_dict = cm_cg.CONF_COLS
+    new_conf_df = conf_df.copy().reset_index(drop=True)
+    for col in [cols_dict['co_author'], cols_dict['first_author']]:
+        new_conf_df[col] = new_conf_df[col].apply(standardize_name)
+    for row_num in new_conf_df.index:
+        pub_id = new_conf_df.loc[row_num, cols_dict['pub_id']]
+        init_pub_name = new_conf_df.loc[row_num, cols_dict['co_author']].lower()
+        init_first_author = new_conf_df.loc[row_num, cols_dict['first_author']].lower()
+        init_authors = new_conf_df.loc[row_num, cols_dict['authors']]
+        for ortho_pub_name, ortho_empl_name in ortho_df.itertuples(index=False):
+            if init_pub_name!=ortho_pub_name.lower():
+                continue
+            new_pub_name = " ".join(capitalize_name(name) for name in ortho_empl_name.split(" "))
+            new_authors = ",".join(new_pub_name if author.lower()==init_pub_name else author
+                                   for author in init_authors.split(","))
+            new_conf_df.loc[row_num, cols_dict['co_author']] = new_pub_name
+            if init_first_author==init_pub_name:
+                pub_status = new_conf_df[cols_dict['pub_id']]==pub_id
+                new_conf_df.loc[pub_status, cols_dict['first_author']] = new_pub_name
+                new_conf_df.loc[pub_status, cols_dict['authors']] = new_authors
+    new_conf_df[cols_dict['authors']] = new_conf_df[cols_dict['authors']]\
+                                        .apply(_row_wise_authors_list)
+    return new_conf_df
+
+
+def test_names_spelling_gives_row_wise_authors_lists(tmp_path):
+    """Checks that the corrections and the authors lists formatted once
+    per publication give the data corrected row by row."""
+    cols_dict = cm_cg.CONF_COLS
+    _, wf_path, conf_df = build_working_folder(tmp_path, corpus_year=CORPUS_YEAR, pubs_nb=60)
+    first_authors_set = set(conf_df[cols_dict['first_author']])
+    first_author = next(name for name in conf_df[cols_dict['first_author']] if name.isascii())
+    co_author = next(name for name in conf_df[cols_dict['co_author']]
+                     if name.isascii() and name not in first_authors_set)
+    ortho_df = pd.DataFrame({cm_cg.ORTHO_COLS['pub_fullname'] : [first_author.upper(), co_author],
+                             cm_cg.ORTHO_COLS['empl_fullname']: ["jean-luc MARTIN",
+                                                                 "eve simone"]})
+
+    conf_tables = check_hal_names_spelling(wf_path, CORPUS_YEAR, split_conf_data(conf_df),
+                                           ortho_df=ortho_df, save_status=False)
+    corr_df = build_conf_view(*conf_tables)
+    row_wise_df = _row_wise_names_spelling(conf_df, ortho_df)
+
+    assert (corr_df[cols_dict['first_author']]=="Jean-Luc Martin").any()
+    assert (corr_df[cols_dict['co_author']]=="Eve Simone").any()
+    pd.testing.assert_frame_equal(corr_df, row_wise_df[corr_df.columns], check_dtype=False)
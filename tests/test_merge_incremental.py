@@ -0,0 +1,103 @@
+"""Tests of the incremental update of the merge driven by the changes
+of the spelling corrections.
+
+"""
+
+# Standard Library imports
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+import pytest
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts import merge_incremental
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.merge_conf_employees import recursive_year_search
+from cmfuncts.merge_stage import set_merge_paths
+from tests.wf_factory import build_working_folder
+
+
+CORPUS_YEAR = "2023"
+
+
+def _edit_ortho_data(wf_path, conf_df):
+    """Replaces the spelling corrections by a new one and a changed one
+    and returns the names of the authors affected by the changes."""
+    ortho_path = wf_path / Path(cm_cg.ORPHAN_ARCHI["root"]) \
+                 / Path(cm_cg.ORPHAN_ARCHI["orthograph file"])
+    init_ortho_df = pd.read_excel(ortho_path)
+    init_names = set(init_ortho_df[cm_cg.ORTHO_COLS['pub_fullname']])
+    new_name = next(name for name in conf_df[cm_cg.CONF_COLS['co_author']]
+                    if name not in init_names and name.isascii())
+    kept_name, changed_name = init_ortho_df[cm_cg.ORTHO_COLS['pub_fullname']]
+    ortho_df = pd.DataFrame({cm_cg.ORTHO_COLS['pub_fullname'] : [kept_name, changed_name,
+                                                                 new_name],
+                             cm_cg.ORTHO_COLS['empl_fullname']: [init_ortho_df.iloc[0, 1],
+                                                                 "Hugo Girard", "Max Petit"]})
+    ortho_df.to_excel(ortho_path, index=False)
+    return [changed_name, new_name]
+
+
+def _read_merge_results(wf_path):
+    """Reads the merged data, the data not found in the employees data
+    and the corrected conferences data."""
+    paths_list, _ = set_merge_paths(wf_path, CORPUS_YEAR)
+    corr_file_path = wf_path / Path(CORPUS_YEAR) / Path(cm_cg.CM_ARCHI['corpus_folder']) \
+                     / Path(CORPUS_YEAR + cm_cg.CM_ARCHI['hal_corr_file_base'])
+    return [pd.read_excel(file_path) for file_path in list(paths_list[1:]) + [corr_file_path]]
+
+
+@pytest.fixture(name="merged_wf_tup")
+def fixture_merged_wf_tup(tmp_path):
+    """Builds a working folder merged once and edits its spelling corrections."""
+    root_path, wf_path, conf_df = build_working_folder(tmp_path / Path("inc"),
+                                                       corpus_year=CORPUS_YEAR)
+    employees_dict = read_hal_employees_data(root_path)
+    recursive_year_search(root_path, wf_path, CORPUS_YEAR, employees_dict=employees_dict)
+    changed_names = _edit_ortho_data(wf_path, conf_df)
+    return root_path, wf_path, conf_df, changed_names
+
+
+def test_ortho_edit_merges_only_touched_rows(merged_wf_tup, monkeypatch):
+    """Checks that only the publications of the authors affected by the
+    spelling-correction changes are merged again."""
+    root_path, wf_path, conf_df, changed_names = merged_wf_tup
+    merged_pub_ids = []
+    init_merge_conf_tables = merge_incremental.merge_conf_tables
+
+    def _spy_merge_conf_tables(wf_path, corpus_year, conf_tables, *args, **kwargs):
+        merged_pub_ids.extend(conf_tables[0][cm_cg.CONF_COLS['pub_id']])
+        return init_merge_conf_tables(wf_path, corpus_year, conf_tables, *args, **kwargs)
+
+    monkeypatch.setattr(merge_incremental, "merge_conf_tables", _spy_merge_conf_tables)
+    status, _ = merge_incremental.incremental_year_search(root_path, wf_path, CORPUS_YEAR)
+
+    touched_status = conf_df[cm_cg.CONF_COLS['co_author']].isin(changed_names)
+    expected_pub_ids = sorted(conf_df.loc[touched_status, cm_cg.CONF_COLS['pub_id']].unique())
+    assert status
+    assert sorted(merged_pub_ids)==expected_pub_ids
+    assert len(expected_pub_ids)<conf_df[cm_cg.CONF_COLS['pub_id']].nunique()
+
+
+def test_ortho_edit_gives_full_merge_results(merged_wf_tup, tmp_path, capsys):
+    """Checks that the incremental update gives the results of a full merge
+    and that a second update with unchanged inputs merges nothing but
+    saves the manifest used for skipping the merge."""
+    root_path, wf_path, _, _ = merged_wf_tup
+    merge_incremental.incremental_year_search(root_path, wf_path, CORPUS_YEAR)
+
+    full_root_path, full_wf_path, full_conf_df = build_working_folder(tmp_path / Path("full"),
+                                                                      corpus_year=CORPUS_YEAR)
+    _edit_ortho_data(full_wf_path, full_conf_df)
+    recursive_year_search(full_root_path, full_wf_path, CORPUS_YEAR)
+
+    for inc_df, full_df in zip(_read_merge_results(wf_path), _read_merge_results(full_wf_path)):
+        pd.testing.assert_frame_equal(inc_df, full_df, check_dtype=False)
+
+    capsys.readouterr()
+    merge_incremental.incremental_year_search(root_path, wf_path, CORPUS_YEAR)
+    assert "No change of spelling corrections" in capsys.readouterr().out
+    recursive_year_search(root_path, wf_path, CORPUS_YEAR)
+    assert f"Merge skipped for {CORPUS_YEAR}" in capsys.readouterr().out
@@ -0,0 +1,59 @@
+"""Tests of the detection of near-duplicate contributions to conferences
+of the `cmfuncts.near_duplicates` module.
+
+"""
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.near_duplicates import find_near_duplicates
+
+
+def _build_conf_df():
+    """Builds contributions with a retitled duplicate, a duplicate
+    of another document type and two unrelated contributions."""
+    cols_dict = cm_cg.CONF_COLS
+    pubs_list = [(0, "Ageing of lithium-ion batteries under fast charging",
+                  "Jean Martin", "Battery Days", "COMM"),
+                 (1, "Ageing of lithium ion batteries under fast-charging conditions",
+                  "Jean Martin", "Battery Days", "COMM"),
+                 (2, "Solid oxide electrolysis cells for hydrogen production",
+                  "Anne Durand", "Hydrogen Forum", "COMM"),
+                 (3, "Solid oxide electrolysis cells for hydrogen production",
+                  "Anne Durand", "Hydrogen Forum", "POSTER"),
+                 (4, "Thermal storage in molten salts for solar plants",
+                  "Paul Simon", "Solar Congress", "COMM"),
+                 (5, "Recycling of photovoltaic modules by pyrolysis",
+                  "Eve Girard", "PV Workshop", "POSTER")]
+    return pd.DataFrame([{cm_cg.HASH_COL['hash_id']: f"H{pub_id}",
+                          cols_dict['pub_id']      : pub_id,
+                          cols_dict['title']       : title,
+                          cols_dict['first_author']: first_author,
+                          cols_dict['conf_name']   : conf_name,
+                          cols_dict['conf_year']   : "2023",
+                          cols_dict['doctype']     : doctype}
+                         for pub_id, title, first_author, conf_name, doctype in pubs_list])
+
+
+def test_near_duplicates_reports_retitled_and_doctype_duplicates():
+    """Checks that a retitled duplicate and a duplicate of another document
+    type are reported and that the unrelated contributions are not."""
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    pairs_df = find_near_duplicates(_build_conf_df())
+
+    pairs_set = set(zip(pairs_df[f"{pub_id_alias} 1"], pairs_df[f"{pub_id_alias} 2"]))
+    assert pairs_set=={(0, 1), (2, 3)}
+    assert pairs_df[cm_cg.NEAR_DUP_COLS['score']].iloc[0]==1.
+    assert (pairs_df[cm_cg.NEAR_DUP_COLS['score']]>=cm_cg.NEAR_DUP_PARAMS['threshold']).all()
+
+
+def test_near_duplicates_skips_rows_of_same_hash_id():
+    """Checks that the rows sharing a hash ID are not reported as duplicates."""
+    conf_df = _build_conf_df()
+    conf_df.loc[3, cm_cg.HASH_COL['hash_id']] = "H2"
+    pairs_df = find_near_duplicates(conf_df)
+
+    pub_id_alias = cm_cg.CONF_COLS['pub_id']
+    assert set(zip(pairs_df[f"{pub_id_alias} 1"], pairs_df[f"{pub_id_alias} 2"]))=={(0, 1)}
@@ -0,0 +1,90 @@
+"""Tests of the rate limiting and of the processing rate
+of the `cmfuncts.progress_channel` module.
+
+"""
+
+# Standard Library imports
+import time
+
+# 3rd party imports
+import pytest
+
+# Local imports
+from cmfuncts.progress_channel import ProgressChannel
+from cmfuncts.progress_channel import post_progress
+
+
+class _Clock:
+    """Monotonic clock set by the tests."""
+
+    def __init__(self):
+        self.now = 1000.
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch):
+    """Replaces the monotonic clock of the progress channel by a clock set by the tests."""
+    clock = _Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+def test_post_is_rate_limited(clock):
+    """Checks that the events closer than the minimum interval are dropped
+    except the first one, the final one and those of a new stage."""
+    channel = ProgressChannel(stage="merge", min_interval=0.5)
+    assert channel.post(10)
+    clock.now += 0.2
+    assert not channel.post(20)
+    clock.now += 0.4
+    assert channel.post(30)
+    clock.now += 0.1
+    assert channel.post(100)
+    channel.set_stage("conso")
+    assert channel.post(5)
+    assert [event['value'] for event in channel.drain()]==[10., 30., 100., 5.]
+    assert not channel.drain()
+
+
+def test_post_sets_rows_rate(clock):
+    """Checks that the processing rate is the number of rows processed
+    since the start of the stage divided by the elapsed time."""
+    channel = ProgressChannel(stage="extract", min_interval=0.)
+    channel.post(10, rows=0)
+    clock.now += 2.
+    channel.post(50, rows=300)
+    clock.now += 2.
+    channel.post(90, rows=1000)
+    channel.post(95)
+    events_list = channel.drain()
+    assert [event['rows_per_s'] for event in events_list]==[None, 150., 250., None]
+    assert events_list[1]['fraction']==0.5
+
+
+def test_post_progress_gives_rows_to_channels_only(clock):
+    """Checks that the rows are given to the progress channels and that
+    the other callbacks get the progress value only."""
+    channel = ProgressChannel(min_interval=0.)
+    channel.post(0)
+    clock.now += 4.
+    post_progress(channel, 40, rows=200)
+    assert channel.drain()[-1]['rows_per_s']==50.
+
+    values_list = []
+    post_progress(values_list.append, 40, rows=200)
+    assert values_list==[40]
+
+
+def test_post_end_bypasses_rate_limit(clock):
+    """Checks that the end status of a stage is posted whatever the rate limit."""
+    channel = ProgressChannel(stage="merge", min_interval=10.)
+    channel.post(10)
+    clock.now += 0.1
+    channel.post_end("failed", "ValueError: bad data")
+    events_list = channel.drain()
+    assert [event['status'] for event in events_list]==[None, "failed"]
+    assert events_list[-1]['value']==100.
+    assert events_list[-1]['message']=="ValueError: bad data"
@@ -0,0 +1,84 @@
+"""Tests of the hand-over of the data between the merge and the consolidation
+steps through the session cache, as done by the GUI.
+
+"""
+
+# Standard Library imports
+import json
+from pathlib import Path
+
+# 3rd party imports
+import pytest
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+from cmfuncts.build_employees import read_hal_employees_data
+from cmfuncts.consolidate_conf_list import build_final_conf_list
+from cmfuncts.merge_conf_employees import recursive_year_search
+from cmfuncts.merge_stage import set_merge_paths
+from cmfuncts.session_cache import clear_session_cache
+from cmfuncts.session_cache import get_session_data
+from cmfuncts.session_cache import set_session_data
+from tests.wf_factory import ORG_TUP
+from tests.wf_factory import build_working_folder
+
+
+CORPUS_YEAR = "2023"
+
+
+@pytest.fixture(name="wf_tup")
+def fixture_wf_tup(tmp_path):
+    """Builds the working folder and empties the session cache."""
+    clear_session_cache()
+    yield build_working_folder(tmp_path, corpus_year=CORPUS_YEAR)
+    clear_session_cache()
+
+
+def _run_steps(root_path, wf_path):
+    """Runs the merge and the consolidation handing the data through the cache."""
+    extract_key = ("Inst", str(wf_path), CORPUS_YEAR, 'extract')
+    merged_key = ("Inst", str(wf_path), CORPUS_YEAR, 'merged')
+
+    conf_df = get_session_data(extract_key)
+    _, valid_df = recursive_year_search(root_path, wf_path, CORPUS_YEAR, conf_df=conf_df,
+                                        employees_dict=read_hal_employees_data(root_path))
+    set_session_data(merged_key, valid_df, [set_merge_paths(wf_path, CORPUS_YEAR)[0][1]])
+
+    merged_df = get_session_data(merged_key, pop=True)
+    assert merged_df is not None and not merged_df.empty
+    return build_final_conf_list(wf_path, ORG_TUP, CORPUS_YEAR, merged_df=merged_df)
+
+
+def _set_conf_file_path(wf_path):
+    """Sets the full path to the file resulting from the HAL extraction."""
+    hal_corpus_path = wf_path / Path(CORPUS_YEAR) / Path(cm_cg.CM_ARCHI['corpus_folder'])
+    return hal_corpus_path / Path(CORPUS_YEAR + cm_cg.CM_ARCHI['hal_conf_file_base'])
+
+
+def test_merge_and_consolidation_through_cache_save_manifests(wf_tup, capsys):
+    """Checks that the steps handed data through the cache save their manifests
+    and are skipped when run again."""
+    root_path, wf_path, conf_df = wf_tup
+    conf_file_path = _set_conf_file_path(wf_path)
+    set_session_data(("Inst", str(wf_path), CORPUS_YEAR, 'extract'), conf_df, [conf_file_path])
+
+    first_tup = _run_steps(root_path, wf_path)
+
+    year_path = wf_path / Path(CORPUS_YEAR)
+    merge_manifest_path = year_path / Path(cm_cg.CM_ARCHI['conf_empl_folder']) \
+                          / Path(cm_cg.CM_ARCHI['merge_manifest_file'])
+    conso_manifest_path = year_path / Path(cm_cg.CM_ARCHI['final_results_folder']) \
+                          / Path(cm_cg.CM_ARCHI['conso_manifest_file'])
+    assert merge_manifest_path.is_file()
+    assert conso_manifest_path.is_file()
+    with open(conso_manifest_path, encoding='utf-8') as manifest_file:
+        results_dict = json.load(manifest_file)['results']
+    assert results_dict['conf_nb']==first_tup[2]
+
+    capsys.readouterr()
+    second_tup = _run_steps(root_path, wf_path)
+
+    out = capsys.readouterr().out
+    assert f"Merge skipped for {CORPUS_YEAR}" in out
+    assert f"Consolidation skipped for {CORPUS_YEAR}" in out
+    assert second_tup[1:]==first_tup[1:]
@@ -0,0 +1,150 @@
+"""Builder of a small working folder for the tests of the treatment steps.
+
+The working folder holds, for a corpus year, the file resulting from
+the HAL extraction, the employees data of the corpus year and of the
+two previous years, the spelling corrections and the external PhD
+students data.
+
+"""
+
+# Standard Library imports
+import os
+import random
+from pathlib import Path
+
+# 3rd party imports
+import pandas as pd
+
+# Local imports
+import cmfuncts.conf_globals as cm_cg
+import cmfuncts.employees_globals as cm_eg
+from cmfuncts.useful_functs import create_cm_archi
+
+
+FIRST_NAMES_LIST = ["Jean", "Marie", "Paul", "Anne", "Luc", "Eve", "Hugo", "Léa", "Max", "Zoé"]
+
+LAST_NAMES_LIST = ["Martin", "Durand", "Petit", "Moreau", "Simon", "Laurent", "Lefèvre",
+                   "Roux-Blanc", "Fournier", "Girard"]
+
+DPT_LABELS_DICT = {'DEPT1': ['D1', 'D1b'], 'DEPT2': ['D2'], 'DEPT3': ['D3']}
+
+ORG_TUP = (None, DPT_LABELS_DICT)
+
+
+def _build_conf_df(rng, people_list, corpus_year, pubs_nb):
+    """Builds the data of contributions to conferences with one row per author."""
+    cols_dict = cm_cg.CONF_COLS
+    rows_list = []
+    for pub_id in range(pubs_nb):
+        authors_list = rng.sample(people_list, rng.randint(1, 6))
+        authors = ",".join(f"{first} {last}" for first, last in authors_list)
+        doctype = rng.choice(["COMM", "POSTER", "COMM", "OTHER"])
+        country = rng.choice(["France", "Japan"])
+        doi = rng.choice([cm_cg.INDISPONIBLE, f"10.1/{pub_id}"])
+        for idx, (first, last) in enumerate(authors_list):
+            rows_list.append({cols_dict['pub_id']      : pub_id,
+                              cols_dict['author_idx']  : idx,
+                              cols_dict['co_author']   : f"{first} {last}",
+                              cols_dict['first_author']: authors.split(",", maxsplit=1)[0],
+                              cols_dict['pub_year']    : corpus_year,
+                              cols_dict['conf_year']   : corpus_year,
+                              cols_dict['conf_date']   : f"{corpus_year}-05-01",
+                              cols_dict['conf_name']   : f"Conf {pub_id % 7}",
+                              cols_dict['town']        : "Paris",
+                              cols_dict['country']     : country,
+                              cols_dict['doctype']     : doctype,
+                              cols_dict['commitee']    : "oui",
+                              cols_dict['title']       : f"Title number {pub_id}",
+                              cols_dict['doi']         : doi,
+                              cols_dict['keywords']    : "kw",
+                              cols_dict['proceedings'] : "non",
+                              cols_dict['url']         : "http://x",
+                              cols_dict['pub_date']    : f"{corpus_year}-06-01",
+                              cols_dict['authors']     : authors,
+                              cols_dict['affiliations']: "aff",
+                              cols_dict['institutions']: "inst",
+                              cols_dict['depts']       : "dep",
+                              cols_dict['organisms']   : "org"})
+    conf_df = pd.DataFrame(rows_list)[list(dict.fromkeys(cols_dict.values()))]
+    return conf_df
+
+
+def _build_employees_df(rng, people_list):
+    """Builds the employees data of a year for about half of the people."""
+    useful_cols = cm_eg.EMPLOYEES_USEFUL_COLS
+    add_cols = cm_eg.EMPLOYEES_ADD_COLS
+    cols_list = list(useful_cols.values()) + list(add_cols.values())
+    rows_list = []
+    for num, (first, last) in enumerate(people_list):
+        if rng.random()<0.5:
+            continue
+        row_dict = dict.fromkeys(cols_list, "-")
+        row_dict.update({useful_cols['matricule']       : f"M{num:03d}",
+                         useful_cols['name']            : last.upper(),
+                         useful_cols['first_name']      : first.lower(),
+                         useful_cols['category']        : rng.choice(["CAD", "NC", "X"]),
+                         useful_cols['status']          : rng.choice(["DOC", "POST", "-"]),
+                         useful_cols['qualification']   : rng.choice(["ALT", "stage", "Q"]),
+                         useful_cols['dpt']             : rng.choice(["D1", "D1b", "D2", "D3", "DX"]),
+                         add_cols['first_name_initials']: first[0],
+                         add_cols['employee_full_name'] : f"{first} {last}"})
+        rows_list.append(row_dict)
+    return pd.DataFrame(rows_list, columns=cols_list)
+
+
+def build_working_folder(root_path, corpus_year="2023", pubs_nb=40, seed=1):
+    """Builds a working folder with the inputs of the merge of a corpus year.
+
+    Args:
+        root_path (path): The full path to the root folder.
+        corpus_year (str): 4 digits year of the corpus (default="2023").
+        pubs_nb (int): The number of contributions to conferences (default=40).
+        seed (int): The seed of the random data (default=1).
+    Returns:
+        (tup): (The full path (path) to the root folder, the full path (path) \
+        to the working folder, the data of contributions to conferences \
+        saved as the file resulting from the HAL extraction (dataframe)).
+    """
+    rng = random.Random(seed)
+    root_path = Path(root_path)
+    wf_path = root_path / Path("ConfMeter_Files")
+    os.makedirs(wf_path, exist_ok=True)
+    create_cm_archi(wf_path, corpus_year)
+    people_list = [(first, last) for first in FIRST_NAMES_LIST for last in LAST_NAMES_LIST]
+
+    # Saving the contributions to conferences
+    conf_df = _build_conf_df(rng, people_list, corpus_year, pubs_nb)
+    hal_corpus_path = wf_path / Path(corpus_year) / Path(cm_cg.CM_ARCHI['corpus_folder'])
+    conf_df.to_excel(hal_corpus_path / Path(corpus_year + cm_cg.CM_ARCHI['hal_conf_file_base']),
+                     index=False)
+
+    # Saving the employees data of the corpus year and of the previous years
+    empl_folder_path = root_path / Path(cm_eg.EMPLOYEES_ARCHI["root"]) \
+                       / Path(cm_eg.EMPLOYEES_ARCHI["all_years_employees"])
+    os.makedirs(empl_folder_path, exist_ok=True)
+    empl_file_path = empl_folder_path / Path(cm_eg.EMPLOYEES_ARCHI["hal_employees_file_name"])
+    with pd.ExcelWriter(empl_file_path,  # https://github.com/PyCQA/pylint/issues/3060 pylint: disable=abstract-class-instantiated
+                        ) as writer:
+        for year_shift in range(2, -1, -1):
+            empl_df = _build_employees_df(rng, people_list)
+            empl_df.to_excel(writer, sheet_name=str(int(corpus_year) - year_shift), index=False)
+
+    # Saving the spelling corrections and the external PhD students data
+    orphan_treat_root_path = wf_path / Path(cm_cg.ORPHAN_ARCHI["root"])
+    os.makedirs(orphan_treat_root_path, exist_ok=True)
+    ortho_df = pd.DataFrame({cm_cg.ORTHO_COLS['pub_fullname'] : ["Jean Martin", "Eve Simon"],
+                             cm_cg.ORTHO_COLS['empl_fullname']: ["jean-luc martin", "EVE SIMONE"]})
+    ortho_df.to_excel(orphan_treat_root_path / Path(cm_cg.ORPHAN_ARCHI["orthograph file"]),
+                      index=False)
+    ext_docs_cols_list = cm_eg.EXT_DOCS_USEFUL_COLS.copy()
+    ext_docs_cols_list[-2] = cm_eg.EMPLOYEES_ADD_COLS['first_name_initials']
+    ext_docs_dict = dict.fromkeys(ext_docs_cols_list, "v")
+    ext_docs_dict.update({cm_eg.EMPLOYEES_ADD_COLS['employee_full_name']: "Hugo Girard",
+                          cm_eg.EMPLOYEES_USEFUL_COLS['name']           : "GIRARD",
+                          cm_eg.EMPLOYEES_USEFUL_COLS['first_name']     : "hugo",
+                          cm_eg.EMPLOYEES_USEFUL_COLS['dpt']            : "D2"})
+    pd.DataFrame([ext_docs_dict]).to_excel(orphan_treat_root_path
+                                           / Path(cm_cg.ORPHAN_ARCHI["employees adds file"]),
+                                           sheet_name=cm_cg.ORPHAN_SHEET_NAMES["docs to add"],
+                                           index=False)
+    return root_path, wf_path, conf_df